@@ -2,14 +2,14 @@
 
 """
 Wrapper class around Java-based clause segmenter (Osalausestaja). 
-Allows to process results sentence by sentence. 
+Allows to process results sentence by sentence, or the sentences of 
+a whole document at once. 
 """
 from __future__ import unicode_literals, print_function
 
 from estnltk.names import *
 from estnltk.javaprocess import JavaProcess
 
-from copy import deepcopy
 from pprint import pprint
 
 import json
@@ -17,6 +17,7 @@ import os.path
 import re
 
 CLAUSE_ANNOT = 'clauseAnnotation'
+phonetic_vowel_regex = re.compile('[?<\]]([aioueöäõü])')
 
 class ClauseSegmenter(JavaProcess):
     """ Wrapper class around Java-based clause segmenter (Osalausestaja). 
@@ -24,41 +25,82 @@ class ClauseSegmenter(JavaProcess):
         """ 
     
     def __init__(self, **kwargs):
+        """Initialize the clause segmenter.
+
+        Parameters
+        ----------
+        ignore_missing_commas: boolean (default: False)
+            Try to detect clause boundaries even if commas are missing.
+        pool_size: int (default: 1)
+            The number of Java VMs running the segmenter. Use values larger than 1
+            in order to segment documents concurrently from several threads.
+        timeout: float (default: None)
+            The number of seconds to wait for the segmenter's output, before the Java VM is restarted.
+        max_retries: int (default: 1)
+            How many times the sentences are segmented again after the failure of the Java VM.
+        batch_size: int (default: None)
+            The number of sentences that are sent to the segmenter at once.
+            If None, all the sentences of a document are sent at once.
+        """
+        self.batch_size = kwargs.get('batch_size', None)
         args = ['-pyvabamorf']
         ignore_missing_commas = kwargs.get('ignore_missing_commas', False)
         if ignore_missing_commas:
             args.append('-ins_comma_mis')
-        JavaProcess.__init__(self, 'Osalau.jar', args)
+        JavaProcess.__init__(self, 'Osalau.jar', args,
+                             pool_size=kwargs.get('pool_size', 1),
+                             timeout=kwargs.get('timeout', None),
+                             max_retries=kwargs.get('max_retries', 1))
 
     def tag(self, text):
         sentences = text.divide()
-        for sentence in sentences:
-            self.mark_annotations(sentence)
+        batch_size = self.batch_size or max(len(sentences), 1)
+        for i in range(0, len(sentences), batch_size):
+            self.mark_annotations_batch(sentences[i:i+batch_size])
         return text
     
     def detect_annotations(self, sentence):
-        prep_sentence = self.prepare_sentence(deepcopy(sentence))
-        result = json.loads(self.process_line(prep_sentence))
-        words = self.annotate_indices(result[WORDS])
-        return self.rename_annotations(words)
+        return self.detect_annotations_batch([sentence])[0]
+    
+    def detect_annotations_batch(self, sentences):
+        """Detect clause annotations of several sentences with a single call to the segmenter.
+        The sentences are sent down the pipe one line per sentence without waiting for the
+        results, and the results are read back in the same order."""
+        prep_sentences = [self.prepare_sentence(sentence) for sentence in sentences]
+        results = self.process_lines(prep_sentences)
+        annotations = []
+        for result in results:
+            words = self.annotate_indices(json.loads(result)[WORDS])
+            annotations.append(self.rename_annotations(words))
+        return annotations
     
     def mark_annotations(self, sentence):
-        annotations = self.detect_annotations(sentence)
-        assert len(sentence) == len(annotations)
-        for w, a in zip(sentence, annotations):
-            for k, v in a.items():
-                w[k] = v
-        return sentence
+        return self.mark_annotations_batch([sentence])[0]
+    
+    def mark_annotations_batch(self, sentences):
+        for sentence, annotations in zip(sentences, self.detect_annotations_batch(sentences)):
+            assert len(sentence) == len(annotations)
+            for w, a in zip(sentence, annotations):
+                for k, v in a.items():
+                    w[k] = v
+        return sentences
     
     def prepare_sentence(self, sentence):
-        """Prepare the sentence for segment detection."""
+        """Prepare the sentence for segment detection.
+        Only the texts and the analyses of the words are sent to the segmenter."""
         # depending on how the morphological analysis was added, there may be
         # phonetic markup. Remove it, if it exists.
+        words = []
         for word in sentence:
+            analyses = []
             for analysis in word[ANALYSIS]:
-                analysis[ROOT] = analysis[ROOT].replace('~', '')
-                analysis[ROOT] = re.sub('[?<\]]([aioueöäõü])', '\\1', analysis[ROOT])
-        return json.dumps({WORDS: sentence})
+                root = analysis[ROOT].replace('~', '')
+                root = phonetic_vowel_regex.sub('\\1', root)
+                analysis = dict(analysis)
+                analysis[ROOT] = root
+                analyses.append(analysis)
+            words.append({TEXT: word[TEXT], ANALYSIS: analyses})
+        return json.dumps({WORDS: words})
     
         
     def annotate_indices(self, sentence):
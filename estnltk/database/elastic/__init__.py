@@ -8,10 +8,20 @@ import elasticsearch
 import elasticsearch.helpers
 import itertools
 import json
+import logging
+import time
+import uuid
+from collections import deque
+from multiprocessing.pool import ThreadPool
 
 from .mapping import mapping
 from estnltk.text import Text
 
+logger = logging.getLogger(__name__)
+
+REJECTED_STATUS = 429 # bulk items rejected by a full Elasticsearch queue, these are retried
+ALTERNATIVE_SEPARATOR = '|' # separates the ambiguous lemmas/postags of a word, see the `estnltk_alternatives` filter
+
 
 def create_index(index_name, **kwargs):
     """
@@ -100,16 +110,22 @@ class Index:
        str
             json representation of elasticsearch type sentence
 
+        Notes
+        -----
+        Lemmas and postags are stored as one token per word, the ambiguous alternatives of a word are
+        joined with ALTERNATIVE_SEPARATOR. The `estnltk_alternatives` filter of the index mapping splits
+        them into tokens at the same position, so phrase queries match any combination of the alternatives,
+        while the size of the field grows linearly with the length of the sentence.
+
         """
 
-        def unroll_lists(list_of_lists):
-            for i in itertools.product(*[set(j) for j in list_of_lists]):
-                yield ' '.join(i)
+        def positional_tokens(list_of_lists):
+            return ' '.join(ALTERNATIVE_SEPARATOR.join(sorted(set(alternatives))) for alternatives in list_of_lists)
 
         sents = document.split_by_sentences()
         for order, sent in enumerate(sents):
-            postags = list(unroll_lists(sent.postag_lists))
-            lemmas = list(unroll_lists(sent.lemma_lists))
+            postags = positional_tokens(sent.postag_lists)
+            lemmas = positional_tokens(sent.lemma_lists)
             text = sent.text
             words = copy.deepcopy(sent.words)
             for i in words:
@@ -141,6 +157,128 @@ class Index:
                     sent,
                     parent=document_in_es['_id'])
 
+    def _get_bulk_actions(self, documents):
+        """Yields bulk actions for the documents and their sentences.
+
+        Document ids are generated on the client side, so that the sentences can be routed to
+        their parent document without waiting for the document to be indexed.
+        """
+        for document in documents:
+            meta = None
+            if isinstance(document, tuple):
+                document, meta = document
+            if getattr(document, '__db_meta', None):
+                raise NotImplementedError('Changing objects in the database has not been implemented.')
+            document_id = uuid.uuid4().hex
+            yield {'_index': self.index_name,
+                   '_type': 'document',
+                   '_id': document_id,
+                   '_source': {} if meta is None else meta}
+            for sent in self._get_indexable_sentences(document):
+                yield {'_index': self.index_name,
+                       '_type': 'sentence',
+                       '_parent': document_id,
+                       '_source': sent}
+
+    def _save_chunk(self, actions, max_retries, initial_backoff, max_backoff):
+        """Sends a chunk of actions with a bulk request, retrying the rejected actions with exponential backoff.
+
+        Returns
+        -------
+        dict
+            Statistics of the chunk: the number of actions, indexed actions, retried actions,
+            the errors, elapsed seconds and actions per second.
+        """
+        started = time.time()
+        stats = {'actions': len(actions), 'indexed': 0, 'retries': 0, 'errors': []}
+        pending = actions
+        for attempt in range(max_retries + 1):
+            rejected = []
+            results = elasticsearch.helpers.streaming_bulk(self.client, pending, chunk_size=len(pending),
+                                                           raise_on_error=False, raise_on_exception=False)
+            for action, (ok, item) in zip(pending, results):
+                if ok:
+                    stats['indexed'] += 1
+                elif list(item.values())[0].get('status') == REJECTED_STATUS and attempt < max_retries:
+                    rejected.append(action)
+                else:
+                    stats['errors'].append(item)
+            if not rejected:
+                break
+            stats['retries'] += len(rejected)
+            backoff = min(max_backoff, initial_backoff * 2 ** attempt)
+            logger.warning('{0} bulk actions were rejected, retrying in {1} seconds'.format(len(rejected), backoff))
+            time.sleep(backoff)
+            pending = rejected
+        stats['seconds'] = time.time() - started
+        stats['actions_per_second'] = stats['actions'] / stats['seconds'] if stats['seconds'] > 0 else float('inf')
+        return stats
+
+    def save_many(self, documents, chunk_size=500, threads=1, max_retries=3, initial_backoff=1, max_backoff=60,
+                  progress=None):
+        """Saves documents and their sentences using bulk requests.
+
+        Parameters
+        ----------
+        documents : iterable of Text or (Text, dict) pairs
+            Documents to save, optionally with the metadata stored in the document object.
+            The iterable is consumed lazily.
+        chunk_size : int
+            Number of actions (documents and sentences) sent in a single bulk request.
+        threads : int
+            Number of threads sending the bulk requests concurrently.
+            At most ``2 * threads`` chunks are read ahead of the chunk being reported.
+        max_retries : int
+            How many times the actions rejected by Elasticsearch (status 429) are retried.
+        initial_backoff : float
+            Seconds to wait before the first retry, doubled for every following retry.
+        max_backoff : float
+            Maximum number of seconds to wait before a retry.
+        progress : callable
+            Called with the statistics of every chunk, see `_save_chunk`.
+            By default, the throughput of the chunks is logged.
+
+        Returns
+        -------
+        tuple of (int, list)
+            Number of indexed actions and the list of errors, like elasticsearch.helpers.bulk.
+        """
+        actions = self._get_bulk_actions(documents)
+        chunks = iter(lambda: list(itertools.islice(actions, chunk_size)), [])
+
+        def save_chunk(chunk):
+            return self._save_chunk(chunk, max_retries, initial_backoff, max_backoff)
+
+        def save_chunks(pool):
+            # ThreadPool.imap would read all the chunks ahead, so the number of submitted chunks is bounded
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(save_chunk, (chunk,)))
+                if len(pending) >= 2 * threads:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+        pool = ThreadPool(threads) if threads > 1 else None
+        indexed = 0
+        errors = []
+        try:
+            results = save_chunks(pool) if pool is not None else (save_chunk(chunk) for chunk in chunks)
+            for chunk_no, stats in enumerate(results):
+                stats['chunk'] = chunk_no
+                indexed += stats['indexed']
+                errors.extend(stats['errors'])
+                if progress is not None:
+                    progress(stats)
+                else:
+                    logger.info('Chunk {chunk}: {indexed}/{actions} actions indexed in {seconds:.2f} seconds '
+                                '({actions_per_second:.1f} actions/s, {retries} retries)'.format(**stats))
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        return indexed, errors
+
     def get_iter(self, document, meta=None):
         if getattr(document, '__db_meta', None):
             # we should overwrite a previous object
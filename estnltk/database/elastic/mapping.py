@@ -48,8 +48,7 @@ mapping = {
                     "norms": {
                         "enabled": False
                     },
-                    "type": "string",
-                    "position_increment_gap": 100  # different analyses are separated by 100 positions
+                    "type": "string"  # alternative lemmas of a word share a position
                 },
                 "meta": {
                     "properties": {
@@ -67,8 +66,7 @@ mapping = {
                     "norms": {
                         "enabled": False
                     },
-                    "type": "string",
-                    "position_increment_gap": 100
+                    "type": "string"
                 },
                 "text": {
                     "analyzer": "whitespace",
@@ -161,9 +159,19 @@ mapping = {
     },
     "settings": {
         "analysis": {
+            "filter": {
+                "estnltk_alternatives": {  # splits "a|b|c" into tokens a, b and c at the same position
+                    "type": "pattern_capture",
+                    "preserve_original": False,
+                    "patterns": [
+                        "([^|]+)"
+                    ]
+                }
+            },
             "analyzer": {
                 "estnltk_lowercase": {
                     "filter": [
+                        "estnltk_alternatives",
                         "lowercase"
                     ],
                     "tokenizer": "whitespace",
@@ -171,6 +179,7 @@ mapping = {
                 },
                 "estnltk_uppercase": {
                     "filter": [
+                        "estnltk_alternatives",
                         "uppercase"
                     ],
                     "tokenizer": "whitespace",
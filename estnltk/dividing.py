@@ -5,6 +5,7 @@ These are mainly used in :py:class:`~estnltk.text.Text` class split and divide m
 """
 from __future__ import unicode_literals, print_function, absolute_import
 from .names import START, END
+from .spanlayer import SpanLayer, divide_span_layers
 from copy import deepcopy
 
 
@@ -295,7 +296,10 @@ def get_filterer(outer_spans, inner_spans, translate, sep):
 
 def divide_by_spans(elements, outer_spans, translate=False, sep=' '):
     outer_spans = [convert_span(s) for s in outer_spans]
-    inner_spans = [spans(e) for e in elements]
+    if isinstance(elements, SpanLayer):
+        inner_spans = elements.spans()
+    else:
+        inner_spans = [spans(e) for e in elements]
     if len(inner_spans) == 0:
         return [[] for _ in range(len(outer_spans))]
     if len(outer_spans) == 0:
@@ -335,6 +339,48 @@ def divide_by_spans_old_inefficient(elements, outer_spans, translate=False, sep=
     return bins
 
 
+def divide_index(elements, by):
+    """Compute the index ranges of the bins that :py:func:`~estnltk.dividing.divide` would create.
+
+    Parameters
+    ----------
+    elements: list of dict
+        Elements to be grouped into bins.
+    by: list of dict
+        Elements defining the bins.
+
+    Returns
+    -------
+    list of (int, int)
+        For each bin, the (first, last + 1) indices of its elements, so that
+        ``elements[first:last+1]`` gives the same bin as :py:func:`~estnltk.dividing.divide`.
+        None, if any of the elements is a multispan or the elements of a bin are not consecutive.
+    """
+    if isinstance(elements, SpanLayer):
+        inner_spans = elements.spans()
+    else:
+        inner_spans = [spans(e) for e in elements]
+    if isinstance(by, SpanLayer):
+        outer_spans = by.spans()
+    else:
+        outer_spans = [spans(e) for e in by]
+    if any(isinstance(s, list) for s in inner_spans) or any(isinstance(s, list) for s in outer_spans):
+        return None
+    if len(inner_spans) == 0:
+        return [(0, 0) for _ in range(len(outer_spans))]
+    if len(outer_spans) == 0:
+        return []
+    ranges = []
+    for bin in spans_collect_spans(outer_spans, inner_spans):
+        if len(bin) == 0:
+            ranges.append((0, 0))
+        elif bin[-1] - bin[0] + 1 == len(bin):
+            ranges.append((bin[0], bin[-1] + 1))
+        else:
+            return None
+    return ranges
+
+
 def divide(elements, by, translate=False, sep=' '):
     """Divide lists `elements` and `by`.
     All elements are grouped into N bins, where N denotes the elements in `by` list.
@@ -351,5 +397,11 @@ def divide(elements, by, translate=False, sep=' '):
         In case of multispans, what is the default text separator.
         This is required in order to tag correct start, end positions of elements.
     """
-    outer_spans = [spans(elem) for elem in by]
+    if isinstance(elements, SpanLayer) and isinstance(by, SpanLayer):
+        if not translate and elements.is_sorted() and by.is_sorted():
+            return divide_span_layers(elements, by)
+    if isinstance(by, SpanLayer):
+        outer_spans = by.spans()
+    else:
+        outer_spans = [spans(elem) for elem in by]
     return divide_by_spans(elements, outer_spans, translate=translate, sep=sep)
@@ -1,17 +1,36 @@
 # -*- coding: utf-8 -*-
+"""Convert koondkorpus TEI XML files to Estnltk JSON files.
+
+Files are converted in parallel by a pool of worker processes. Every converted input file is
+recorded in a manifest file in the output directory, so an interrupted conversion can be resumed
+by running the same command again: the files listed in the manifest are skipped and the files
+that were being converted during the crash are converted again.
+
+Example::
+
+    python -m estnltk.examples.convert_koondkorpus koondkorpus/ out/ -e utf-8 -p 8 --format jsonl
+"""
 from __future__ import unicode_literals, print_function, absolute_import
 
 import os
 import os.path
 import argparse
+import codecs
+import json
 import logging
+import time
+from multiprocessing import Pool
 
-from estnltk.teicorpus import parse_tei_corpus
+from estnltk.teicorpus import iter_tei_corpus
 from estnltk.corpus import write_document
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('koondkonverter')
 
+MANIFEST = 'manifest.jsonl'
+JSON = 'json'
+JSONL = 'jsonl'
+
 
 def get_target(fnm):
     if 'drtood' in fnm:
@@ -35,23 +54,144 @@ def get_target(fnm):
     return 'artikkel'
 
 
-def process(start_dir, out_dir, encoding=None):
-    for dirpath, dirnames, filenames in os.walk(start_dir):
+def get_input_files(start_dir):
+    """List the TEI XML files of the corpus in a fixed order, paths relative to `start_dir`."""
+    for dirpath, dirnames, filenames in sorted(os.walk(start_dir)):
         if len(dirnames) > 0 or len(filenames) == 0 or 'bin' in dirpath:
             continue
-        for fnm in filenames:
-            full_fnm = os.path.join(dirpath, fnm)
-            out_prefix = os.path.join(out_dir, fnm)
-            target = get_target(full_fnm)
-            if os.path.exists(out_prefix + '_0.txt'):
-                logger.info('Skipping file {0}, because it seems to be already processed'.format(full_fnm))
-                continue
-            logger.info('Processing file {0} with target {1}'.format(full_fnm, target))
-            docs = parse_tei_corpus(full_fnm, target=target, encoding=encoding)
-            for doc_id, doc in enumerate(docs):
-                out_fnm = '{0}_{1}.txt'.format(out_prefix, doc_id)
-                logger.info('Writing document {0}'.format(out_fnm))
-                write_document(doc, out_fnm)
+        for fnm in sorted(filenames):
+            yield os.path.relpath(os.path.join(dirpath, fnm), start_dir)
+
+
+def read_manifest(out_dir):
+    """Read the input files that have been converted, mapped to their manifest records."""
+    completed = {}
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with codecs.open(path, 'rb', 'utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # the last line may be incomplete after a crash
+                completed[record['input']] = record
+    return completed
+
+
+class OutputWriter(object):
+    """Writes the documents of one input file to temporary files, which are renamed in `close`.
+
+    In JSON format, every document is written to a separate indented JSON file, as before.
+    In JSONL format, the documents are written one per line without indentation, at most
+    `shard_size` documents per shard.
+    """
+
+    def __init__(self, out_prefix, fmt, shard_size):
+        self.out_prefix = out_prefix
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self.outputs = []
+        self.documents = 0
+        self.shard = None
+
+    def write(self, doc):
+        if self.fmt == JSON:
+            fnm = '{0}_{1}.txt'.format(self.out_prefix, self.documents)
+            self.outputs.append(fnm)
+            write_document(doc, fnm + '.tmp')
+        else:
+            if self.documents % self.shard_size == 0:
+                if self.shard is not None:
+                    self.shard.close()
+                fnm = '{0}_{1}.jsonl'.format(self.out_prefix, self.documents // self.shard_size)
+                self.outputs.append(fnm)
+                self.shard = codecs.open(fnm + '.tmp', 'wb', 'ascii')
+            self.shard.write(json.dumps(doc))
+            self.shard.write('\n')
+        self.documents += 1
+
+    def close(self):
+        if self.shard is not None:
+            self.shard.close()
+        for fnm in self.outputs:
+            os.rename(fnm + '.tmp', fnm)
+
+
+def convert_file(job):
+    """Convert a single TEI XML file. Executed by the worker processes."""
+    full_fnm, input_fnm, out_prefix, encoding, fmt, shard_size = job
+    started = time.time()
+    writer = OutputWriter(out_prefix, fmt, shard_size)
+    for doc in iter_tei_corpus(full_fnm, target=[get_target(full_fnm)], encoding=encoding):
+        writer.write(doc)
+    writer.close()
+    return {
+        'input': input_fnm,
+        'bytes': os.path.getsize(full_fnm),
+        'documents': writer.documents,
+        'outputs': [os.path.basename(fnm) for fnm in writer.outputs],
+        'seconds': time.time() - started
+    }
+
+
+def process(start_dir, out_dir, encoding=None, processes=None, fmt=JSON, shard_size=1000):
+    """Convert the TEI XML files in `start_dir` and store the results in `out_dir`.
+
+    Parameters
+    ----------
+    start_dir: str
+        The path of the downloaded and extracted koondkorpus files.
+    out_dir: str
+        The directory to store the results and the manifest of converted files.
+    encoding: str
+        Encoding of the TEI XML files.
+    processes: int
+        The number of worker processes. If None, the number of CPUs is used.
+    fmt: str
+        'json' for one indented JSON file per document, 'jsonl' for JSON lines shards.
+    shard_size: int
+        The maximum number of documents in a JSON lines shard.
+    """
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    completed = read_manifest(out_dir)
+    jobs = []
+    total_bytes = 0
+    for input_fnm in get_input_files(start_dir):
+        if input_fnm in completed:
+            continue
+        full_fnm = os.path.join(start_dir, input_fnm)
+        out_prefix = os.path.join(out_dir, os.path.basename(full_fnm))
+        jobs.append((full_fnm, input_fnm, out_prefix, encoding, fmt, shard_size))
+        total_bytes += os.path.getsize(full_fnm)
+    logger.info('{0} files already converted, {1} files ({2:.1f} MB) to convert'.format(
+        len(completed), len(jobs), total_bytes / 1e6))
+
+    started = time.time()
+    done_bytes = 0
+    documents = 0
+    pool = Pool(processes)
+    try:
+        with codecs.open(os.path.join(out_dir, MANIFEST), 'ab', 'utf-8') as manifest:
+            for done, record in enumerate(pool.imap_unordered(convert_file, jobs), 1):
+                manifest.write(json.dumps(record))
+                manifest.write('\n')
+                manifest.flush()
+                os.fsync(manifest.fileno())
+
+                done_bytes += record['bytes']
+                documents += record['documents']
+                elapsed = time.time() - started
+                rate = done_bytes / elapsed if elapsed > 0 else 0
+                eta = (total_bytes - done_bytes) / rate if rate > 0 else 0
+                logger.info('[{0}/{1}] {2}: {3} documents in {4:.1f}s | total {5} documents, '
+                            '{6:.1f} documents/s, {7:.2f} MB/s, ETA {8:.0f}s'.format(
+                                done, len(jobs), record['input'], record['documents'], record['seconds'],
+                                documents, documents / elapsed if elapsed > 0 else 0, rate / 1e6, eta))
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
 
 
 if __name__ == '__main__':
@@ -59,6 +199,12 @@ if __name__ == '__main__':
     parser.add_argument('startdir', type=str, help='The path of the downloaded and extracted koondkorpus files')
     parser.add_argument('outdir', type=str, help='The directory to store output results')
     parser.add_argument('-e', '--encoding', type=str, default=None, help='Encoding of the TEI XML files')
+    parser.add_argument('-p', '--processes', type=int, default=None,
+                        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('-f', '--format', type=str, default=JSON, choices=[JSON, JSONL],
+                        help='json: one indented JSON file per document, jsonl: compact JSON lines shards')
+    parser.add_argument('-s', '--shard-size', type=int, default=1000,
+                        help='Maximum number of documents per JSON lines shard (default: 1000)')
     args = parser.parse_args()
 
-    process(args.startdir, args.outdir, args.encoding)
+    process(args.startdir, args.outdir, args.encoding, args.processes, args.format, args.shard_size)
@@ -2,6 +2,8 @@
 """Module containing functionality to resolve conflicting matches."""
 from __future__ import unicode_literals, print_function, absolute_import
 
+from heapq import heappush, heappop
+
 
 def resolve_using_maximal_coverage(matches):
     """Given a list of matches, select a subset of matches
@@ -22,26 +24,37 @@ def resolve_using_maximal_coverage(matches):
     N = len(matches)
     scores = [len(match) for match in matches]
     prev = [-1] * N
+    # Weighted interval scheduling. Match j can precede match i, if it ends before i starts.
+    # As matches are sorted by start, j stays a possible predecessor for all following matches,
+    # once it has been "released". Among the released matches we keep the one with the highest
+    # score, preferring smaller indices in case of ties.
+    unreleased = [(matches[0].end, 0)]  # heap of (end, index) of matches not yet released
+    unlinked = [0]  # heap of unreleased indices that start a new chain (prev == -1)
+    released = set()
+    bestscore = -1
+    bestprev = -1
     for i in range(1, N):
-        bestscore = -1
-        bestprev = -1
-        j = i
-        while j >= 0:
-            # if matches do not overlap
-            if matches[j].is_before(matches[i]):
-                l = scores[j] + len(matches[i])
-                if l >= bestscore:
-                    bestscore = l
-                    bestprev = j
-            else:
-                # in case of overlapping matches
-                l = scores[j] - len(matches[j]) + len(matches[i])
-                if l >= bestscore:
-                    bestscore = l
-                    bestprev = prev[j]
-            j = j - 1
-        scores[i] = bestscore
-        prev[i] = bestprev
+        start = matches[i].start
+        while unreleased and unreleased[0][0] <= start:
+            j = heappop(unreleased)[1]
+            released.add(j)
+            if scores[j] > bestscore or (scores[j] == bestscore and j < bestprev):
+                bestscore = scores[j]
+                bestprev = j
+        while unlinked and unlinked[0] in released:
+            heappop(unlinked)
+        if bestscore > 0:
+            scores[i] = bestscore + len(matches[i])
+            prev[i] = bestprev
+        else:
+            # only chains of empty matches precede the match, so the overlapping match with
+            # the smallest index that starts a new chain wins the tie
+            if bestscore == 0 and (not unlinked or bestprev < unlinked[0]):
+                prev[i] = bestprev
+            scores[i] = len(matches[i])
+        heappush(unreleased, (matches[i].end, i))
+        if prev[i] == -1:
+            heappush(unlinked, i)
     # first find the matching with highest combined score
     bestscore = max(scores)
     bestidx = len(scores) - scores[-1::-1].index(bestscore) -1
@@ -53,4 +66,3 @@ def resolve_using_maximal_coverage(matches):
         bestidx = prev[bestidx]
     # filter the matches
     return [matches[idx] for idx in reversed(keepidxs)]
-
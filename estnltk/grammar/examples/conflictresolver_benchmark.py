@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of conflict resolution on synthetic match sets.
+
+Run as::
+
+    python -m estnltk.grammar.examples.conflictresolver_benchmark
+
+The time per match should stay roughly constant as the number of matches grows.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import random
+import timeit
+
+from ..match import Match
+from ..conflictresolver import resolve_using_maximal_coverage
+
+
+def synthetic_matches(n, max_length=30, seed=0):
+    """Generate `n` random, heavily overlapping matches, similar to the matches of broad Regex/Lemmas symbols."""
+    rnd = random.Random(seed)
+    text_length = n * 4
+    matches = []
+    for _ in range(n):
+        start = rnd.randint(0, text_length)
+        end = start + rnd.randint(1, max_length)
+        matches.append(Match(start, end, 'x' * (end - start)))
+    return matches
+
+
+def benchmark(sizes=(1000, 4000, 16000, 64000), repeat=3):
+    print('{0:>8} {1:>10} {2:>14}'.format('matches', 'seconds', 'us per match'))
+    for n in sizes:
+        matches = synthetic_matches(n)
+        seconds = min(timeit.repeat(lambda: resolve_using_maximal_coverage(list(matches)), number=1, repeat=repeat))
+        print('{0:>8} {1:>10.4f} {2:>14.2f}'.format(n, seconds, seconds * 1e6 / n))
+
+
+if __name__ == '__main__':
+    benchmark()
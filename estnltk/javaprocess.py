@@ -5,15 +5,67 @@ Attributes
 ----------
 JAVARES_PATH: str
     The root path for Java components of Estnltk library.
+ROUND_ROBIN: str
+    Dispatch policy of :py:class:`~estnltk.javaprocess.JavaProcessPool` that sends lines to
+    the processes in turns.
+LEAST_BUSY: str
+    Dispatch policy of :py:class:`~estnltk.javaprocess.JavaProcessPool` that sends lines to
+    the process with the smallest number of pending lines.
+LATENCY_BUCKETS: tuple of float
+    Upper bounds (in seconds) of the buckets of the latency histogram of Java processes.
+TERMINATE_TIMEOUT: float
+    The number of seconds to wait for a terminated Java process to exit, before it is killed.
 """
 from __future__ import unicode_literals, print_function
 
 from estnltk.core import PACKAGE_PATH, as_unicode, as_binary
+from six.moves import queue
+from collections import deque
+from bisect import bisect_left
 import subprocess
+import threading
+import time
 import os
 
 JAVARES_PATH = os.path.join(PACKAGE_PATH, 'java-res')
 
+ROUND_ROBIN = 'round_robin'
+LEAST_BUSY = 'least_busy'
+
+LATENCY_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0, 60.0, float('inf'))
+
+TERMINATE_TIMEOUT = 5.0
+
+
+def read_lines(stream, lines):
+    """Read lines from the stream into a queue until EOF. None is put to the queue on EOF."""
+    try:
+        for line in iter(stream.readline, b''):
+            lines.put(line)
+    except (IOError, ValueError):
+        pass # the stream was closed
+    lines.put(None)
+
+
+def drain_lines(stream, buffer):
+    """Read lines from the stream into a bounded buffer until EOF.
+
+    Lines that are not valid UTF-8 are decoded with replacement characters, so the
+    stream is read until the end regardless of what the process writes to it.
+    """
+    try:
+        for line in iter(stream.readline, b''):
+            buffer.append(line.decode('utf-8', 'replace').rstrip())
+    except (IOError, ValueError):
+        pass # the stream was closed
+
+
+def start_daemon(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.daemon = True
+    thread.start()
+    return thread
+
 
 class JavaProcess(object):
     """Base class for Java-based components.
@@ -31,9 +83,25 @@ class JavaProcess(object):
     `process_line` method to interact with the process.
     
     It deals with input/output and errors.
+    The standard output and the standard error of the process are read by background threads,
+    so a chatty Java component cannot fill up the pipe buffers. The last lines of the standard
+    error are kept in a bounded buffer (see `stderr` property).
+    If the process fails or does not respond in time, it is restarted and the failed lines are
+    processed again.
+
+    Attributes
+    ----------
+    calls: int
+        The number of successful `process_line` / `process_lines` calls.
+    restarts: int
+        The number of times the Java VM has been restarted.
+    timeouts: int
+        The number of reads that have timed out.
+    latency_histogram: list of int
+        The number of successful calls per latency bucket, see LATENCY_BUCKETS.
     """
 
-    def __init__(self, runnable_jar, args=[]):
+    def __init__(self, runnable_jar, args=[], pool_size=1, dispatch=LEAST_BUSY, **kwargs):
         """Initialize a Java VM.
         
         Parameters
@@ -43,12 +111,118 @@ class JavaProcess(object):
             to reside in `java-res` folder of the estnltk project.
         args: list of str
             The list of arguments given to the Java program.
+        pool_size: int (default: 1)
+            The number of Java VMs to run. If larger than 1, the lines are processed
+            by a :py:class:`~estnltk.javaprocess.JavaProcessPool` and the component
+            can be used concurrently from several threads.
+        dispatch: str (default: LEAST_BUSY)
+            The dispatch policy of the pool (either ROUND_ROBIN or LEAST_BUSY).
+        timeout: float (default: None)
+            The number of seconds to wait for a resulting line. If None, wait forever.
+        max_retries: int (default: 1)
+            How many times the process is restarted and the failed lines are processed again,
+            before the error is raised.
+        stderr_buffer_size: int (default: 1000)
+            The number of last lines of standard error that are kept.
         """
-        self._process = subprocess.Popen(['java', '-jar', os.path.join(JAVARES_PATH, runnable_jar)] + args,
+        self._runnable_jar = runnable_jar
+        self._args = list(args)
+        self.timeout = kwargs.get('timeout', None)
+        self.max_retries = kwargs.get('max_retries', 1)
+        self._stderr_lines = deque(maxlen=kwargs.get('stderr_buffer_size', 1000))
+        self.calls = 0
+        self.restarts = 0
+        self.timeouts = 0
+        self.latency_histogram = [0] * len(LATENCY_BUCKETS)
+        self._pool = None
+        self._process = None
+        if pool_size > 1:
+            self._pool = JavaProcessPool(runnable_jar, args, pool_size, dispatch, **kwargs)
+        else:
+            self._start()
+
+    def _start(self):
+        self._process = subprocess.Popen(['java', '-jar', os.path.join(JAVARES_PATH, self._runnable_jar)] + self._args,
                                          stdin=subprocess.PIPE,
                                          stdout=subprocess.PIPE,
                                          stderr=subprocess.PIPE)
-                                         
+        self._stdout_lines = queue.Queue()
+        self._stdout_reader = start_daemon(read_lines, self._process.stdout, self._stdout_lines)
+        self._stderr_reader = start_daemon(drain_lines, self._process.stderr, self._stderr_lines)
+
+    def _terminate_process(self):
+        process = self._process
+        try:
+            process.terminate()
+        except OSError:
+            pass # the process has already exited
+        # reap the process, so that restarts do not leave zombie processes behind
+        deadline = time.time() + TERMINATE_TIMEOUT
+        while process.poll() is None and time.time() < deadline:
+            time.sleep(0.01)
+        if process.poll() is None:
+            try:
+                process.kill()
+            except OSError:
+                pass
+            process.wait()
+        # the reader threads stop at EOF of the exited process, before their streams are closed
+        self._stdout_reader.join(1.0)
+        self._stderr_reader.join(1.0)
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except (IOError, OSError, ValueError):
+                pass # broken pipe while flushing the input
+
+    def restart(self):
+        """Terminate the Java VM and start a new one."""
+        self._terminate_process()
+        self._start()
+        self.restarts += 1
+
+    def terminate(self):
+        """Terminate the Java VM (or all VMs of the pool)."""
+        if self._pool is not None:
+            self._pool.terminate()
+        else:
+            self._terminate_process()
+
+    @property
+    def stderr(self):
+        """The last lines written to standard error by the Java VM."""
+        return '\n'.join(self._stderr_lines)
+
+    @property
+    def stats(self):
+        """Dictionary of the counters of the process (or the sum over all processes of the pool)."""
+        if self._pool is not None:
+            return self._pool.stats
+        return {
+            'calls': self.calls,
+            'restarts': self.restarts,
+            'timeouts': self.timeouts,
+            'latency_histogram': list(zip(LATENCY_BUCKETS, self.latency_histogram))
+        }
+
+    def _read_line(self):
+        try:
+            result = self._stdout_lines.get(timeout=self.timeout)
+        except queue.Empty:
+            self.timeouts += 1
+            raise Exception('No output in {0} seconds while reading stream. Stderr is {1}.'.format(self.timeout, self.stderr))
+        if result is None:
+            self._stderr_reader.join(1.0)
+            raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(self.stderr))
+        return as_unicode(result)
+
+    def _communicate(self, lines):
+        for line in lines:
+            self._process.stdin.write(as_binary(line))
+            self._process.stdin.write(as_binary('\n'))
+        self._process.stdin.flush()
+        return [self._read_line() for _ in lines]
+
     def process_line(self, line):
         """Process a line of data.
         
@@ -68,20 +242,165 @@ class JavaProcess(object):
         Raises
         ------
         Exception
-            In case of EOF is encountered.
+            In case of EOF is encountered or timeout is exceeded `max_retries` + 1 times.
         IoError
             In case it was impossible to read or write from the subprocess standard input / output.
         """
         assert isinstance(line, str)
+        if self._pool is not None:
+            return self._pool.process_line(line)
+        return self.process_lines([line])[0]
+
+    def process_lines(self, lines):
+        """Process several lines of data at once.
+
+        All the lines are written to the pipe before the results are read, so the Java
+        component can process the next line without waiting for a synchronous round-trip.
+        As the output is read by a background thread, the pipes cannot fill up.
+
+        Parameters
+        ----------
+        lines: list of str
+            The data sent to process. Make sure the lines do not contain any newline characters.
+
+        Returns
+        -------
+        list of str: The lines returned by the Java process, in the same order as the input lines.
+
+        Raises
+        ------
+        Exception
+            In case of EOF is encountered or timeout is exceeded `max_retries` + 1 times.
+        IoError
+            In case it was impossible to read or write from the subprocess standard input / output.
+        """
+        lines = list(lines)
+        for line in lines:
+            assert isinstance(line, str)
+        if self._pool is not None:
+            return self._pool.process_lines(lines)
+        if len(lines) == 0:
+            return []
+        if self._process.poll() is not None:
+            # the process has failed or terminated during an earlier call
+            self.restart()
+        retries = 0
+        while True:
+            start = time.time()
+            try:
+                results = self._communicate(lines)
+                break
+            except Exception:
+                if retries >= self.max_retries:
+                    self._terminate_process()
+                    raise
+                retries += 1
+                self.restart()
+        self.calls += 1
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, time.time() - start)] += 1
+        return results
+
+
+class JavaProcessPool(object):
+    """Pool of Java VMs running the same component.
+
+    Each call to :py:meth:`~estnltk.javaprocess.JavaProcessPool.process_line` is dispatched
+    to one of the processes, so that several threads can use the component at the same time.
+    A single process handles only one line at a time, other threads wait for their turn.
+
+    Failed processes are restarted by the :py:class:`~estnltk.javaprocess.JavaProcess`
+    instances themselves.
+    """
+
+    def __init__(self, runnable_jar, args=[], size=2, dispatch=LEAST_BUSY, **kwargs):
+        """Start the Java VMs.
+
+        Parameters
+        ----------
+        runnable_jar: str
+            Path of the JAR file to be run. The java program is expected
+            to reside in `java-res` folder of the estnltk project.
+        args: list of str
+            The list of arguments given to the Java program.
+        size: int (default: 2)
+            The number of Java VMs in the pool.
+        dispatch: str (default: LEAST_BUSY)
+            Either ROUND_ROBIN, which sends the lines to processes in turns, or LEAST_BUSY,
+            which sends the line to the process with the smallest number of pending lines.
+        kwargs:
+            Keyword arguments (`timeout`, `max_retries`, `stderr_buffer_size`) passed to
+            each :py:class:`~estnltk.javaprocess.JavaProcess`.
+        """
+        if size < 1:
+            raise ValueError('Pool size must be at least 1, but {0} was given'.format(size))
+        if dispatch not in (ROUND_ROBIN, LEAST_BUSY):
+            raise ValueError('Unknown dispatch policy <{0}>'.format(dispatch))
+        self._dispatch = dispatch
+        self._lock = threading.Lock()
+        self._workers = [JavaProcess(runnable_jar, args, **kwargs) for _ in range(size)]
+        self._worker_locks = [threading.Lock() for _ in range(size)]
+        self._pending = [0] * size
+        self._next = 0
+
+    @property
+    def size(self):
+        """The number of Java VMs in the pool."""
+        return len(self._workers)
+
+    @property
+    def restarts(self):
+        """The number of processes that have been restarted."""
+        return sum(worker.restarts for worker in self._workers)
+
+    @property
+    def stats(self):
+        """Dictionary of the counters summed over all processes of the pool."""
+        histogram = [sum(counts) for counts in zip(*[worker.latency_histogram for worker in self._workers])]
+        return {
+            'calls': sum(worker.calls for worker in self._workers),
+            'restarts': self.restarts,
+            'timeouts': sum(worker.timeouts for worker in self._workers),
+            'latency_histogram': list(zip(LATENCY_BUCKETS, histogram))
+        }
+
+    def _checkout(self):
+        with self._lock:
+            if self._dispatch == ROUND_ROBIN:
+                idx = self._next
+                self._next = (idx + 1) % len(self._workers)
+            else:
+                idx = min(range(len(self._workers)), key=lambda i: self._pending[i])
+            self._pending[idx] += 1
+        return idx
+
+    def _checkin(self, idx):
+        with self._lock:
+            self._pending[idx] -= 1
+
+    def _call(self, method, data):
+        idx = self._checkout()
         try:
-            self._process.stdin.write(as_binary(line))
-            self._process.stdin.write(as_binary('\n'))
-            self._process.stdin.flush()
-            result = as_unicode(self._process.stdout.readline())
-            if result == '':
-                stderr = as_unicode(self._process.stderr.read())
-                raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(stderr))
-            return result
-        except Exception:
-            self._process.terminate()
-            raise
+            with self._worker_locks[idx]:
+                return getattr(self._workers[idx], method)(data)
+        finally:
+            self._checkin(idx)
+
+    def process_line(self, line):
+        """Process a line of data using one of the processes of the pool.
+
+        See :py:meth:`~estnltk.javaprocess.JavaProcess.process_line`.
+        """
+        return self._call('process_line', line)
+
+    def process_lines(self, lines):
+        """Process several lines of data using one of the processes of the pool.
+
+        See :py:meth:`~estnltk.javaprocess.JavaProcess.process_lines`.
+        """
+        return self._call('process_lines', lines)
+
+    def terminate(self):
+        """Terminate all Java VMs of the pool."""
+        for idx, lock in enumerate(self._worker_locks):
+            with lock:
+                self._workers[idx].terminate()
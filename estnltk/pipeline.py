@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Corpus-level processing of :py:class:`~estnltk.text.Text` documents using a pool of worker processes.
+
+Instead of writing a loop over ``Text(...).tag_*()`` calls, a corpus can be processed in parallel::
+
+    from estnltk.pipeline import process
+
+    for text in process(documents, ['analysis', 'timexes'], processes=8):
+        print(text.lemmas)
+
+Each worker process lazily creates its own NER tagger, temporal expression tagger, clause segmenter
+and verb chain detector on first use, so the Java subprocesses and the NER models are never shared
+between processes. The morphological analyser is handled by
+:py:meth:`~estnltk.vabamorf.morf.Vabamorf.instance`, which already reinitialises itself in forked processes.
+
+Attributes
+----------
+PIPELINE_LAYERS: list of str
+    The layers that can be requested from the pipeline.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from .core import VERB_CHAIN_RES_PATH
+from .names import *
+from .text import Text
+from .ner import NerTagger
+from .timex import TimexTagger
+from .clausesegmenter import ClauseSegmenter
+from .mw_verbs.verbchain_detector import VerbChainDetector
+
+from multiprocessing import Pool
+import os
+
+PIPELINE_LAYERS = [PARAGRAPHS, SENTENCES, WORDS, ANALYSIS, LABEL, NAMED_ENTITIES, TIMEXES,
+                   CLAUSE_ANNOTATION, CLAUSES, VERB_CHAINS, WORDNET]
+
+# taggers owned by the current worker process
+worker_pid = None
+worker_taggers = {}
+
+
+def get_worker_taggers():
+    """Return the taggers of the current process.
+
+    Taggers are created lazily, when they are first requested by a :py:class:`~estnltk.text.Text`
+    instance. A new set is created in case the process has been forked.
+
+    Returns
+    -------
+    dict
+        Keyword arguments that can be passed to :py:class:`~estnltk.text.Text` constructor.
+    """
+    global worker_pid
+    global worker_taggers
+    if worker_pid != os.getpid():
+        worker_pid = os.getpid()
+        worker_taggers = {}
+    return worker_taggers
+
+
+class LazyTagger(object):
+    """Proxy that creates the actual tagger on first attribute access and
+    stores it in the taggers of the current worker process."""
+
+    def __init__(self, name, factory):
+        self.__name = name
+        self.__factory = factory
+
+    def __getattr__(self, item):
+        taggers = get_worker_taggers()
+        if self.__name not in taggers:
+            taggers[self.__name] = self.__factory()
+        return getattr(taggers[self.__name], item)
+
+
+def load_worker_functionality():
+    """Keyword arguments for :py:class:`~estnltk.text.Text` that refer to the taggers of the current process."""
+    return {
+        'ner_tagger': LazyTagger('ner_tagger', NerTagger),
+        'timex_tagger': LazyTagger('timex_tagger', TimexTagger),
+        'clause_segmenter': LazyTagger('clause_segmenter', ClauseSegmenter),
+        'verbchain_detector': LazyTagger('verbchain_detector',
+                                         lambda: VerbChainDetector(resourcesPath=VERB_CHAIN_RES_PATH))
+    }
+
+
+def process_document(document, layers, **kwargs):
+    """Tag a single document with given layers.
+
+    Parameters
+    ----------
+    document: str or dict
+        Either a raw string or a JSON document (for example, a previously tagged :py:class:`~estnltk.text.Text`).
+    layers: list of str
+        The layers to tag.
+    kwargs:
+        Keyword arguments passed to :py:class:`~estnltk.text.Text` constructor.
+
+    Returns
+    -------
+    Text
+    """
+    functionality = load_worker_functionality()
+    functionality.update(kwargs)
+    text = Text(document, **functionality)
+    for layer in layers:
+        if not text.is_tagged(layer):
+            text.tag(layer)
+    return text
+
+
+def process_job(job):
+    """Function executed by worker processes. Returns the tagged document as a plain dict,
+    so that it can be sent back to the parent process."""
+    document, layers, kwargs = job
+    return dict(process_document(document, layers, **kwargs))
+
+
+def check_layers(layers):
+    for layer in layers:
+        if layer not in PIPELINE_LAYERS:
+            raise ValueError('Unsupported layer <{0}>, supported layers are {1}'.format(layer, PIPELINE_LAYERS))
+
+
+def process(documents, layers, processes=None, ordered=True, chunksize=1, **kwargs):
+    """Tag a corpus of documents using a pool of worker processes.
+
+    Parameters
+    ----------
+    documents: iterable of str or dict
+        Raw strings or JSON documents to process. The iterable is consumed lazily.
+    layers: list of str
+        The layers to tag, for example ``['words', 'analysis', 'named_entities', 'timexes', 'verb_chains']``.
+        The dependencies of the layers are tagged automatically.
+    processes: int (default: None)
+        The number of worker processes. If None, the number of CPUs is used.
+        If 0, the documents are processed in the current process.
+    ordered: boolean (default: True)
+        If True, the results are yielded in the order of the input. Otherwise, the results are
+        yielded as soon as they are completed.
+    chunksize: int (default: 1)
+        The number of documents sent to a worker at once.
+    kwargs:
+        Keyword arguments passed to :py:class:`~estnltk.text.Text` constructor, such as
+        ``disambiguate`` or ``creation_date``. These must be picklable.
+
+    Returns
+    -------
+    generator of Text
+    """
+    check_layers(layers)
+    if processes == 0:
+        for document in documents:
+            yield process_document(document, layers, **kwargs)
+        return
+    jobs = ((document, layers, kwargs) for document in documents)
+    pool = Pool(processes)
+    try:
+        if ordered:
+            results = pool.imap(process_job, jobs, chunksize)
+        else:
+            results = pool.imap_unordered(process_job, jobs, chunksize)
+        for result in results:
+            yield Text(result, **kwargs)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def process_all(documents, layers, processes=None, ordered=True, chunksize=1, **kwargs):
+    """Tag a corpus of documents using a pool of worker processes and return the results as a list.
+
+    See :py:func:`~estnltk.pipeline.process` for the description of the arguments.
+
+    Returns
+    -------
+    list of Text
+    """
+    return list(process(documents, layers, processes, ordered, chunksize, **kwargs))
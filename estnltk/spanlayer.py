@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Module containing a compact, columnar representation of simple layers.
+
+A regular layer is a list of dictionaries, each holding the ``start`` and ``end`` positions
+of the element. For large documents, the dictionaries take most of the memory.
+:py:class:`~estnltk.spanlayer.SpanLayer` stores the positions of the elements in two
+NumPy int32 arrays instead and creates the dictionaries lazily, when the elements are accessed.
+
+The dictionary views are cached, so the annotations added to them (for example morphological
+analysis of words) are preserved. The start and end positions of the views must not be changed,
+as the arrays are used for computing the spans of the layer.
+
+Text instances created with ``compact_spans=True`` store ``paragraphs``, ``sentences`` and
+``words`` layers as span layers::
+
+    text = Text('Esimene lause. Teine lause.', compact_spans=True)
+    text.word_spans  # computed from the arrays
+    text.divide()    # vectorized grouping of words into sentences
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from .names import START, END, TEXT
+
+import numpy as np
+
+
+class SpanLayer(object):
+    """Layer of simple (start, end) spans backed by NumPy arrays.
+
+    Behaves like a read-only list of element dictionaries.
+
+    Parameters
+    ----------
+    starts: list of int
+        The start positions of the elements.
+    ends: list of int
+        The end positions of the elements.
+    text: str
+        If given, the element dictionaries also contain the ``text`` of the element.
+    """
+
+    def __init__(self, starts, ends, text=None):
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.ends = np.asarray(ends, dtype=np.int32)
+        if self.starts.shape != self.ends.shape:
+            raise ValueError('The number of start and end positions differ')
+        self.text = text
+        self._elements = {}
+
+    @classmethod
+    def from_elements(cls, elements, text=None):
+        """Create a span layer from a list of elements with simple spans.
+
+        Only the positions of the elements are kept.
+        """
+        return cls([e[START] for e in elements], [e[END] for e in elements], text)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self.take(range(*idx.indices(len(self))))
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('span layer index out of range')
+        element = self._elements.get(idx)
+        if element is None:
+            start, end = int(self.starts[idx]), int(self.ends[idx])
+            element = {START: start, END: end}
+            if self.text is not None:
+                element[TEXT] = self.text[start:end]
+            self._elements[idx] = element
+        return element
+
+    def __iter__(self):
+        return iter(self.take(range(len(self))))
+
+    def take(self, indices):
+        """The list of elements at the given indices."""
+        elements = self._elements
+        starts = self.starts.tolist()
+        ends = self.ends.tolist()
+        text = self.text
+        result = []
+        for idx in indices:
+            element = elements.get(idx)
+            if element is None:
+                start, end = starts[idx], ends[idx]
+                element = {START: start, END: end}
+                if text is not None:
+                    element[TEXT] = text[start:end]
+                elements[idx] = element
+            result.append(element)
+        return result
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'SpanLayer({0} spans)'.format(len(self))
+
+    def spans(self):
+        """The list of (start, end) tuples of the elements."""
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def texts(self, text):
+        """The texts of the elements."""
+        return [text[start:end] for start, end in zip(self.starts.tolist(), self.ends.tolist())]
+
+    def is_sorted(self):
+        """Are both the start and the end positions in non-decreasing order?"""
+        return bool(np.all(self.starts[1:] >= self.starts[:-1]) and np.all(self.ends[1:] >= self.ends[:-1]))
+
+    def to_list(self):
+        """Convert the layer to a regular list of element dictionaries, for example for JSON serialization."""
+        return [dict(element) for element in self]
+
+
+def divide_span_layers(elements, by):
+    """Divide the elements of a span layer into the bins given by the spans of another span layer.
+
+    Gives the same result as :py:func:`~estnltk.dividing.divide` without translation, but the bins
+    are computed with binary searches over the position arrays.
+
+    Parameters
+    ----------
+    elements: SpanLayer
+        Elements to be grouped into bins. Must be sorted.
+    by: SpanLayer
+        Elements defining the bins. Must be sorted.
+
+    Returns
+    -------
+    list of (list of dict)
+    """
+    bins = [[] for _ in range(len(by))]
+    if len(elements) == 0 or len(by) == 0:
+        return bins
+    # the first outer span that ends after the inner span, if it also starts before it
+    outer = np.searchsorted(by.ends, elements.ends, side='left')
+    valid = outer < len(by)
+    valid[valid] = by.starts[outer[valid]] <= elements.starts[valid]
+    inner = np.flatnonzero(valid)
+    outer = outer[inner]
+    # split the (sorted) inner elements to bins
+    bounds = np.searchsorted(outer, np.arange(len(by) + 1), side='left').tolist()
+    inner = elements.take(inner.tolist())
+    for idx in range(len(by)):
+        bins[idx] = inner[bounds[idx]:bounds[idx+1]]
+    return bins
@@ -25,7 +25,8 @@
 from __future__ import unicode_literals, print_function
 from estnltk.names import *
 
-from estnltk.core import PACKAGE_PATH
+from estnltk.core import PACKAGE_PATH, as_unicode, as_binary
+from estnltk.javaprocess import JavaProcess
 
 import re, json
 import os, os.path
@@ -36,6 +37,8 @@ import subprocess
 MALTPARSER_PATH  = os.path.join(PACKAGE_PATH, 'java-res', 'maltparser')
 MALTPARSER_MODEL = 'estnltkECG_f02_b'
 MALTPARSER_JAR   = 'maltparser-1.9.0.jar'
+# seconds to wait for an output line of the long-lived MaltParser's process
+MALTPARSER_TIMEOUT = 60
 
 
 # (!) Note: using these constants will be deprecated in the future versions of the parser:
@@ -522,6 +525,95 @@ def _executeMaltparser( input_string, maltparser_dir, maltparser_jar, model_name
 
     return results
 
+class MaltParserProcess(JavaProcess):
+    ''' A long-lived MaltParser process, which loads the model only once and
+        parses CONLL format sentences streamed through its standard input / 
+        output. 
+        
+        MaltParser reads its input sentence by sentence (a sentence is ended by
+        an empty line), and writes out the parsed sentence in the same format.
+        So, each sentence is sent down the pipe, and the corresponding output 
+        lines are read back before sending the next one.
+        
+        Note: this relies on the special files /dev/stdin and /dev/stdout, and
+        is therefore not available on Windows; see MaltParserProcess.is_supported();
+    '''
+
+    def __init__( self, maltparser_dir, maltparser_jar, model_name, timeout=MALTPARSER_TIMEOUT, **kwargs ):
+        ''' Starts the MaltParser's process.
+        
+            Parameters
+            ----------
+            maltparser_dir: string
+                  the directory containing Maltparser's jar and the model file; 
+            maltparser_jar: string
+                  name of the Maltparser's jar file that should be executed;
+            model_name: string
+                  name of the model that should be used;
+            timeout: float
+                  the number of seconds to wait for an output line; if MaltParser
+                  does not respond in time, parse_sentence() raises an exception;
+                  Default: MALTPARSER_TIMEOUT
+            kwargs:
+                  other keyword arguments (e.g. `max_retries`) passed to JavaProcess;
+                  a pool of processes (`pool_size` > 1) is not supported;
+        '''
+        if kwargs.get('pool_size', 1) != 1:
+            raise ValueError('MaltParserProcess does not support pool_size other than 1')
+        JavaProcess.__init__( self, os.path.join(maltparser_dir, maltparser_jar), \
+                              ['-c', model_name, '-w', maltparser_dir, '-m', 'parse', \
+                               '-i', '/dev/stdin', '-o', '/dev/stdout', '-v', 'off'], \
+                              timeout=timeout, **kwargs )
+
+    @staticmethod
+    def is_supported():
+        ''' Can MaltParser be run as a long-lived process on this platform? '''
+        return os.name != 'nt' and os.path.exists('/dev/stdin') and os.path.exists('/dev/stdout')
+
+    def parse_sentence( self, sentence_lines ):
+        ''' Sends CONLL lines of a single sentence to the process, and returns the 
+            lines of the parsed sentence (without the ending empty line).
+        '''
+        try:
+            for line in sentence_lines:
+                self._process.stdin.write( as_binary(line) )
+                self._process.stdin.write( as_binary('\n') )
+            self._process.stdin.write( as_binary('\n') )
+            self._process.stdin.flush()
+            # the output is read by the background thread of JavaProcess; _read_line
+            # raises on EOF or timeout, with the error text from the stderr buffer
+            results = []
+            while True:
+                result = self._read_line().rstrip()
+                if len(result) == 0:
+                    break
+                results.append( result )
+            return results
+        except Exception:
+            self._terminate_process()
+            raise
+
+    def parse( self, input_string ):
+        ''' Parses given (CONLL-style) input string, and returns the result in 
+            the same format as _executeMaltparser(): as an array of lines from 
+            Maltparser's output, where sentences are separated by empty lines.
+        '''
+        results = []
+        sentence_lines = []
+        for line in input_string.split('\n'):
+            line = line.rstrip()
+            if len(line) > 0:
+                sentence_lines.append( line )
+            elif sentence_lines:
+                results.extend( self.parse_sentence( sentence_lines ) )
+                results.append( '' )
+                sentence_lines = []
+        if sentence_lines:
+            results.extend( self.parse_sentence( sentence_lines ) )
+            results.append( '' )
+        return results
+
+
 # =============================================================================
 # =============================================================================
 #  Converting data from CONLL to estnltk JSON
@@ -13,12 +13,15 @@
 #
 
 import os.path
+import logging
 
 from estnltk.names import *
 
 from estnltk.syntax.maltparser_support import MALTPARSER_PATH, MALTPARSER_MODEL, MALTPARSER_JAR
+from estnltk.syntax.maltparser_support import MALTPARSER_TIMEOUT
 from estnltk.syntax.maltparser_support import CONLLFeatGenerator
 from estnltk.syntax.maltparser_support import convert_text_to_CONLL, _executeMaltparser
+from estnltk.syntax.maltparser_support import MaltParserProcess
 from estnltk.syntax.maltparser_support import augmentTextWithCONLLstr
 from estnltk.syntax.maltparser_support import align_CONLL_with_Text
 
@@ -27,6 +30,8 @@ from estnltk.syntax.vislcg3_syntax import VISLCG3Pipeline, cleanup_lines, align_
 
 from estnltk.syntax.utils import normalise_alignments, build_trees_from_text
 
+logger = logging.getLogger(__name__)
+
 
 # ==================================================================================
 # ==================================================================================
@@ -350,6 +355,13 @@ class MaltParser(object):
     model_name        = MALTPARSER_MODEL
     maltparser_jar    = MALTPARSER_JAR
     feature_generator = None
+    persistent        = True
+    timeout           = MALTPARSER_TIMEOUT
+    maltparser_process = None
+    # number of consecutive failures of the long-lived process; after 
+    # max_process_failures of them, the long-lived process is not started again
+    process_failures     = 0
+    max_process_failures = 3
     
     def __init__( self, **kwargs):
         ''' Initializes MaltParser's wrapper. 
@@ -372,6 +384,22 @@ class MaltParser(object):
                 for tokens.
                 NB! This must be the same feature generator that was used for training 
                 the model of MaltParser;
+            
+            persistent : bool
+                If True, MaltParser is run as a long-lived process that loads the 
+                model only once, and sentences are streamed to it via standard 
+                input / output; If False, or if the long-lived process is not 
+                supported on the platform, a new MaltParser's process is started
+                for each parse_text() call;
+                If the long-lived process fails, the failure is logged and the 
+                one-shot process is used instead; after max_process_failures 
+                consecutive failures, the long-lived process is disabled;
+                Default: True
+            
+            timeout : float
+                The number of seconds the long-lived process is waited for an 
+                output line, before it is considered failed;
+                Default: MALTPARSER_TIMEOUT (60)
         '''
         for argName, argVal in kwargs.items():
             if argName == 'maltparser_dir':
@@ -382,6 +410,10 @@ class MaltParser(object):
                 self.maltparser_jar = argVal
             elif argName == 'feature_generator':
                self.feature_generator = argVal
+            elif argName == 'persistent':
+               self.persistent = bool(argVal)
+            elif argName == 'timeout':
+               self.timeout = argVal
             else:
                 raise Exception(' Unsupported argument given: '+argName)
         if not self.maltparser_dir:
@@ -483,10 +515,7 @@ class MaltParser(object):
         textConllStr = convert_text_to_CONLL( text, self.feature_generator )
 
         # Execute MaltParser and get results as CONLL formatted string
-        resultsConllStr = \
-            _executeMaltparser( textConllStr, self.maltparser_dir, \
-                                              self.maltparser_jar, \
-                                              self.model_name )
+        resultsConllStr = self._execute( textConllStr )
         # Align the results with the initial text
         alignments = \
             align_CONLL_with_Text( resultsConllStr, text, self.feature_generator, **kwargs )
@@ -521,6 +550,39 @@ class MaltParser(object):
 
 
 
+    def _execute( self, textConllStr ):
+        ''' Executes MaltParser on given CONLL formatted string and returns the 
+            results as a list of lines.
+            
+            Uses the long-lived MaltParser's process, if it is enabled and 
+            supported; otherwise (or if the long-lived process fails), falls 
+            back to executing a new MaltParser's process for the input;
+        '''
+        if self.persistent and MaltParserProcess.is_supported():
+            try:
+                if self.maltparser_process is None:
+                    self.maltparser_process = \
+                        MaltParserProcess( self.maltparser_dir, self.maltparser_jar, \
+                                           self.model_name, timeout=self.timeout )
+                results = self.maltparser_process.parse( textConllStr )
+                self.process_failures = 0
+                return results
+            except Exception:
+                # The process has been terminated; fall back to the one-shot 
+                # execution, and start a new process on the next call;
+                self.maltparser_process = None
+                self.process_failures += 1
+                logger.warning('Long-lived MaltParser process failed, using a one-shot process instead', \
+                               exc_info=True)
+                if self.process_failures >= self.max_process_failures:
+                    logger.warning('Long-lived MaltParser process failed {0} times in a row, it is '\
+                                   'disabled'.format(self.process_failures))
+                    self.persistent = False
+        return _executeMaltparser( textConllStr, self.maltparser_dir, \
+                                                 self.maltparser_jar, \
+                                                 self.model_name )
+
+
     @staticmethod
     def load_default_feature_generator():
         ''' Initialize CONLLFeatGenerator with default settings. '''
@@ -11,24 +11,29 @@ The resulting documents have paragraphs separated by two newlines and sentences
 The original plain text is not known for XML TEI files.
 Note that all punctuation has been separated from words in the TEI files.
 
-TODO: Make this module faster, it is dead slow, probably due to BeautifulSoup4.
+The files are parsed incrementally with ElementTree.iterparse, so documents are
+yielded one <div> at a time and the memory usage does not depend on the size of the file.
 """
 from __future__ import unicode_literals, print_function, absolute_import
 
 from .core import get_filenames
 from .names import *
 from .text import Text
-from bs4 import BeautifulSoup
-from copy import deepcopy
+from xml.etree import ElementTree
 
+import codecs
 import os
+import re
+
+DIV_REGEX = re.compile('^div(\d+)$')
+XML_ENCODING_REGEX = re.compile(r'''^(\ufeff?\s*<\?xml[^>]*?\bencoding\s*=\s*)(["'])[^"']*\2''')
 
 
 def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None):
     """Parse documents from TEI style XML files.
-    
+
     Gives each document FILE attribute that denotes the original filename.
-    
+
     Parameters
     ----------
     root: str
@@ -40,28 +45,37 @@ def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encod
     target: list of str
         List of <div> types, that are considered documents in the XML files (default: ["artikkel"]).
     encoding: str
-        Encoding to be used for decoding the content of the XML file. If not specified (default), 
-        then no separate decoding step is applied.
-        
+        Encoding to be used for decoding the content of the XML file. If not specified (default),
+        then the encoding given in the XML declaration (or UTF-8) is used.
+
     Returns
     -------
     list of estnltk.text.Text
         Corpus containing parsed documents from all files. The file path
         is stored in FILE attribute of the documents.
     """
-    documents = []
+    return list(iter_tei_corpora(root, prefix, suffix, target, encoding))
+
+
+def iter_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None):
+    """Parse documents from TEI style XML files one at a time.
+
+    See :py:func:`~estnltk.teicorpus.parse_tei_corpora` for the description of the arguments.
+
+    Returns
+    -------
+    generator of estnltk.text.Text
+    """
     for fnm in get_filenames(root, prefix, suffix):
         path = os.path.join(root, fnm)
-        docs = parse_tei_corpus(path, target, encoding)
-        for doc in docs:
+        for doc in iter_tei_corpus(path, target, encoding):
             doc[FILE] = fnm
-        documents.extend(docs)
-    return documents
+            yield doc
 
 
 def parse_tei_corpus(path, target=['artikkel'], encoding=None):
     """Parse documents from a TEI style XML file.
-    
+
     Parameters
     ----------
     path: str
@@ -69,104 +83,185 @@ def parse_tei_corpus(path, target=['artikkel'], encoding=None):
     target: list of str
         List of <div> types, that are considered documents in the XML files (default: ["artikkel"]).
     encoding: str
-        Encoding to be used for decoding the content of the XML file. If not specified (default), 
-        then no separate decoding step is applied.
+        Encoding to be used for decoding the content of the XML file. If not specified (default),
+        then the encoding given in the XML declaration (or UTF-8) is used.
 
     Returns
     -------
     list of esnltk.text.Text
     """
+    return list(iter_tei_corpus(path, target, encoding))
+
+
+def iter_tei_corpus(path, target=['artikkel'], encoding=None):
+    """Parse documents from a TEI style XML file one at a time.
+
+    See :py:func:`~estnltk.teicorpus.parse_tei_corpus` for the description of the arguments.
+
+    Returns
+    -------
+    generator of esnltk.text.Text
+    """
     with open(path, 'rb') as f:
-        html_doc = f.read()
-    if encoding:
-        html_doc = html_doc.decode( encoding )
-    soup = BeautifulSoup(html_doc, 'html5lib')
-    title = soup.find_all('title')[0].string
-    
-    documents = []
-    for div1 in soup.find_all('div1'):
-        documents.extend(parse_div(div1, dict(), target))
-    return tokenize_documents(documents)
-
-
-def get_subdiv(div):
-    n = div[3:]
-    return 'div' + str(int(n) + 1)
-
-
-def parse_div(soup, metadata, target):
-    """Parse a <div> tag from the file.
-    
+        source = f if encoding is None else Utf8Recoder(f, encoding)
+        for document in iter_divs(source, target):
+            yield tokenize_document(document)
+
+
+class Utf8Recoder(object):
+    """File-like object that reads a file in given encoding and returns its content in UTF-8.
+
+    The encoding in the XML declaration is replaced with UTF-8, so that the parser
+    does not decode the recoded content using the original encoding.
+    """
+
+    def __init__(self, f, encoding):
+        self.reader = codecs.getreader(encoding)(f)
+        self.started = False
+
+    def read(self, size=-1):
+        text = self.reader.read(size)
+        if not self.started:
+            self.started = True
+            # read the whole XML declaration before replacing the encoding
+            while text.lstrip('\ufeff \t\r\n').startswith('<?xml') and '?>' not in text:
+                more = self.reader.read(size)
+                if not more:
+                    break
+                text += more
+            text = XML_ENCODING_REGEX.sub(r'\1\2utf-8\2', text, count=1)
+        return text.encode('utf-8')
+
+
+def local_name(tag):
+    """Tag name without the XML namespace."""
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def iter_divs(source, target):
+    """Parse the <div> tags of the XML file.
+
     The sections in XML files are given in <div1>, <div2> and <div3>
     tags. Each such tag has a type and name (plus possibly more extra attributes).
-    
+    The name is the text in the beginning of the div, usually given in <head> tag.
+
     If the div type is found in target variable, the div is parsed
     into structured paragraphs, sentences and words.
-    
-    Otherwise, the type and name are added as metadata to subdivs
-    and stored in.
-    
+
+    Otherwise, the type and name are added as metadata to subdivs.
+
     Parameters
     ----------
-    soup: bs4.BeautifulSoup
-        The parsed XML data.
-    metdata: dict
-        The metadata for parent divs.
+    source: file
+        The XML file.
     target: list of str
         List of <div> types, that are considered documents in the XML files.
-    
+
+    Yields
+    ------
+    dict
+        Documents with paragraphs given as list of sentences.
+    """
+    # open elements and the open <div> tags as (level, element, is target, metadata) tuples
+    elements = []
+    divs = []
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        name = local_name(elem.tag)
+        match = DIV_REGEX.match(name)
+        if event == 'start':
+            if match is not None:
+                level = int(match.group(1))
+                if level == 1:
+                    divs.append((level, elem, False, dict()))
+                elif divs and divs[-1][0] == level - 1 and not divs[-1][2] and divs[-1][1] is not None:
+                    parent_level, parent, _, parent_metadata = divs[-1]
+                    metadata = dict(parent_metadata)
+                    metadata[parent.get('type', None)] = get_div_title(parent)
+                    divs.append((level, elem, elem.get('type', None) in target, metadata))
+                else:
+                    # not a subdiv of the enclosing div or enclosed in a document
+                    divs.append((level, None, False, None))
+            elements.append(elem)
+            continue
+
+        elements.pop()
+        if match is not None:
+            level, div, is_target, metadata = divs.pop()
+            if is_target:
+                yield parse_div(div, metadata)
+            if div is not None and (is_target or level == 1):
+                # all documents of the div have been yielded
+                div.clear()
+                if elements:
+                    elements[-1].remove(div)
+
+
+def get_div_title(div):
+    """The title of the div: the text in the beginning of the div, including the text of <head> tags."""
+    texts = [div.text or '']
+    for child in div:
+        if local_name(child.tag) != 'head':
+            break
+        texts.append(child.text or '')
+        if len(child) > 0:
+            break
+        texts.append(child.tail or '')
+    return ''.join(texts).strip()
+
+
+def parse_div(div, metadata):
+    """Parse a document <div> tag.
+
+    Parameters
+    ----------
+    div: xml.etree.ElementTree.Element
+        The div element.
+    metadata: dict
+        The metadata from parent divs.
+
+    Returns
+    -------
+    dict
+        The document with paragraphs given as list of sentences.
     """
-    documents = []
-    div_type = soup.get('type', None)
-    div_title = list(soup.children)[0].string.strip()
-    
-    if div_type in target:
-        div_authors = soup.find_all('author')
-        document = {
-            'type': div_type,
-            'title': div_title,
-            'paragraphs': parse_paragraphs(soup)
-        }
-        # add author, if it exists
-        if len(div_authors) > 0:
-            div_author = div_authors[0].text.strip()
-            document['author'] = div_author
-        # add collected metadata
-        for k, v in metadata.items():
-            document[k] = v
-        documents.append(document)
-    else:
-        metadata[div_type] = div_title
-
-        # recurse subdivs
-        subdiv_name = get_subdiv(soup.name)
-        subdivs = []
-        if subdiv_name is not None:
-            subdivs = soup.find_all(subdiv_name)
-        if len(subdivs) > 0:
-            for subdiv in subdivs:
-                documents.extend(parse_div(subdiv, deepcopy(metadata), target))
-    return documents
-
-
-def parse_paragraphs(soup):
+    document = {
+        'type': div.get('type', None),
+        'title': get_div_title(div),
+        'paragraphs': parse_paragraphs(div)
+    }
+    # add author, if it exists
+    for author in div.iter():
+        if local_name(author.tag) == 'author':
+            document['author'] = ''.join(author.itertext()).strip()
+            break
+    # add collected metadata
+    for k, v in metadata.items():
+        document[k] = v
+    return document
+
+
+def parse_paragraphs(div):
     """Parse sentences and paragraphs in the section.
-    
+
     Parameters
     ----------
-    soup: bs4.BeautifulSoup
-        The parsed XML data.
-        
+    div: xml.etree.ElementTree.Element
+        The div element.
+
     Returns
     -------
     list of (list of str)
         List of paragraphs given as list of sentences.
     """
     paragraphs = []
-    for para in soup.find_all('p'):
+    for para in div.iter():
+        if local_name(para.tag) != 'p':
+            continue
         sentences = []
-        for sent in para.find_all('s'):
-            sentence = sent.text.strip()
+        for sent in para.iter():
+            if local_name(sent.tag) != 's':
+                continue
+            sentence = ''.join(sent.itertext()).strip()
             if len(sentence) > 0:
                 sentences.append(sentence)
         if len(sentences) > 0:
@@ -183,13 +278,14 @@ def concatenate(texts, sep=' ', offset=0):
     return sep.join(texts), spans
 
 
+def tokenize_document(doc):
+    """Convert the imported document to :py:class:'~estnltk.text.Text' instance."""
+    text = '\n\n'.join(['\n'.join(para[SENTENCES]) for para in doc[PARAGRAPHS]])
+    doc[TEXT] = text
+    del doc[PARAGRAPHS]
+    return Text(doc)
+
+
 def tokenize_documents(docs):
     """Convert the imported documents to :py:class:'~estnltk.text.Text' instances."""
-    sep = '\n\n'
-    texts = []
-    for doc in docs:
-        text = '\n\n'.join(['\n'.join(para[SENTENCES]) for para in doc[PARAGRAPHS]])
-        doc[TEXT] = text
-        del doc[PARAGRAPHS]
-        texts.append(Text(doc))
-    return texts
+    return [tokenize_document(doc) for doc in docs]
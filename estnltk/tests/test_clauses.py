@@ -4,6 +4,7 @@ from __future__ import unicode_literals, print_function, absolute_import
 import unittest
 
 from ..text import Text
+from ..names import *
 
 from ..clausesegmenter import ClauseSegmenter
 
@@ -50,3 +51,27 @@ class ClausesTest(unittest.TestCase):
         # Terminate Java process in order to avoid "OSError: [WinError 6] The handle is invalid"
         # in subsequent Java processing
         segmenter._process.terminate()
+
+    def test_batches(self):
+        text_str = 'Kõrred, millel on toitunud viljasääse vastsed, jäävad õhukeseks. Mees, keda seal kohtasime, oli tuttav ja teretas meid. Tere!'
+        segmenters = [ClauseSegmenter(), ClauseSegmenter(batch_size=1), ClauseSegmenter(batch_size=2)]
+        results = []
+        for segmenter in segmenters:
+            text = Text(text_str, clause_segmenter = segmenter)
+            results.append(text.clause_texts)
+            # Terminate Java process in order to avoid "OSError: [WinError 6] The handle is invalid"
+            # in subsequent Java processing
+            segmenter._process.terminate()
+        self.assertEqual(len(results[0]), 5)
+        self.assertListEqual(results[0], results[1])
+        self.assertListEqual(results[0], results[2])
+
+    def test_analysis_is_not_modified(self):
+        segmenter = ClauseSegmenter()
+        text = Text('Kõrred, millel on toitunud viljasääse vastsed, jäävad õhukeseks.', clause_segmenter = segmenter, phonetic = True)
+        roots = [[a[ROOT] for a in word[ANALYSIS]] for word in text.words]
+        text.tag_clauses()
+        self.assertListEqual([[a[ROOT] for a in word[ANALYSIS]] for word in text.words], roots)
+        # Terminate Java process in order to avoid "OSError: [WinError 6] The handle is invalid"
+        # in subsequent Java processing
+        segmenter._process.terminate()
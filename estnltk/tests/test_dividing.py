@@ -2,7 +2,8 @@
 from __future__ import unicode_literals, print_function, absolute_import
 import unittest
 
-from ..dividing import contains, filter_containing, divide
+from ..dividing import contains, filter_containing, divide, divide_index
+from ..text import Text
 
 
 class ContainsTest(unittest.TestCase):
@@ -112,3 +113,33 @@ class TranslateTest(unittest.TestCase):
         expected = [[element([0, 20], [1, 21])], [element([0], [1])]]
         divs = divide(inner, outer, translate=True, sep='1234567890')
         self.assertListEqual(expected, divs)
+
+
+class DivideIndexTest(unittest.TestCase):
+
+    def test_divide_index(self):
+        outer = [element(0, 10), element(10, 20), element(25, 30), element(40, 50)]
+        inner = [element(0, 3), element(4, 10), element(8, 12), element(12, 15), element(26, 28)]
+        ranges = divide_index(inner, outer)
+        self.assertListEqual(ranges, [(0, 2), (3, 4), (4, 5), (0, 0)])
+        self.assertListEqual([inner[first:last] for first, last in ranges], divide(inner, outer))
+
+    def test_multispans_are_not_indexed(self):
+        outer = [element([0, 100], [50, 150])]
+        inner = [element(0, 10), element(100, 110)]
+        self.assertIsNone(divide_index(inner, outer))
+
+    def test_text_divide(self):
+        text = Text('Esimene lause. Teine lause. Kolmas lause.')
+        expected = divide(text.words, text.sentences)
+        self.assertListEqual(text.divide(), expected)
+        self.assertListEqual(text.divide(), expected)
+        self.assertIs(text.divide()[0][0], text.words[0])
+
+    def test_text_divide_is_invalidated(self):
+        text = Text('Esimene lause. Teine lause.')
+        self.assertEqual(len(text.divide()), 2)
+        text['sentences'] = [{'start': 0, 'end': len(text.text)}]
+        self.assertListEqual(text.divide(), [text.words])
+        text['words'] = text['words'][:2]
+        self.assertListEqual(text.divide(), [text['words']])
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import json
+import threading
+import unittest
+
+import elasticsearch
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from ..text import Text
+from ..database.elastic import Index, REJECTED_STATUS, ALTERNATIVE_SEPARATOR
+
+
+class StubElasticHandler(BaseHTTPRequestHandler):
+    """Answers index existence checks and bulk requests. The first `reject` bulk items are rejected."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_json(200, {})
+
+    def do_POST(self):
+        server = self.server
+        lines = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8').splitlines()
+        items = []
+        for action, source in zip(lines[0::2], lines[1::2]):
+            op_type, meta = json.loads(action).popitem()
+            with server.lock:
+                if server.reject > 0:
+                    server.reject -= 1
+                    items.append({op_type: {'status': REJECTED_STATUS, 'error': 'rejected execution'}})
+                    continue
+                server.saved.append((meta, json.loads(source)))
+            items.append({op_type: {'status': 201, '_id': meta.get('_id', 'generated')}})
+        with server.lock:
+            server.requests += 1
+        self.send_json(200, {'took': 1, 'errors': False, 'items': items})
+
+
+class SaveManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), StubElasticHandler)
+        self.server.lock = threading.Lock()
+        self.server.saved = []
+        self.server.requests = 0
+        self.server.reject = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        client = elasticsearch.Elasticsearch([{'host': '127.0.0.1', 'port': self.server.server_address[1]}])
+        self.index = Index(client, 'test_index')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def documents(self):
+        return [(Text('Esimene lause. Teine lause.'), {'title': 'esimene'}),
+                Text('Kolmas lause.')]
+
+    def test_save_many(self):
+        chunks = []
+        indexed, errors = self.index.save_many(self.documents(), chunk_size=2, threads=2, progress=chunks.append)
+
+        self.assertEqual(indexed, 5)
+        self.assertListEqual(errors, [])
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(self.server.requests, 3)
+
+        documents = [(meta, source) for meta, source in self.server.saved if meta['_type'] == 'document']
+        sentences = [(meta, source) for meta, source in self.server.saved if meta['_type'] == 'sentence']
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(len(sentences), 3)
+        document_ids = set(meta['_id'] for meta, source in documents)
+        self.assertTrue(all(meta['_parent'] in document_ids for meta, source in sentences))
+        self.assertListEqual(sorted(source['text'] for meta, source in sentences),
+                             ['Esimene lause.', 'Kolmas lause.', 'Teine lause.'])
+
+    def test_documents_are_read_lazily(self):
+        consumed = []
+
+        def documents():
+            for idx in range(20):
+                consumed.append(idx)
+                yield Text('Lause.')
+
+        # every document and its sentence make up a chunk
+        read_ahead = []
+        indexed, errors = self.index.save_many(documents(), chunk_size=2, threads=2,
+                                               progress=lambda stats: read_ahead.append(len(consumed) - stats['chunk']))
+
+        self.assertEqual(indexed, 40)
+        self.assertEqual(len(read_ahead), 20)
+        self.assertLessEqual(max(read_ahead), 2 * 2 + 1)
+
+    def test_rejected_are_retried(self):
+        self.server.reject = 3
+        chunks = []
+        indexed, errors = self.index.save_many(self.documents(), chunk_size=10, initial_backoff=0.01,
+                                               progress=chunks.append)
+
+        self.assertEqual(indexed, 5)
+        self.assertListEqual(errors, [])
+        self.assertEqual(chunks[0]['retries'], 3)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_retries_are_limited(self):
+        self.server.reject = 100
+        indexed, errors = self.index.save_many(self.documents(), chunk_size=10, max_retries=2, initial_backoff=0.01)
+
+        self.assertEqual(indexed, 0)
+        self.assertEqual(len(errors), 5)
+
+
+class IndexableSentencesTest(unittest.TestCase):
+
+    def test_alternatives_share_position(self):
+        text = Text('Mees peeti kinni. ' + ' '.join(['Kas palk oli suur ja tee pikk?'] * 10))
+        for sent, indexable in zip(text.split_by_sentences(), Index._get_indexable_sentences(text)):
+            indexable = json.loads(indexable)
+            lemmas = indexable['lemmas'].split(' ')
+            postags = indexable['postags'].split(' ')
+            self.assertEqual(len(lemmas), len(sent.words))
+            self.assertEqual(len(postags), len(sent.words))
+            for token, alternatives in zip(lemmas, sent.lemma_lists):
+                self.assertListEqual(token.split(ALTERNATIVE_SEPARATOR), sorted(set(alternatives)))
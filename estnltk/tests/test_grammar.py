@@ -3,6 +3,7 @@ from __future__ import unicode_literals, print_function, absolute_import
 import unittest
 
 from estnltk import Text, Lemmas, Postags, Union, Match, IRegex, Concatenation, Intersection, Suffix, LayerRegex, Layer
+from estnltk.grammar.conflictresolver import resolve_using_maximal_coverage
 
 
 class UnionTest(unittest.TestCase):
@@ -160,3 +161,24 @@ class LayerRegexTest(unittest.TestCase):
         expected = [Match(0, 5, 'Janne')]
         self.assertListEqual(expected, matches)
 
+
+
+class ConflictResolverTest(unittest.TestCase):
+
+    def resolve(self, spans):
+        matches = [Match(start, end, 'x' * (end - start)) for start, end in spans]
+        return [(match.start, match.end) for match in resolve_using_maximal_coverage(matches)]
+
+    def test_maximal_coverage(self):
+        self.assertListEqual(self.resolve([(0, 4), (2, 8), (5, 9), (9, 12)]), [(0, 4), (5, 9), (9, 12)])
+        self.assertListEqual(self.resolve([(4, 6), (0, 2), (1, 5)]), [(0, 2), (4, 6)])
+
+    def test_ties(self):
+        self.assertListEqual(self.resolve([(0, 3), (3, 6), (0, 6)]), [(0, 3), (3, 6)])
+        self.assertListEqual(self.resolve([(0, 0), (0, 2), (2, 2), (1, 3)]), [(0, 0), (0, 2), (2, 2)])
+
+    def test_many_matches(self):
+        spans = [(start, start + 3) for start in range(20000)]
+        resolved = self.resolve(spans)
+        self.assertEqual(len(resolved), 6667)
+        self.assertTrue(all(a[1] <= b[0] for a, b in zip(resolved, resolved[1:])))
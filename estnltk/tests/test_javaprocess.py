@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+from collections import deque
+from io import BytesIO
+import subprocess
+import sys
+import unittest
+
+from six.moves import queue
+
+from ..javaprocess import JavaProcess, drain_lines, start_daemon, read_lines
+
+
+ECHO_SCRIPT = 'import sys\nfor line in iter(sys.stdin.readline, ""):\n    sys.stdout.write(line)\n    sys.stdout.flush()\n'
+
+
+class EchoProcess(JavaProcess):
+    """Runs a Python process echoing its input instead of a Java VM."""
+
+    def __init__(self, **kwargs):
+        JavaProcess.__init__(self, 'echo.jar', **kwargs)
+
+    def _start(self):
+        self._process = subprocess.Popen([sys.executable, '-c', ECHO_SCRIPT],
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE)
+        self._stdout_lines = queue.Queue()
+        self._stdout_reader = start_daemon(read_lines, self._process.stdout, self._stdout_lines)
+        self._stderr_reader = start_daemon(drain_lines, self._process.stderr, self._stderr_lines)
+
+
+class DrainLinesTest(unittest.TestCase):
+
+    def test_invalid_utf8(self):
+        lines = deque()
+        drain_lines(BytesIO(b'ok1\n\xff\xfe bad\nok2\nok3\n'), lines)
+        self.assertEqual(4, len(lines))
+        self.assertEqual(['ok1', 'ok2', 'ok3'], [lines[0], lines[2], lines[3]])
+        self.assertIn('bad', lines[1])
+
+
+class JavaProcessTest(unittest.TestCase):
+
+    def test_restart_reaps_process(self):
+        process = EchoProcess(timeout=10)
+        try:
+            self.assertEqual(['tere\n', 'maailm\n'], process.process_lines(['tere', 'maailm']))
+            old = process._process
+            process.restart()
+            self.assertIsNotNone(old.poll())
+            self.assertTrue(old.stdin.closed)
+            self.assertTrue(old.stdout.closed)
+            self.assertTrue(old.stderr.closed)
+            self.assertEqual('tere\n', process.process_line('tere'))
+            self.assertEqual(1, process.restarts)
+        finally:
+            process.terminate()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ..text import Text
+from ..pipeline import process, process_all
+from ..names import *
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_ordered(self):
+        texts = process_all(self.documents, [ANALYSIS], processes=2)
+        self.assertListEqual([text.lemmas for text in texts], self.expected_lemmas())
+
+    def test_unordered(self):
+        texts = process_all(self.documents, [ANALYSIS], processes=2, ordered=False)
+        self.assertListEqual(sorted(text.text for text in texts), sorted(self.documents))
+
+    def test_single_process(self):
+        texts = list(process(self.documents, [ANALYSIS], processes=0))
+        self.assertListEqual([text.lemmas for text in texts], self.expected_lemmas())
+
+    def test_json_documents(self):
+        documents = [Text(doc).tokenize_words() for doc in self.documents]
+        texts = process_all(documents, [ANALYSIS], processes=2)
+        self.assertListEqual([text.lemmas for text in texts], self.expected_lemmas())
+
+    def test_unsupported_layer(self):
+        self.assertRaises(ValueError, process_all, self.documents, ['unknown_layer'])
+
+    def expected_lemmas(self):
+        return [Text(doc).lemmas for doc in self.documents]
+
+    @property
+    def documents(self):
+        return [
+            'Esimene lause on siin. Teine lause on seal.',
+            'Mees, keda seal kohtasime, oli tuttav.',
+            'Kolmapäeval läksime linna ja ostsime kommi.',
+            'Tere!'
+        ]
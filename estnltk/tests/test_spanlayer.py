@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import random
+import unittest
+
+from ..spanlayer import SpanLayer
+from ..dividing import divide
+from ..text import Text
+
+
+class SpanLayerTest(unittest.TestCase):
+
+    def test_elements(self):
+        layer = SpanLayer([0, 6, 10], [4, 9, 12], text='Tere, see on test')
+        self.assertEqual(len(layer), 3)
+        self.assertDictEqual(layer[0], {'start': 0, 'end': 4, 'text': 'Tere'})
+        self.assertDictEqual(layer[-1], {'start': 10, 'end': 12, 'text': 'on'})
+        self.assertListEqual(layer.spans(), [(0, 4), (6, 9), (10, 12)])
+        self.assertListEqual(layer.to_list(), [{'start': 0, 'end': 4, 'text': 'Tere'},
+                                               {'start': 6, 'end': 9, 'text': 'see'},
+                                               {'start': 10, 'end': 12, 'text': 'on'}])
+        self.assertRaises(IndexError, lambda: layer[3])
+
+    def test_annotations_are_kept(self):
+        layer = SpanLayer([0, 5], [4, 8])
+        layer[1]['label'] = 'X'
+        self.assertEqual(layer[1]['label'], 'X')
+        self.assertListEqual([e.get('label') for e in layer], [None, 'X'])
+
+    def test_divide(self):
+        rnd = random.Random(0)
+        for _ in range(100):
+            outer, inner = [], []
+            position = 0
+            for _ in range(rnd.randint(0, 10)):
+                start = position + rnd.randint(0, 3)
+                end = start + rnd.randint(0, 20)
+                outer.append({'start': start, 'end': end})
+                position = end
+            position = 0
+            for _ in range(rnd.randint(0, 40)):
+                start = position + rnd.randint(0, 3)
+                end = start + rnd.randint(0, 4)
+                inner.append({'start': start, 'end': end})
+                position = end
+            expected = divide(inner, outer)
+            result = divide(SpanLayer.from_elements(inner), SpanLayer.from_elements(outer))
+            self.assertListEqual(result, expected)
+
+
+class CompactTextTest(unittest.TestCase):
+
+    def test_compact_spans(self):
+        sentences = 'Esimene lause on siin. Teine lause. Kolmas, viimane lause.\n\nUus lõik.'
+        text = Text(sentences)
+        compact = Text(sentences, compact_spans=True)
+        self.assertIsInstance(compact.words, SpanLayer)
+        self.assertListEqual(compact.word_spans, text.word_spans)
+        self.assertListEqual(compact.word_texts, text.word_texts)
+        self.assertListEqual(compact.sentence_texts, text.sentence_texts)
+        self.assertListEqual(compact.paragraph_spans, text.paragraph_spans)
+        self.assertListEqual(compact.divide(), text.divide())
+        self.assertListEqual(compact.lemmas, text.lemmas)
@@ -5,6 +5,7 @@ import unittest
 
 from ..text import Text
 from ..syntax.parsers import MaltParser
+from ..syntax.maltparser_support import MaltParserProcess
 from ..names import *
 
 
@@ -42,6 +43,29 @@ class MaltParserSupportTest(unittest.TestCase):
             [[['@NN>', 1]], [['@ADVL', 2]], [['ROOT', -1]], [['@OBJ', 2]], [['@AN>', 5]], [['@SUBJ', 2]], [['@ADVL', 2]], [['xxx', 6]], [['@SUBJ', 9]], [['@FMV', 2]], [['@ADVL', 9]], [['@<NN', 10]], [['@OBJ', 9]], [['xxx', 12]]] )
             
 
+    def test_maltparser_persistent_and_oneshot(self):
+        text_str = 'Jänes oli põllu peal. Hunt jooksis metsas. Karuott magas laanes.'
+        mparser_persistent = MaltParser( persistent=True )
+        mparser_oneshot = MaltParser( persistent=False )
+        results = []
+        for mparser in [mparser_persistent, mparser_persistent, mparser_oneshot]:
+            text = Text( text_str )
+            text.tag_analysis()
+            results.append( mparser.parse_text( text, return_type = "conll" ) )
+        self.assertListEqual( results[0], results[1] )
+        self.assertListEqual( results[0], results[2] )
+        if MaltParserProcess.is_supported():
+            # the long-lived process must have been used, not the one-shot fallback
+            self.assertIsNotNone( mparser_persistent.maltparser_process )
+            self.assertEqual( mparser_persistent.process_failures, 0 )
+            self.assertEqual( mparser_persistent.maltparser_process.timeout, mparser_persistent.timeout )
+            mparser_persistent.maltparser_process.terminate()
+
+    def test_maltparser_process_pool_not_supported(self):
+        mparser = MaltParser()
+        with self.assertRaises( ValueError ):
+            MaltParserProcess( mparser.maltparser_dir, mparser.maltparser_jar, mparser.model_name, pool_size=2 )
+
     def test_maltparser_sent1_with_text(self):
         text = Text('Jänes oli parajasti põllu peal.')
         text.tag_syntax() # Assuming MaltParser is set as the default parser
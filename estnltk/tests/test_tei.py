@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function, absolute_import
 
-from ..teicorpus import parse_tei_corpora
-from ..core import AA_PATH
+from ..teicorpus import parse_tei_corpora, parse_tei_corpus, iter_tei_corpus
+from ..core import AA_PATH, get_filenames
 
+from bs4 import BeautifulSoup
+from copy import deepcopy
+import os
+import shutil
+import tempfile
 import unittest
 
 
@@ -12,3 +17,74 @@ class TeiTest(unittest.TestCase):
     def test_parse_tei(self):
         docs = parse_tei_corpora(AA_PATH, 'tea_AA_00')
         self.assertEqual(53, len(docs))
+
+    def test_iter_tei_corpus(self):
+        path = os.path.join(AA_PATH, 'tea_AA_00_1.tasak.xml')
+        docs = iter_tei_corpus(path)
+        doc = next(docs)
+        self.assertEqual(doc['title'], 'A & A - Veel kord 21. sajandi infotehnoloogiast : andmeturve')
+        self.assertEqual(doc['author'], 'Paul Leis')
+        self.assertEqual(doc['ajakirjanumber'], 'Arvutustehnika ja andmetöötlus 00_1')
+        self.assertTrue(doc.text.startswith('Paul Leis\n\nMuude 21. sajandit iseloomustavate asjade hulgas'))
+
+    def test_encoding(self):
+        xml = ('<?xml version="1.0" encoding="{0}"?>\n<TEI><text><body><div1 type="ajakirjanumber"><head>Number</head>'
+               '<div2 type="artikkel"><head>Õun ja äädikas</head><p><s>Šokolaad on üllatavalt õrn .</s></p>'
+               '</div2></div1></body></text></TEI>')
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for declared, encoding in [('iso-8859-15', 'iso-8859-15'), ('utf-8', 'iso-8859-15'), ('utf-16', 'utf-16')]:
+                path = os.path.join(tmpdir, 'doc.xml')
+                with open(path, 'wb') as f:
+                    f.write(xml.format(declared).encode(encoding))
+                docs = parse_tei_corpus(path, encoding=encoding)
+                self.assertEqual(1, len(docs))
+                self.assertEqual(docs[0]['title'], 'Õun ja äädikas')
+                self.assertEqual(docs[0].text, 'Šokolaad on üllatavalt õrn .')
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+class BeautifulSoupEquivalenceTest(unittest.TestCase):
+    """Compares the documents with the output of the previous BeautifulSoup/html5lib based parser."""
+
+    def parse_tei_corpus(self, path):
+        with open(path, 'rb') as f:
+            soup = BeautifulSoup(f.read().decode('utf-8'), 'html5lib')
+        documents = []
+        for div1 in soup.find_all('div1'):
+            documents.extend(self.parse_div(div1, dict(), ['artikkel']))
+        return documents
+
+    def parse_div(self, soup, metadata, target):
+        documents = []
+        div_type = soup.get('type', None)
+        div_title = list(soup.children)[0].string.strip()
+        if div_type in target:
+            div_authors = soup.find_all('author')
+            document = {'type': div_type, 'title': div_title, 'paragraphs': []}
+            for para in soup.find_all('p'):
+                sentences = [sent.text.strip() for sent in para.find_all('s') if len(sent.text.strip()) > 0]
+                if len(sentences) > 0:
+                    document['paragraphs'].append(sentences)
+            if len(div_authors) > 0:
+                document['author'] = div_authors[0].text.strip()
+            for k, v in metadata.items():
+                document[k] = v
+            documents.append(document)
+        else:
+            metadata[div_type] = div_title
+            for subdiv in soup.find_all('div' + str(int(soup.name[3:]) + 1)):
+                documents.extend(self.parse_div(subdiv, deepcopy(metadata), target))
+        return documents
+
+    def test_equivalence(self):
+        for fnm in get_filenames(AA_PATH, suffix='.xml'):
+            path = os.path.join(AA_PATH, fnm)
+            expected = self.parse_tei_corpus(path)
+            docs = parse_tei_corpus(path)
+            self.assertEqual(len(expected), len(docs), fnm)
+            for exp, doc in zip(expected, docs):
+                self.assertEqual(doc.text, '\n\n'.join('\n'.join(para) for para in exp.pop('paragraphs')))
+                for k, v in exp.items():
+                    self.assertEqual(doc[k], v)
@@ -140,3 +140,30 @@ class TextDivideTest(unittest.TestCase):
             [words[6], words[7], words[8]]
         ]
 
+
+
+class CacheInvalidationTest(unittest.TestCase):
+
+    def test_reassigned_layer(self):
+        text = Text('Esimene lause. Teine lause.')
+        self.assertEqual(len(text.sentence_spans), 2)
+        self.assertEqual(len(text.word_texts), 6)
+        text[SENTENCES] = [{START: 0, END: len(text.text)}]
+        text[WORDS] = text[WORDS][:2]
+        self.assertListEqual(text.sentence_spans, [(0, len(text.text))])
+        self.assertListEqual(text.word_texts, ['Esimene', 'lause'])
+        self.assertListEqual(text.lemmas, ['esimene', 'lause'])
+
+    def test_retagged_analysis(self):
+        text = Text('Esimene lause.')
+        self.assertListEqual(text.lemmas, ['esimene', 'lause', '.'])
+        text[WORDS][0][TEXT] = 'Teine'
+        text.tag_analysis()
+        self.assertListEqual(text.lemmas, ['teine', 'lause', '.'])
+
+    def test_deleted_layer(self):
+        text = Text('Esimene lause.')
+        self.assertListEqual(text.named_entity_texts, [])
+        del text[NAMED_ENTITIES]
+        text[NAMED_ENTITIES] = [{START: 0, END: 7, LABEL: 'PER'}]
+        self.assertListEqual(text.named_entity_texts, ['Esimene'])
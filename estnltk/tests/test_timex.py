@@ -48,6 +48,43 @@ class TimexTest(unittest.TestCase):
         # in subsequent Java processing
         timextagger._process.terminate()
 
+    def test_restart_and_stats(self):
+        timextagger = TimexTagger(timeout=60)
+        text = Text('Täna on ilus ilm', creation_date=datetime.datetime(1986, 12, 21), timex_tagger=timextagger)
+        text.tag_timexes()
+        # the next document must be processed by a restarted Java process
+        timextagger._process.terminate()
+        timextagger._process.wait()
+        text = Text('Täna on ilus ilm', creation_date=datetime.datetime(1986, 12, 21), timex_tagger=timextagger)
+        self.assertEqual(text.timexes[0][TMX_VALUE], '1986-12-21')
+        stats = timextagger.stats
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['restarts'], 1)
+        self.assertEqual(sum(count for bucket, count in stats['latency_histogram']), 2)
+        # Terminate Java process in order to avoid "OSError: [WinError 6] The handle is invalid"
+        # in subsequent Java processing
+        timextagger.terminate()
+
+    def test_pool_with_threads(self):
+        from multiprocessing.pool import ThreadPool
+        timextagger = TimexTagger(pool_size=2)
+        creation = datetime.datetime(1986, 12, 21)
+
+        def tag(example):
+            text = Text(example, creation_date=creation, timex_tagger=timextagger)
+            return [timex[TMX_VALUE] for timex in text.timexes]
+
+        single_tagger = TimexTagger()
+        expected = [[timex[TMX_VALUE] for timex in Text(example, creation_date=creation, timex_tagger=single_tagger).timexes]
+                    for example in self.examples]
+        threads = ThreadPool(4)
+        self.assertListEqual(threads.map(tag, self.examples), expected)
+        threads.close()
+        # Terminate Java processes in order to avoid "OSError: [WinError 6] The handle is invalid"
+        # in subsequent Java processing
+        timextagger.terminate()
+        single_tagger.terminate()
+
     @property
     def examples(self):
         return ['Linna maksutulu võib tuleval aastal langeda kuni 300 miljonit krooni.',
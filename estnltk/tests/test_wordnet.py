@@ -9,8 +9,10 @@ from __future__ import unicode_literals, print_function
 
 import unittest
 import sys, os
+import tempfile
+from array import array
 
-from ..wordnet import wn, eurown
+from ..wordnet import wn, eurown, snapshot, taxonomy
 
 
 class InternalSynsetOffsetQueryTest(unittest.TestCase):
@@ -36,6 +38,19 @@ class InternalSynsetOffsetQueryTest(unittest.TestCase):
     
     self.assertTrue(all(offset in result for offset in [idx_offset_pair[1] for idx_offset_pair in idx_offset_pairs]))    
 
+class InternalIndexTest(unittest.TestCase):
+
+  def test_lit_pos_index(self):
+    self.assertListEqual(wn._get_lit_pos_index()['aju']['n'],[10433,10434,12095,44798])
+    self.assertTrue('aju' not in wn._get_lit_pos_index().get('mittesõna',{}))
+
+  def test_sense_index(self):
+    self.assertEqual(wn._get_sense_index()['mõjutamine.n.02'],6)
+    self.assertEqual(wn._get_sense_index().get('mittesõna.n.01'),None)
+
+  def test_offset_index(self):
+    self.assertEqual(wn._get_offset_index()[65518],91684951)
+
 class SynsetKeyTest(unittest.TestCase):
   
   def test_key_derivation(self):
@@ -189,3 +204,88 @@ class Synset(unittest.TestCase):
     
     self.assertEqual(synset._min_depth(),3)
 
+
+class SnapshotTest(unittest.TestCase):
+
+  def setUp(self):
+    fd, self.snapshot_file = tempfile.mkstemp(suffix='.snapshot')
+    os.close(fd)
+
+  def tearDown(self):
+    wn.load_snapshot(None)
+    os.remove(self.snapshot_file)
+
+  def test_read_written_snapshot(self):
+    sections = [
+      ('ids', array('i', [3, 8])),
+      ('pos', array('i', [0, 0])),
+      ('variant_indptr', array('i', [0, 1, 3])),
+      ('variant_literals', array('i', [0, 1, 0])),
+      ('variant_senses', array('i', [1, 2, 3])),
+      ('literal_offsets', array('i', [0, 4, 12])),
+      ('literal_blob', array('B', 'rida'.encode('utf-8') + 'mõõdik'.encode('utf-8'))),
+      ('relation:has_hyponym:indptr', array('i', [0, 1, 1])),
+      ('relation:has_hyponym:targets', array('i', [8])),
+    ]
+    snapshot._write_snapshot(self.snapshot_file, sections, {'pos': ['n'], 'relations': ['has_hyponym']})
+    wn_snapshot = snapshot.WordnetSnapshot(self.snapshot_file)
+
+    self.assertEqual(len(wn_snapshot), 2)
+    self.assertTrue(8 in wn_snapshot)
+    self.assertFalse(5 in wn_snapshot)
+    self.assertEqual(wn_snapshot.name(3), 'rida.n.01')
+    self.assertListEqual(wn_snapshot.variants(8), [('mõõdik', 2), ('rida', 3)])
+    self.assertListEqual(wn_snapshot.related(3, 'has_hyponym'), [8])
+    self.assertListEqual(wn_snapshot.related(8, 'has_hyponym'), [])
+    self.assertListEqual(wn_snapshot.related(3, 'has_hyperonym'), [])
+
+  def test_related_synsets_from_snapshot(self):
+    ahel_synset = wn.synset("ahel.n.02")
+    related_ids = [ahel_synset.id] + [synset.id for relation in ('has_hyperonym', 'has_hyponym')
+                                      for synset in ahel_synset.get_related_synsets(relation)]
+    snapshot.build_snapshot(self.snapshot_file, synset_idxes=related_ids)
+    wn.load_snapshot(self.snapshot_file)
+
+    ahel_synset = wn.synset("ahel.n.02")
+    self.assertTrue(ahel_synset._raw is None)
+    self.assertEqual(ahel_synset.get_related_synsets('has_hyperonym')[0].name,'rida.n.01')
+    hyponyms = ahel_synset.get_related_synsets('has_hyponym')
+    self.assertEqual(hyponyms[0].name,'põhjusahel.n.01')
+    self.assertEqual(hyponyms[1].name,'mäeahelik.n.01')
+    self.assertEqual(ahel_synset.get_variants()[0].literal, 'ahel')
+
+class TaxonomyTest(unittest.TestCase):
+
+  # 1 and 2 are roots, 5 has two hypernyms
+  HYPERNYMS = {1: [], 2: [], 3: [1], 4: [1], 5: [3, 2], 6: [5], 7: [4]}
+
+  def setUp(self):
+    hyponyms = dict((idx, [hypo for hypo in self.HYPERNYMS if idx in self.HYPERNYMS[hypo]]) for idx in self.HYPERNYMS)
+    self.taxonomy = taxonomy.Taxonomy(self.HYPERNYMS.get, hyponyms.get)
+
+  def test_min_depth(self):
+    self.assertListEqual([self.taxonomy.min_depth(idx) for idx in range(1, 8)], [0, 0, 1, 1, 1, 2, 2])
+
+  def test_ancestors(self):
+    self.assertDictEqual(self.taxonomy.ancestors(6), {5: 1, 3: 2, 2: 2, 1: 3})
+    self.assertDictEqual(self.taxonomy.ancestors(1), {})
+
+  def test_lowest_common_hypernyms(self):
+    self.assertListEqual(self.taxonomy.lowest_common_hypernyms(6, 7), [1])
+    self.assertListEqual(self.taxonomy.lowest_common_hypernyms(6, 5), [3])
+    self.assertEqual(self.taxonomy.lowest_common_hypernyms(1, 2), None)
+
+  def test_shortest_path_distance(self):
+    self.assertEqual(self.taxonomy.shortest_path_distance(6, 6), 0)
+    self.assertEqual(self.taxonomy.shortest_path_distance(6, 7), 5)
+    self.assertEqual(self.taxonomy.shortest_path_distance(2, 4), 4)
+    self.assertListEqual(self.taxonomy.shortest_path_distances(7, [6, 7, 1, 2]), [5, 0, 2, 5])
+
+  def test_similarity_matrix(self):
+    synsets = [wn.synset('kaarhall.n.01'), wn.synset('näitusehall.n.01')]
+    matrix = wn.similarity_matrix(synsets, measure='path')
+
+    self.assertEqual(matrix.shape, (2, 2))
+    self.assertEqual(matrix[0, 0], 1.0)
+    self.assertEqual(matrix[0, 1], 1.0/3)
+    self.assertEqual(matrix[1, 0], synsets[1].path_similarity(synsets[0]))
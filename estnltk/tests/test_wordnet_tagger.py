@@ -21,3 +21,10 @@ class WordnetTaggerTest(unittest.TestCase):
         df = text.get.word_texts.postags.word_literals.as_dataframe
         #print(df)
         #pprint(text)
+
+    def test_compact_analysis(self):
+        text = Text('Laisk mees magas. Mees magas.', compact_analysis=True)
+        text.tag_wordnet()
+        expected = Text('Laisk mees magas. Mees magas.').tag_wordnet()
+        self.assertListEqual(text.synsets, expected.synsets)
+        self.assertIn(WORDNET, text.analysis[1][0])
@@ -10,7 +10,8 @@ from __future__ import unicode_literals, print_function, absolute_import
 from .core import as_unicode, POSTAG_DESCRIPTIONS, CASES, PLURALITY, VERB_TYPES
 from .core import VERB_CHAIN_RES_PATH
 from .names import *
-from .dividing import divide, divide_by_spans
+from .dividing import divide, divide_by_spans, divide_index
+from .spanlayer import SpanLayer
 from .vabamorf import morf as vabamorf
 from .ner import NerTagger
 from .timex import TimexTagger
@@ -92,6 +93,39 @@ def load_default_syntactic_parser():
     return syntactic_parser
 
 
+class layer_property(cached_property):
+    """Cached property that depends on given layers of the :py:class:`~estnltk.text.Text`.
+
+    The cached value is discarded, when any of the layers is reassigned or deleted,
+    or when the attributes of ``words`` layer (for example ``analysis``) are retagged.
+    """
+
+    def __init__(self, *layers):
+        self.layers = layers
+
+    def __call__(self, func):
+        super(layer_property, self).__init__(func)
+        return self
+
+
+# mapping from Text classes to dictionaries mapping layers to names of dependent properties
+layer_dependents = {}
+
+
+def get_layer_dependents(cls):
+    """Collect the names of the :py:class:`~estnltk.text.layer_property` properties of the class by layers."""
+    dependents = layer_dependents.get(cls)
+    if dependents is None:
+        dependents = defaultdict(list)
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                if isinstance(attr, layer_property):
+                    for layer in attr.layers:
+                        dependents[layer].append(name)
+        dependents = layer_dependents[cls] = dict(dependents)
+    return dependents
+
+
 class Text(dict):
     """Central class of Estnltk that is the main interface of performing
     all NLP operations.
@@ -128,6 +162,14 @@ class Text(dict):
             TextCleaner class.
         syntactic_parser: estnltk.syntax.parsers.MaltParser|estnltk.syntax.parsers.VISLCG3Parser
             Either VISLCG3 based syntactic analyser or MaltParser.
+        compact_spans: bool
+            If True, ``paragraphs``, ``sentences`` and ``words`` layers are stored as
+            :py:class:`~estnltk.spanlayer.SpanLayer` instances with the positions in NumPy arrays
+            (default: False). Note that these layers are not JSON serializable as such,
+            use :py:meth:`~estnltk.spanlayer.SpanLayer.to_list` to convert them.
+        compact_analysis: bool
+            If True, the words with the same morphological analysis share a single read-only
+            :py:class:`~estnltk.vabamorf.morf.SharedAnalysis` dictionary (default: False).
         """
         encoding = kwargs.get('encoding', 'utf-8')
         if isinstance(text_or_instance, dict):
@@ -137,6 +179,7 @@ class Text(dict):
             super(Text, self).__init__()
             self[TEXT] = as_unicode(text_or_instance, encoding)
         self.__kwargs = kwargs
+        self.__divide_indices = {}
         self.__load_functionality(**kwargs)
 
     def __load_functionality(self, **kwargs):
@@ -160,6 +203,20 @@ class Text(dict):
         )
         self.__text_cleaner = kwargs.get('text_cleaner', textcleaner)
         self.__syntactic_parser = kwargs.get('syntactic_parser', syntactic_parser)
+        self.__compact_spans = kwargs.get('compact_spans', False)
+
+    def __setitem__(self, key, value):
+        super(Text, self).__setitem__(key, value)
+        self.__invalidate(key)
+
+    def __delitem__(self, key):
+        super(Text, self).__delitem__(key)
+        self.__invalidate(key)
+
+    def __invalidate(self, layer):
+        """Discard the cached properties that depend on the given layer."""
+        for name in get_layer_dependents(type(self)).get(layer, []):
+            self.__dict__.pop(name, None)
 
     def get_kwargs(self):
         """Get the keyword arguments that were passed to the :py:class:`~estnltk.text.Text` when it was constructed."""
@@ -210,6 +267,8 @@ class Text(dict):
         list of str
             List of strings that make up given layer.
         """
+        if isinstance(self[layer], SpanLayer):
+            return self.texts_from_spans(self[layer], sep)
         return self.texts_from_spans(self.spans(layer), sep)
 
     def texts_from_spans(self, spans, sep=' '):
@@ -227,6 +286,8 @@ class Text(dict):
             List of strings that correspond to given spans.
         """
         text = self.text
+        if isinstance(spans, SpanLayer):
+            return spans.texts(text)
         texts = []
         for start, end in spans:
             if isinstance(start, list):
@@ -243,6 +304,8 @@ class Text(dict):
         list of (int, int)
             List of (start, end) tuples.
         """
+        if isinstance(self[layer], SpanLayer):
+            return self[layer].spans()
         spans = []
         for data in self[layer]:
             spans.append((data[START], data[END]))
@@ -250,6 +313,8 @@ class Text(dict):
 
     def starts(self, layer):
         """Retrieve start positions of elements if given layer."""
+        if isinstance(self[layer], SpanLayer):
+            return self[layer].starts.tolist()
         starts = []
         for data in self[layer]:
             starts.append(data[START])
@@ -257,6 +322,8 @@ class Text(dict):
 
     def ends(self, layer):
         """Retrieve end positions of elements if given layer."""
+        if isinstance(self[layer], SpanLayer):
+            return self[layer].ends.tolist()
         ends = []
         for data in self[layer]:
             ends.append(data[END])
@@ -337,7 +404,7 @@ class Text(dict):
     # RETRIEVING AND COMPUTING PROPERTIES
     # ///////////////////////////////////////////////////////////////////
 
-    @cached_property
+    @layer_property(TEXT)
     def text(self):
         """The raw underlying text that was used to initialize the Text instance."""
         return self[TEXT]
@@ -350,10 +417,12 @@ class Text(dict):
             SENTENCES: self.tokenize_sentences,
             WORDS: self.tokenize_words,
             ANALYSIS: self.tag_analysis,
+            LABEL: self.tag_labels,
             TIMEXES: self.tag_timexes,
             NAMED_ENTITIES: self.tag_named_entities,
             CLAUSE_ANNOTATION: self.tag_clause_annotations,
             CLAUSES: self.tag_clauses,
+            VERB_CHAINS: self.tag_verb_chains,
             LAYER_CONLL:   self.tag_syntax_vislcg3,
             LAYER_VISLCG3: self.tag_syntax_maltparser,
             WORDNET: self.tag_wordnet
@@ -370,41 +439,50 @@ class Text(dict):
         """Apply paragraph tokenization to this Text instance. Creates ``paragraphs`` layer."""
         tok = self.__paragraph_tokenizer
         spans = tok.span_tokenize(self.text)
+        if self.__compact_spans:
+            self[PARAGRAPHS] = self.__span_layer(list(spans))
+            return self
         dicts = []
         for start, end in spans:
             dicts.append({'start': start, 'end': end})
         self[PARAGRAPHS] = dicts
         return self
 
-    @cached_property
+    def __span_layer(self, spans, with_text=False):
+        """Create a :py:class:`~estnltk.spanlayer.SpanLayer` from a list of (start, end) tuples."""
+        starts = [start for start, end in spans]
+        ends = [end for start, end in spans]
+        return SpanLayer(starts, ends, self.text if with_text else None)
+
+    @layer_property(PARAGRAPHS)
     def paragraphs(self):
         """Return the list of ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self[PARAGRAPHS]
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_texts(self):
         """The list of texts representing ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self.texts(PARAGRAPHS)
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_spans(self):
         """The list of spans representing ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self.spans(PARAGRAPHS)
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_starts(self):
         """The start positions of ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self.starts(PARAGRAPHS)
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_ends(self):
         """The end positions of ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
@@ -464,50 +542,41 @@ class Text(dict):
                     sentenceDict = \
                         {'start': firstToken[START], 'end': lastToken[END]}
                     dicts.append( sentenceDict )
-                # Note: We also need to invalidate the cached properties providing the
-                #       sentence information, as otherwise, if the properties have been
-                #       called already, new calls would return the old state of sentence 
-                #       tokenization;
-                for sentence_attrib in ['sentences', 'sentence_texts', 'sentence_spans', \
-                                        'sentence_starts', 'sentence_ends']:
-                    try:
-                        # invalidate the cache
-                        delattr(self, sentence_attrib)
-                    except AttributeError:
-                        # it's ok, if the cached property has not been called yet
-                        pass
+        if self.__compact_spans:
+            self[SENTENCES] = self.__span_layer([(d[START], d[END]) for d in dicts])
+            return self
         self[SENTENCES] = dicts
         return self
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentences(self):
         """The list of ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self[SENTENCES]
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_texts(self):
         """The list of texts representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self.texts(SENTENCES)
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_spans(self):
         """The list of spans representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self.spans(SENTENCES)
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_starts(self):
         """The list of start positions representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self.starts(SENTENCES)
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_ends(self):
         """The list of end positions representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
@@ -523,6 +592,13 @@ class Text(dict):
             self.tokenize_sentences()
         tok = self.__word_tokenizer
         text = self.text
+        if self.__compact_spans:
+            spans = []
+            for sent_start, sent_end in self.spans(SENTENCES):
+                for start, end in tok.span_tokenize(text[sent_start:sent_end]):
+                    spans.append((start+sent_start, end+sent_start))
+            self[WORDS] = self.__span_layer(spans, with_text=True)
+            return self
         dicts = []
         for sentence in self[SENTENCES]:
             sent_start, sent_end = sentence[START], sentence[END]
@@ -538,50 +614,51 @@ class Text(dict):
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         sentences = self.divide(WORDS, SENTENCES)
-        for sentence in sentences:
-            texts = [word[TEXT] for word in sentence]
-            all_analysis = vabamorf.analyze(texts, **self.__kwargs)
-            for word, analysis in zip(sentence, all_analysis):
+        all_analysis = vabamorf.analyze_sentences([[word[TEXT] for word in sentence] for sentence in sentences],
+                                                  **self.__kwargs)
+        for sentence, sentence_analysis in zip(sentences, all_analysis):
+            for word, analysis in zip(sentence, sentence_analysis):
                 word[ANALYSIS] = analysis[ANALYSIS]
                 word[TEXT] = analysis[TEXT]
+        self.__invalidate(ANALYSIS)
         return self
 
-    @cached_property
+    @layer_property(WORDS)
     def words(self):
         """The list of word elements in ``words`` layer."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self[WORDS]
 
-    @cached_property
+    @layer_property(WORDS)
     def word_texts(self):
         """The list of words representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return [word[TEXT] for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS)
     def word_spans(self):
         """The list of spans representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self.spans(WORDS)
 
-    @cached_property
+    @layer_property(WORDS)
     def word_starts(self):
         """The list of start positions representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self.starts(WORDS)
 
-    @cached_property
+    @layer_property(WORDS)
     def word_ends(self):
         """The list of end positions representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self.ends(WORDS)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def analysis(self):
         """The list of analysis of ``words`` layer elements."""
         if not self.is_tagged(ANALYSIS):
@@ -614,7 +691,7 @@ class Text(dict):
         """
         return [self.__get_key(word[ANALYSIS], element, sep) for word in self.words]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def roots(self):
         """The list of word roots.
 
@@ -625,7 +702,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(ROOT)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def lemmas(self):
         """The list of lemmas.
 
@@ -636,7 +713,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(LEMMA)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def lemma_lists(self):
         """Lemma lists.
 
@@ -646,7 +723,7 @@ class Text(dict):
             self.tag_analysis()
         return [[an[LEMMA] for an in word[ANALYSIS]] for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def endings(self):
         """The list of word endings.
 
@@ -657,7 +734,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(ENDING)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def forms(self):
         """Tthe list of word forms.
 
@@ -668,7 +745,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(FORM)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def postags(self):
         """The list of word part-of-speech tags.
 
@@ -679,27 +756,27 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(POSTAG)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def postag_lists(self):
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
         return [[an[POSTAG] for an in word[ANALYSIS]] for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def postag_descriptions(self):
         """Human-readable POS-tag descriptions."""
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
         return [POSTAG_DESCRIPTIONS.get(tag, '') for tag in self.get_analysis_element(POSTAG)]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def root_tokens(self):
         """Root tokens of word roots."""
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
         return self.get_analysis_element(ROOT_TOKENS)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def descriptions(self):
         """Human readable word descriptions."""
         descs = []
@@ -797,13 +874,13 @@ class Text(dict):
         else:
             raise ValueError('(!) Missing layer name! ')
 
-    @cached_property
+    @layer_property(LAYER_CONLL)
     def syntax_trees_conll(self):
         """ Return syntactic trees built from CONLL (MaltParser's) syntactic annotation. """
         assert LAYER_CONLL in self, '(!) Missing syntactic annotations layer: '+LAYER_CONLL+'!'
         return build_trees_from_text( self, layer=LAYER_CONLL )
 
-    @cached_property
+    @layer_property(LAYER_VISLCG3)
     def syntax_trees_vislcg3(self):
         """ Return syntactic trees built from VISL CG3's syntactic annotations. """
         assert LAYER_VISLCG3 in self, '(!) Missing syntactic annotations layer: '+LAYER_VISLCG3+'!'
@@ -816,9 +893,10 @@ class Text(dict):
         if self.__ner_tagger is None:
             self.__ner_tagger = load_default_ner_tagger()
         self.__ner_tagger.tag_document(self)
+        self.__invalidate(LABEL)
         return self
 
-    @cached_property
+    @layer_property(WORDS, LABEL)
     def labels(self):
         """Named entity labels."""
         if not self.is_tagged(LABEL):
@@ -851,7 +929,7 @@ class Text(dict):
         self[NAMED_ENTITIES] = nes
         return self
 
-    @cached_property
+    @layer_property(NAMED_ENTITIES, WORDS, ANALYSIS)
     def named_entities(self):
         """The elements of ``named_entities`` layer."""
         if not self.is_tagged(NAMED_ENTITIES):
@@ -859,21 +937,21 @@ class Text(dict):
         phrases = self.split_by(NAMED_ENTITIES)
         return [' '.join(phrase.lemmas) for phrase in phrases]
 
-    @cached_property
+    @layer_property(NAMED_ENTITIES)
     def named_entity_texts(self):
         """The texts representing named entities."""
         if not self.is_tagged(NAMED_ENTITIES):
             self.tag_named_entities()
         return self.texts(NAMED_ENTITIES)
 
-    @cached_property
+    @layer_property(NAMED_ENTITIES)
     def named_entity_spans(self):
         """The spans of named entities."""
         if not self.is_tagged(NAMED_ENTITIES):
             self.tag_named_entities()
         return self.spans(NAMED_ENTITIES)
 
-    @cached_property
+    @layer_property(NAMED_ENTITIES)
     def named_entity_labels(self):
         """The named entity labels without BIO prefixes."""
         if not self.is_tagged(NAMED_ENTITIES):
@@ -892,48 +970,48 @@ class Text(dict):
             self.__timex_tagger.tag_document(self, **self.__kwargs)
         return self
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timexes(self):
         """The list of elements in ``timexes`` layer."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self[TIMEXES]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_texts(self):
         """The list of texts representing ``timexes`` layer elements."""
         return [timex.get(TEXT, '') for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_values(self):
         """The list of timex values of ``timexes`` layer elements."""
         return [timex[TMX_VALUE] for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_types(self):
         """The list of timex types of ``timexes`` layer elements."""
         return [timex[TMX_TYPE] for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_ids(self):
         """The list of timex id-s of ``timexes`` layer elements."""
         return [timex[TMX_ID] for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_starts(self):
         """The list of start positions of ``timexes`` layer elements."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self.starts(TIMEXES)
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_ends(self):
         """The list of end positions of ``timexes`` layer elements."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self.ends(TIMEXES)
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_spans(self):
         """The list of spans of ``timexes`` layer elements."""
         if not self.is_tagged(TIMEXES):
@@ -948,16 +1026,18 @@ class Text(dict):
             self.tag_analysis()
         if self.__clause_segmenter is None:
             self.__clause_segmenter = load_default_clausesegmenter()
-        return self.__clause_segmenter.tag(self)
+        result = self.__clause_segmenter.tag(self)
+        self.__invalidate(CLAUSE_ANNOTATION)
+        return result
 
-    @cached_property
+    @layer_property(WORDS, CLAUSE_ANNOTATION)
     def clause_annotations(self):
         """The list of clause annotations in ``words`` layer."""
         if not self.is_tagged(CLAUSE_ANNOTATION):
             self.tag_clause_annotations()
         return [word.get(CLAUSE_ANNOTATION, None) for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS, CLAUSE_ANNOTATION)
     def clause_indices(self):
         """The list of clause indices in ``words`` layer.
         The indices are unique only in the boundary of a single sentence.
@@ -996,14 +1076,14 @@ class Text(dict):
         self[CLAUSES] = clauses
         return self
 
-    @cached_property
+    @layer_property(CLAUSES)
     def clauses(self):
         """The elements of ``clauses`` multilayer."""
         if not self.is_tagged(CLAUSES):
             self.tag_clauses()
         return self[CLAUSES]
 
-    @cached_property
+    @layer_property(CLAUSES)
     def clause_texts(self):
         """The texts of ``clauses`` multilayer elements.
         Non-consequent spans are concatenated with space character by default.
@@ -1036,75 +1116,75 @@ class Text(dict):
         self[VERB_CHAINS] = verbchains
         return self
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chains(self):
         """The list of elements of ``verb_chains`` layer."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self[VERB_CHAINS]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_texts(self):
         """The list of texts of ``verb_chains`` layer elements."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self.texts(VERB_CHAINS)
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_patterns(self):
         """The patterns of ``verb_chains`` elements."""
         return [vc[PATTERN] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_roots(self):
         """The chain roots of ``verb_chains`` elements."""
         return [vc[ROOTS] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_morphs(self):
         """The morph attributes of ``verb_chains`` elements."""
         return [vc[MORPH] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_polarities(self):
         """The polarities of ``verb_chains`` elements."""
         return [vc[POLARITY] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_tenses(self):
         """The tense attributes of ``verb_chains`` elements."""
         return [vc[TENSE] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_moods(self):
         """The mood attributes of ``verb_chains`` elements."""
         return [vc[MOOD] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_voices(self):
         """The voice attributes of ``verb_chains`` elements."""
         return [vc[VOICE] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_clause_indices(self):
         """The clause indices of ``verb_chains`` elements."""
         return [vc[CLAUSE_IDX] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_starts(self):
         """The start positions of ``verb_chains`` elements."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self.starts(VERB_CHAINS)
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_ends(self):
         """The end positions of ``verb_chains`` elements."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self.ends(VERB_CHAINS)
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_other_verbs(self):
         """The other verb attributes of ``verb_chains`` elements."""
         return [vc[OTHER_VERBS] for vc in self.verb_chains]
@@ -1120,17 +1200,20 @@ class Text(dict):
             wordnet_tagger = WordnetTagger()
         self.__wordnet_tagger = wordnet_tagger
         if len(kwargs) > 0:
-            return self.__wordnet_tagger.tag_text(self, **kwargs)
-        return self.__wordnet_tagger.tag_text(self, **self.__kwargs)
+            result = self.__wordnet_tagger.tag_text(self, **kwargs)
+        else:
+            result = self.__wordnet_tagger.tag_text(self, **self.__kwargs)
+        self.__invalidate(WORDNET)
+        return result
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS, WORDNET)
     def wordnet_annotations(self):
         """The list of wordnet annotations of ``words`` layer."""
         if not self.is_tagged(WORDNET):
             self.tag_wordnet()
         return [[a[WORDNET] for a in analysis] for analysis in self.analysis]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS, WORDNET)
     def synsets(self):
         """The list of annotated synsets of ``words`` layer."""
         synsets = []
@@ -1142,7 +1225,7 @@ class Text(dict):
             synsets.append(word_synsets)
         return synsets
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS, WORDNET)
     def word_literals(self):
         """The list of literals per word in ``words`` layer."""
         literals = []
@@ -1159,26 +1242,28 @@ class Text(dict):
     # SPELLCHECK
     # ///////////////////////////////////////////////////////////////////
 
-    @cached_property
+    @layer_property(WORDS)
     def spelling(self):
         """Flag incorrectly spelled words.
         Returns a list of booleans, where element at each position denotes, if the word at the same position
         is spelled correctly.
         """
-        if not self.is_tagged(WORDS):
-            self.tokenize_words()
-        return [data[SPELLING] for data in vabamorf.spellcheck(self.word_texts, suggestions=False)]
+        return [data[SPELLING] for data in self.spellcheck_results]
 
-    @cached_property
+    @layer_property(WORDS)
     def spelling_suggestions(self):
         """The list of spelling suggestions per misspelled word."""
-        if not self.is_tagged(WORDS):
-            self.tokenize_words()
-        return [data[SUGGESTIONS] for data in vabamorf.spellcheck(self.word_texts, suggestions=True)]
+        return [data[SUGGESTIONS] for data in self.spellcheck_results]
 
-    @cached_property
+    @layer_property(WORDS)
     def spellcheck_results(self):
-        """The list of True/False values denoting the correct spelling of words."""
+        """The list of spellcheck results of the words, each with the word ``text``, ``spelling``
+        flag and the ``suggestions`` for a misspelled word.
+
+        The words are spellchecked once and the results are shared by
+        :py:attr:`~estnltk.text.Text.spelling`, :py:attr:`~estnltk.text.Text.spelling_suggestions`
+        and :py:meth:`~estnltk.text.Text.fix_spelling`.
+        """
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return vabamorf.spellcheck(self.word_texts, suggestions=True)
@@ -1195,10 +1280,9 @@ class Text(dict):
         Text
             A copy of this instance with automatically fixed spelling.
         """
-        if not self.is_tagged(WORDS):
-            self.tokenize_words()
         text = self.text
-        fixed = vabamorf.fix_spelling(self.word_texts, join=False)
+        fixed = [data[SUGGESTIONS][0] if not data[SPELLING] and len(data[SUGGESTIONS]) > 0 else data[TEXT]
+                 for data in self.spellcheck_results]
         spans = self.word_spans
         assert len(fixed) == len(spans)
         if len(spans) > 0:
@@ -1222,7 +1306,7 @@ class Text(dict):
         to this Text."""
         return self.__text_cleaner.is_valid(self[TEXT])
 
-    @cached_property
+    @layer_property(TEXT)
     def invalid_characters(self):
         """List of invalid characters found in this text."""
         return self.__text_cleaner.invalid_characters(self[TEXT])
@@ -1385,7 +1469,20 @@ class Text(dict):
             self.tag(layer)
         if not self.is_tagged(by):
             self.tag(by)
-        return divide(self[layer], self[by])
+        elements, bins = self[layer], self[by]
+        # The index ranges of the bins are cached for the current layers. The cache is invalidated,
+        # when the layers are replaced or elements are added or removed, but not when the
+        # start and end positions of existing elements are modified.
+        cached = self.__divide_indices.get((layer, by))
+        if cached is not None and cached[0] is elements and cached[1] is bins and \
+                cached[2] == len(elements) and cached[3] == len(bins):
+            ranges = cached[4]
+        else:
+            ranges = divide_index(elements, bins)
+            self.__divide_indices[(layer, by)] = (elements, bins, len(elements), len(bins), ranges)
+        if ranges is None:
+            return divide(elements, bins)
+        return [elements[first:last] for first, last in ranges]
 
     # ///////////////////////////////////////////////////////////////////
     # FILTERING
@@ -14,8 +14,23 @@ import datetime
 class TimexTagger(JavaProcess):
     """Class for extracting temporal (TIMEX) expressions."""
     
-    def __init__(self):
-        JavaProcess.__init__(self, 'Ajavt.jar', ['-pyvabamorf', '-r', os.path.join(JAVARES_PATH, 'reeglid.xml')])
+    def __init__(self, **kwargs):
+        """Initialize the tagger.
+
+        Parameters
+        ----------
+        pool_size: int (default: 1)
+            The number of Java VMs running the tagger. Use values larger than 1
+            in order to tag documents concurrently from several threads.
+        timeout: float (default: None)
+            The number of seconds to wait for the tagger's output, before the Java VM is restarted.
+        max_retries: int (default: 1)
+            How many times a document is tagged again after the failure of the Java VM.
+        """
+        JavaProcess.__init__(self, 'Ajavt.jar', ['-pyvabamorf', '-r', os.path.join(JAVARES_PATH, 'reeglid.xml')],
+                             pool_size=kwargs.get('pool_size', 1),
+                             timeout=kwargs.get('timeout', None),
+                             max_retries=kwargs.get('max_retries', 1))
 
     def tag_document(self, document, **kwargs):
         # get the arguments
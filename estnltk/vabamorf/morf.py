@@ -21,6 +21,10 @@ phonetic_regex: regex
     Regular expression matching any phonetic marker.
 compound_regex: regex
     Regular expression matching any compound marker.
+ROOT_CACHE_SIZE: int
+    The maximum number of memoised root postprocessing results.
+SPELLING_CACHE_SIZE: int
+    The maximum number of words with cached spellcheck results per analyzer instance.
 """
 from __future__ import unicode_literals, print_function, absolute_import
 
@@ -29,7 +33,10 @@ import os
 import six
 import re
 import operator
+import threading
+import copy
 from functools import reduce
+from collections import OrderedDict
 
 # path listings
 PACKAGE_PATH = os.path.dirname(__file__)
@@ -60,6 +67,14 @@ def regex_from_markers(markers):
 phonetic_regex = regex_from_markers(phonetic_markers)
 compound_regex = regex_from_markers(compound_markers)
 
+# memoised postprocessing of the roots and the table of the interned strings, see postprocess_analysis
+ROOT_CACHE_SIZE = 100000
+SPELLING_CACHE_SIZE = 10000
+root_cache = {}
+string_table = {}
+# shared analyses, see shared_analysis
+analysis_table = {}
+
 
 def convert(word):
     """This method converts given `word` to UTF-8 encoding and `bytes` type for the
@@ -84,32 +99,183 @@ def deconvert(word):
         return word
 
 
+class LRUCache(object):
+    """Size-bounded LRU cache of word level results.
+
+    The cache is guarded by a lock of its own, so a Vabamorf instance using it can
+    be shared by several threads.
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum number of cached words.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def copy(self, value):
+        """Copy the value stored in or returned from the cache. Values are immutable by default."""
+        return value
+
+    def get(self, key):
+        """Return the cached value of the key or None."""
+        with self._lock:
+            value = self._data.pop(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data[key] = value  # most recently used is last
+            self.hits += 1
+        return self.copy(value)
+
+    def put(self, key, value):
+        value = self.copy(value)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Cache statistics: number of hits and misses, hit rate, current size and maximum size."""
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._data)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': float(hits) / lookups if lookups > 0 else 0.0,
+            'size': size,
+            'maxsize': self.maxsize
+        }
+
+
+class AnalysisCache(LRUCache):
+    """Size-bounded LRU cache of postprocessed word analyses.
+
+    Used by :py:meth:`~estnltk.vabamorf.morf.Vabamorf.analyze` to serve the repeated words
+    without calling the analyzer, when the words are not disambiguated.
+    """
+
+    def copy(self, value):
+        return copy_result(value)
+
+
+def proper_name_context(words, idx):
+    """The context, which the proper name analysis of the word depends on.
+
+    Vabamorf adds proper name analyses to the capitalized words, taking into account if the
+    word could start a sentence: it is the first word, or it follows a punctuation mark
+    other than a comma or a semicolon. After a period or a closing parenthesis, also the words
+    before these are checked for abbreviations and list numbering.
+
+    Returns
+    -------
+    None
+        If the analysis does not depend on the context.
+    tuple
+        The previous word or an empty tuple for the first word of the sentence.
+    False
+        If the analysis depends on more than the previous word.
+    """
+    if not deconvert(words[idx])[:1].isupper():
+        return None
+    if idx == 0:
+        return ()
+    previous = deconvert(words[idx - 1])
+    if '.' in previous or ')' in previous:
+        return False
+    return (words[idx - 1], )
+
+
+def copy_result(result):
+    """Copy the analysis result, so that the cached result is not modified by the caller."""
+    return {
+        'text': result['text'],
+        'analysis': [a if isinstance(a, SharedAnalysis) else dict(a, root_tokens=list(a['root_tokens']))
+                     for a in result['analysis']]
+    }
+
+
 class Vabamorf(object):
     """Class for performing main tasks of morphological analysis.
 
+    The analyzer, disambiguator, spellchecker and synthesizer release the GIL while
+    running, so separate instances can run in parallel in several threads (each of them
+    has its own lexicons and the string memory pools of vabamorf are thread local, see
+    ``vabamorf.i``). A single instance can also be shared by several threads, its calls to
+    the analyzer and the updates of its caches are serialized by locks. Call
+    :py:meth:`~estnltk.vabamorf.morf.Vabamorf.set_thread_local` to let every thread
+    get an instance of its own from :py:meth:`~estnltk.vabamorf.morf.Vabamorf.instance`::
+
+        Vabamorf.set_thread_local()
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(analyze, sentences))
+
     Attributes
     ----------
     pid: int
         Current process id.
     morf: Vabamorf
-        instance of the Vabamorf class. There should be only one instance per
-        process as vabamorf has a global state that might get corrputed by using
-        multiple instances in a single process.
+        The instance of the Vabamorf class shared by the threads of the process.
+    thread_local: bool
+        If True, every thread uses an instance of its own.
     """
 
+    thread_local = False
+    threads = threading.local()
+
     @staticmethod
     def instance():
         """Return an PyVabamorf instance.
 
         It returns the previously initialized instance or creates a new
         one if nothing exists. Also creates new instance in case the
-        process has been forked.
+        process has been forked. In thread local mode, the instances
+        are created separately for every thread.
         """
+        if Vabamorf.thread_local:
+            threads = Vabamorf.threads
+            if getattr(threads, 'pid', None) != os.getpid():
+                threads.pid = os.getpid()
+                threads.morf = Vabamorf()
+            return threads.morf
         if not hasattr(Vabamorf, 'pid') or Vabamorf.pid != os.getpid():
             Vabamorf.pid = os.getpid()
             Vabamorf.morf = Vabamorf()
         return Vabamorf.morf
 
+    @staticmethod
+    def set_thread_local(enabled=True):
+        """Enable or disable the thread local instances.
+
+        Every instance loads the lexicons for itself, so the memory usage grows
+        with the number of threads using the analyzer.
+
+        Parameters
+        ----------
+        enabled: bool
+            If True, :py:meth:`~estnltk.vabamorf.morf.Vabamorf.instance` returns a separate
+            instance for every thread, otherwise a single instance is shared (default: True).
+        """
+        Vabamorf.thread_local = enabled
+
     def __init__(self, lex_path=DEFAULT_ET_PATH, disamb_lex_path=DEFAULT_ET3_PATH):
         """Initialize Vabamorf class.
 
@@ -125,6 +291,38 @@ class Vabamorf(object):
 
         """
         self._morf = vm.Vabamorf(convert(lex_path), convert(disamb_lex_path))
+        # the calls release the GIL, so the instance is guarded against concurrent use
+        self.lock = threading.Lock()
+        self.cache = None
+        # spellchecking does not depend on the context, so the results are always cached
+        self.spelling_cache = LRUCache(SPELLING_CACHE_SIZE)
+
+    def enable_cache(self, maxsize=10000):
+        """Cache the analyses of words, when they are analyzed without disambiguation.
+
+        When proper names are analyzed, the analysis of a capitalized word depends on whether
+        it could start a sentence, which vabamorf decides from the preceding words. So for the
+        capitalized words, the previous word (or the start of the sentence) is a part of the cache key.
+        Capitalized words after a word containing '.' or ')' (abbreviations, list numbering)
+        depend on the longer context and are not cached. Other words are analyzed independently
+        of their context, as words are not combined into multiword units.
+
+        Parameters
+        ----------
+        maxsize: int
+            The maximum number of cached words (default: 10000).
+
+        Returns
+        -------
+        AnalysisCache
+            The cache, which can be used to get the statistics or to clear it.
+        """
+        self.cache = AnalysisCache(maxsize)
+        return self.cache
+
+    def disable_cache(self):
+        """Stop caching the analyses of words."""
+        self.cache = None
 
     def analyze(self, words, **kwargs):
         """Perform morphological analysis and disambiguation of given text.
@@ -144,6 +342,9 @@ class Vabamorf(object):
             Add compound word markers to root forms.
         phonetic: boolean (default: False)
             Add phonetic information to root forms.
+        compact_analysis: boolean (default: False)
+            Return the same read-only :py:class:`~estnltk.vabamorf.morf.SharedAnalysis`
+            instance for all occurrences of an analysis.
 
         Returns
         -------
@@ -157,16 +358,127 @@ class Vabamorf(object):
         # convert words to native strings
         words = [convert(w) for w in words]
 
-        morfresults = self._morf.analyze(
-            vm.StringVector(words),
-            kwargs.get('disambiguate', True),
-            kwargs.get('guess', True),
-            True, # phonetic and compound information
-            kwargs.get('propername', True))
+        disambiguate = kwargs.get('disambiguate', True)
+        guess = kwargs.get('guess', True)
+        propername = kwargs.get('propername', True)
         trim_phonetic = kwargs.get('phonetic', False)
         trim_compound = kwargs.get('compound', True)
+        compact = kwargs.get('compact_analysis', False)
+
+        if self.cache is not None and not disambiguate:
+            return self._analyze_cached(words, guess, propername, trim_phonetic, trim_compound, compact)
+
+        words = vm.StringVector(words)
+        with self.lock:
+            morfresults = self._morf.analyze(
+                words,
+                disambiguate,
+                guess,
+                True, # phonetic and compound information
+                propername)
+
+        return [postprocess_result(mr, trim_phonetic, trim_compound, compact) for mr in morfresults]
 
-        return [postprocess_result(mr, trim_phonetic, trim_compound) for mr in morfresults]
+    def analyze_sentences(self, sentences, **kwargs):
+        """Analyze several sentences at once.
+
+        Gives the same result as calling :py:meth:`~estnltk.vabamorf.morf.Vabamorf.analyze`
+        for every sentence, but all the sentences are analyzed in a single call to the analyzer.
+
+        Parameters
+        ----------
+        sentences: list of (list of str)
+            The sentences, each of them a list of pretokenized words.
+
+        Other keyword arguments are the same as for :py:meth:`~estnltk.vabamorf.morf.Vabamorf.analyze`.
+
+        Returns
+        -------
+        list of (list of dict)
+            The analysis results of the words of every sentence.
+        """
+        disambiguate = kwargs.get('disambiguate', True)
+        if self.cache is not None and not disambiguate:
+            return [self.analyze(words, **kwargs) for words in sentences]
+
+        guess = kwargs.get('guess', True)
+        propername = kwargs.get('propername', True)
+        trim_phonetic = kwargs.get('phonetic', False)
+        trim_compound = kwargs.get('compound', True)
+        compact = kwargs.get('compact_analysis', False)
+
+        # convert words to native strings
+        sentences = vm.StringVectors([vm.StringVector([convert(w) for w in words]) for words in sentences])
+        with self.lock:
+            morfresults = self._morf.analyzeSentences(
+                sentences,
+                disambiguate,
+                guess,
+                True, # phonetic and compound information
+                propername)
+
+        return [[postprocess_result(mr, trim_phonetic, trim_compound, compact) for mr in sentence]
+                for sentence in morfresults]
+
+    def _analyze_cached(self, words, guess, propername, trim_phonetic, trim_compound, compact):
+        """Analyze the words without disambiguation, only the words missing from the cache are analyzed."""
+        cache = self.cache
+        results = [None] * len(words)
+        missing = OrderedDict()  # keys of the words missing from the cache mapped to their positions
+        uncacheable = []  # positions of the words, which depend on the longer context
+        for idx, word in enumerate(words):
+            context = proper_name_context(words, idx) if propername else None
+            if context is False:
+                uncacheable.append(idx)
+                continue
+            key = (word, context, guess, propername, trim_phonetic, trim_compound, compact)
+            if key in missing:
+                missing[key].append(idx)
+                continue
+            result = cache.get(key)
+            if result is None:
+                missing[key] = [idx]
+            else:
+                results[idx] = result
+        if len(missing) == 0 and len(uncacheable) == 0:
+            return results
+
+        if len(uncacheable) > 0:
+            # analyze the sentence as it is
+            batch = words
+            batch_keys = [None] * len(words)
+            for key, positions in missing.items():
+                batch_keys[positions[0]] = key
+        else:
+            # analyze only the missing words, the capitalized words after their previous words.
+            # the first word of the sentence is always missing first, if it is capitalized
+            batch = []
+            batch_keys = []
+            for key, positions in missing.items():
+                if key[1]:
+                    batch.append(words[positions[0] - 1])
+                    batch_keys.append(None)
+                batch.append(key[0])
+                batch_keys.append(key)
+        with self.lock:
+            morfresults = self._morf.analyze(
+                vm.StringVector(batch),
+                False,
+                guess,
+                True, # phonetic and compound information
+                propername)
+        for key, mr in zip(batch_keys, morfresults):
+            if key is None:
+                continue
+            result = postprocess_result(mr, trim_phonetic, trim_compound, compact)
+            cache.put(key, result)
+            positions = missing[key]
+            results[positions[0]] = result
+            for idx in positions[1:]:
+                results[idx] = copy_result(result)
+        for idx in uncacheable:
+            results[idx] = postprocess_result(morfresults[idx], trim_phonetic, trim_compound, compact)
+        return results
 
     def disambiguate(self, words):
         """Disambiguate previously analyzed words.
@@ -182,7 +494,8 @@ class Vabamorf(object):
             Sentence of disambiguated words.
         """
         words = vm.SentenceAnalysis([as_wordanalysis(w) for w in words])
-        disambiguated = self._morf.disambiguate(words)
+        with self.lock:
+            disambiguated = self._morf.disambiguate(words)
         return [postprocess_result(mr, False, True) for mr in disambiguated]
 
     def spellcheck(self, words, suggestions=True):
@@ -213,16 +526,40 @@ class Vabamorf(object):
         # convert words to native strings
         words = [convert(w) for w in words]
 
-        spellresults = self._morf.spellcheck(words, suggestions)
+        # the cached results are (spelling, suggestions) pairs, where the suggestions of the misspelled
+        # words are None, if they have not been generated yet
+        cache = self.spelling_cache
+        cached = []
+        missing = OrderedDict()
+        for word in words:
+            result = cache.get(word)
+            if result is None or (suggestions and result[1] is None):
+                missing[word] = None
+            cached.append(result)
+        if len(missing) > 0:
+            with self.lock:
+                spellresults = self._morf.spellcheck(vm.StringVector(list(missing)), suggestions)
+            for word, spellresult in zip(missing, spellresults):
+                spelling = bool(spellresult.spelling)
+                if spelling:
+                    result = (True, ())
+                elif suggestions:
+                    result = (False, tuple(deconvert(s) for s in spellresult.suggestions))
+                else:
+                    result = (False, None)
+                cache.put(word, result)
+                missing[word] = result
+
         results = []
-        for spellresult in spellresults:
-            suggestions = [deconvert(s) for s in spellresult.suggestions]
-            result = {
-                'text': deconvert(spellresult.word),
-                'spelling': spellresult.spelling,
-                'suggestions': suggestions
-            }
-            results.append(result)
+        for word, result in zip(words, cached):
+            if word in missing:
+                result = missing[word]
+            spelling, word_suggestions = result
+            results.append({
+                'text': deconvert(word),
+                'spelling': spelling,
+                'suggestions': list(word_suggestions) if suggestions and word_suggestions is not None else []
+            })
         return results
 
     def fix_spelling(self, words, join=True, joinstring=' '):
@@ -288,45 +625,119 @@ class Vabamorf(object):
         list
             List of synthesized words.
         """
-        words = self._morf.synthesize(
-            convert(lemma.strip()),
-            convert(form.strip()),
-            convert(partofspeech.strip()),
-            convert(hint.strip()),
-            guess,
-            phonetic
-        )
+        with self.lock:
+            words = self._morf.synthesize(
+                convert(lemma.strip()),
+                convert(form.strip()),
+                convert(partofspeech.strip()),
+                convert(hint.strip()),
+                guess,
+                phonetic
+            )
         return [deconvert(w) for w in words]
 
 
-def postprocess_result(morphresult, trim_phonetic, trim_compound):
+def postprocess_result(morphresult, trim_phonetic, trim_compound, compact=False):
     """Postprocess vabamorf wrapper output."""
     word, analysis = morphresult
+    postprocess = shared_analysis if compact else postprocess_analysis
     return {
         'text': deconvert(word),
-        'analysis': [postprocess_analysis(a, trim_phonetic, trim_compound) for a in analysis]
+        'analysis': [postprocess(a, trim_phonetic, trim_compound) for a in analysis]
     }
 
 
 def postprocess_analysis(analysis, trim_phonetic, trim_compound):
-    root = deconvert(analysis.root)
+    """Convert the analysis of the wrapper to a dictionary.
 
-    # extract tokens and construct lemma
-    grouptoks = get_group_tokens(root)
-    toks = reduce(operator.add, grouptoks)
-    lemma = get_lemma(grouptoks, analysis.partofspeech)
+    The root, root tokens and lemma computed from a root are memoised and
+    all the strings are interned, so the repeated analyses share them.
+    """
+    partofspeech = analysis.partofspeech
+    key = (analysis.root, partofspeech, trim_phonetic, trim_compound)
+    cached = root_cache.get(key)
+    if cached is None:
+        cached = postprocess_root(key[0], partofspeech, trim_phonetic, trim_compound)
+        if len(root_cache) >= ROOT_CACHE_SIZE:
+            root_cache.clear()
+        root_cache[key] = cached
+    root, toks, lemma = cached
 
     return {
-        'root': get_root(root, trim_phonetic, trim_compound),
-        'root_tokens': toks,
-        'ending': deconvert(analysis.ending),
-        'clitic': deconvert(analysis.clitic),
-        'partofspeech': deconvert(analysis.partofspeech),
-        'form': deconvert(analysis.form),
+        'root': root,
+        'root_tokens': list(toks),
+        'ending': intern_string(deconvert(analysis.ending)),
+        'clitic': intern_string(deconvert(analysis.clitic)),
+        'partofspeech': intern_string(deconvert(partofspeech)),
+        'form': intern_string(deconvert(analysis.form)),
         'lemma': lemma
         }
 
 
+class SharedAnalysis(dict):
+    """Read-only analysis dictionary shared by all the words with the same analysis.
+
+    Compared to a regular analysis dictionary for every word, the memory usage of the
+    analysed texts is greatly reduced. The shared analyses behave as regular dictionaries,
+    but they can not be modified (also the ``root_tokens`` list must not be changed).
+    Copies made with ``dict(analysis)``, :py:func:`copy.copy` or :py:func:`copy.deepcopy`
+    are regular dictionaries.
+    """
+
+    __slots__ = ()
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError('Shared analysis can not be modified, use a copy made with dict(analysis)')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict((key, copy.deepcopy(value, memo)) for key, value in self.items())
+
+    def __reduce__(self):
+        return SharedAnalysis, (dict(self), )
+
+
+def shared_analysis(analysis, trim_phonetic, trim_compound):
+    """Convert the analysis of the wrapper to a shared analysis dictionary."""
+    key = (analysis.root, analysis.ending, analysis.clitic, analysis.partofspeech, analysis.form,
+           trim_phonetic, trim_compound)
+    shared = analysis_table.get(key)
+    if shared is None:
+        shared = SharedAnalysis(postprocess_analysis(analysis, trim_phonetic, trim_compound))
+        if len(analysis_table) >= ROOT_CACHE_SIZE:
+            analysis_table.clear()
+        analysis_table[key] = shared
+    return shared
+
+
+def postprocess_root(root, partofspeech, trim_phonetic, trim_compound):
+    """Compute the root without markers, the root tokens and the lemma of the analysis."""
+    root = deconvert(root)
+
+    # extract tokens and construct lemma
+    grouptoks = get_group_tokens(root)
+    toks = reduce(operator.add, grouptoks)
+    lemma = get_lemma(grouptoks, partofspeech)
+
+    return (intern_string(get_root(root, trim_phonetic, trim_compound)),
+            tuple(intern_string(tok) for tok in toks),
+            intern_string(lemma))
+
+
+def intern_string(string):
+    """Return the shared copy of the string."""
+    interned = string_table.get(string)
+    if interned is None:
+        if len(string_table) >= ROOT_CACHE_SIZE:
+            string_table.clear()
+        string_table[string] = interned = string
+    return interned
+
+
 def trim_phonetics(root):
     """Function that trims phonetic markup from the root.
 
@@ -455,6 +866,9 @@ def analyze(words, **kwargs):
         Add compound word markers to root forms.
     phonetic: boolean (default: False)
         Add phonetic information to root forms.
+    compact_analysis: boolean (default: False)
+        Return the same read-only :py:class:`~estnltk.vabamorf.morf.SharedAnalysis`
+        instance for all occurrences of an analysis.
 
     Returns
     -------
@@ -464,6 +878,24 @@ def analyze(words, **kwargs):
     return Vabamorf.instance().analyze(words, **kwargs)
 
 
+def analyze_sentences(sentences, **kwargs):
+    """Perform morphological analysis and disambiguation of several sentences at once.
+
+    Parameters
+    ----------
+    sentences: list of (list of str)
+        The sentences, each of them a list of pretokenized words.
+
+    Other keyword arguments are the same as for :py:func:`~estnltk.vabamorf.morf.analyze`.
+
+    Returns
+    -------
+    list of (list of dict)
+        The analysis results of the words of every sentence.
+    """
+    return Vabamorf.instance().analyze_sentences(sentences, **kwargs)
+
+
 def disambiguate(words):
     """Disambiguate previously analyzed words.
 
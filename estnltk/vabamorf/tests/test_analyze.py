@@ -3,9 +3,13 @@ from __future__ import unicode_literals, print_function, absolute_import
 
 import unittest
 import operator
-from ..morf import trim_phonetics, get_group_tokens, postprocess_analysis, convert, analyze
+import copy
+import pickle
+from ..morf import trim_phonetics, get_group_tokens, postprocess_analysis, convert, analyze, analyze_sentences, Vabamorf
+from ..morf import SharedAnalysis
 from ..vabamorf import Analysis
 from functools import reduce
+from multiprocessing.pool import ThreadPool
 
 
 class TrimPhoneticsTest(unittest.TestCase):
@@ -82,6 +86,14 @@ class AnalysisAsDictTest(unittest.TestCase):
         self.assertDictEqual(postprocess_analysis(self.verbanalysis(), False, False),
                              self.verb())
 
+    def test_memoised(self):
+        first = postprocess_analysis(self.verbanalysis(), False, True)
+        second = postprocess_analysis(self.verbanalysis(), False, True)
+        self.assertDictEqual(first, second)
+        self.assertIs(first['lemma'], second['lemma'])
+        self.assertIs(first['form'], second['form'])
+        self.assertIsNot(first['root_tokens'], second['root_tokens'])
+
     def verbanalysis(self):
         return Analysis(convert('l<aul'),
                         convert('b'),
@@ -257,3 +269,96 @@ class NameGroupingTest(unittest.TestCase):
     def test_grouping(self):
         analysis = analyze('See on New York')
         self.assertEqual(4, len(analysis))
+
+
+class AnalysisCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.morf = Vabamorf()
+        self.cache = self.morf.enable_cache(maxsize=5)
+
+    def test_same_as_uncached(self):
+        words = 'Tere , maa ja mets ja maa ja Tallinn .'.split()
+        expected = analyze(words, disambiguate=False)
+        self.assertListEqual(self.morf.analyze(words, disambiguate=False), expected)
+        self.assertListEqual(self.morf.analyze(words, disambiguate=False), expected)
+        self.assertGreater(self.cache.stats()['hits'], 0)
+
+    def test_same_in_different_contexts(self):
+        sentences = [
+            'Mees tuli koju .',
+            'Ta ütles : " Mees tuli koju . "',
+            '" Mees tuli , " ütles Tallinn .',
+            'Tallinn ja Mees , Tallinn ; Mees ja New York .',
+            'Ta sõitis New Yorki ja Tallinn jäi .',
+            '1 . Mees tuli . 2 ) Tallinn jäi .',
+            'Dr . Mees ja hr . Tallinn . Mees ( Tallinn ) Mees',
+            'New York ja Mees , New York .',
+        ]
+        for _ in range(2):
+            for sentence in sentences:
+                words = sentence.split()
+                expected = analyze(words, disambiguate=False)
+                self.assertListEqual(self.morf.analyze(words, disambiguate=False), expected)
+
+    def test_results_are_copies(self):
+        first = self.morf.analyze(['maa', 'maa'], disambiguate=False)
+        first[0]['analysis'][0]['root_tokens'].append('x')
+        second = self.morf.analyze(['maa'], disambiguate=False)
+        self.assertNotIn('x', second[0]['analysis'][0]['root_tokens'])
+        self.assertNotIn('x', first[1]['analysis'][0]['root_tokens'])
+
+    def test_size_and_clear(self):
+        self.morf.analyze('üks kaks kolm neli viis kuus seitse'.split(), disambiguate=False)
+        stats = self.cache.stats()
+        self.assertEqual(stats['size'], 5)
+        self.assertEqual(stats['misses'], 7)
+        self.cache.clear()
+        self.assertDictEqual(self.cache.stats(), {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0, 'maxsize': 5})
+
+    def test_disambiguated_not_cached(self):
+        self.morf.analyze(['maa', 'maa'], disambiguate=True)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_shared_by_threads(self):
+        sentences = ['üks kaks kolm neli', 'kaks kolm viis kuus', 'Tallinn ja maa ja mets', 'mets kuus seitse'] * 50
+        expected = [analyze(sentence.split(), disambiguate=False) for sentence in sentences]
+        pool = ThreadPool(4)
+        try:
+            results = pool.map(lambda sentence: self.morf.analyze(sentence.split(), disambiguate=False), sentences)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertListEqual(results, expected)
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], sum(len(set(sentence.split())) for sentence in sentences))
+        self.assertLessEqual(stats['size'], 5)
+
+
+class AnalyzeSentencesTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        sentences = [['Tere', ',', 'maailm', '!'], [], ['Mees', 'peeti', 'kinni', '.'], ['New', 'York']]
+        for disambiguate in (True, False):
+            expected = [analyze(words, disambiguate=disambiguate) for words in sentences]
+            self.assertListEqual(analyze_sentences(sentences, disambiguate=disambiguate), expected)
+
+
+class SharedAnalysisTest(unittest.TestCase):
+
+    def test_shared(self):
+        words = 'maja ja maja ja maja'.split()
+        expected = analyze(words)
+        result = analyze(words, compact_analysis=True)
+        self.assertListEqual(result, expected)
+        self.assertIs(result[0]['analysis'][0], result[2]['analysis'][0])
+        self.assertIsInstance(result[0]['analysis'][0], SharedAnalysis)
+
+    def test_readonly(self):
+        analysis = analyze(['maja'], compact_analysis=True)[0]['analysis'][0]
+        self.assertRaises(TypeError, analysis.__setitem__, 'root', 'x')
+        self.assertRaises(TypeError, analysis.update, root='x')
+        copied = copy.deepcopy(analysis)
+        copied['root'] = 'x'
+        self.assertNotEqual(analysis['root'], 'x')
+        self.assertEqual(pickle.loads(pickle.dumps(analysis)), analysis)
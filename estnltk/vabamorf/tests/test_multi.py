@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from ..morf import analyze
+from ..morf import analyze, spellcheck, Vabamorf
 from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import unittest
 import six
 import os
@@ -15,6 +16,34 @@ class MultithreadingTest(unittest.TestCase):
             return
         self.assertListEqual(self.compute_multi(), self.compute_single())
     
+    def test_threads(self):
+        # the texts are repeated, so that the threads run the analyzer at the same time
+        indata = self.indata() * 5
+        expected = [analyze(text) for text in indata]
+        expected_spelling = [spellcheck(text) for text in indata]
+        Vabamorf.set_thread_local()
+        pool = ThreadPool(4)
+        try:
+            self.assertListEqual(pool.map(analyze, indata), expected)
+            self.assertListEqual(pool.map(spellcheck, indata), expected_spelling)
+            self.assertIsNot(pool.apply(Vabamorf.instance), Vabamorf.instance())
+        finally:
+            pool.close()
+            pool.join()
+            Vabamorf.set_thread_local(False)
+
+    def test_shared_instance(self):
+        indata = self.indata() * 5
+        expected = [analyze(text) for text in indata]
+        expected_spelling = [spellcheck(text) for text in indata]
+        pool = ThreadPool(4)
+        try:
+            self.assertListEqual(pool.map(analyze, indata), expected)
+            self.assertListEqual(pool.map(spellcheck, indata), expected_spelling)
+        finally:
+            pool.close()
+            pool.join()
+
     def compute_single(self):
         return [analyze(text) for text in self.indata()]
         
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+from ..morf import Vabamorf, spellcheck
+
+
+class SpellcheckTest(unittest.TestCase):
+
+    def test_spellcheck(self):
+        results = spellcheck(['Tere', 'maailmm', '!'])
+        self.assertListEqual([r['text'] for r in results], ['Tere', 'maailmm', '!'])
+        self.assertListEqual([r['spelling'] for r in results], [True, False, True])
+        self.assertListEqual(results[0]['suggestions'], [])
+        self.assertIn('maailm', results[1]['suggestions'])
+
+    def test_cached(self):
+        morf = Vabamorf()
+        words = ['Tere', 'maailmm', 'maailmm']
+        expected = spellcheck(words)
+        without_suggestions = morf.spellcheck(words, suggestions=False)
+        self.assertListEqual([r['spelling'] for r in without_suggestions], [True, False, False])
+        self.assertTrue(all(r['suggestions'] == [] for r in without_suggestions))
+        self.assertListEqual(morf.spellcheck(words), expected)
+        self.assertListEqual(morf.spellcheck(words), expected)
+        self.assertGreater(morf.spelling_cache.stats()['hits'], 0)
@@ -1,4 +1,6 @@
-%module vabamorf
+// threads="1" enables releasing the GIL, which is done only for the methods marked with %thread below
+%module(threads="1") vabamorf
+%nothread;
 
 %include "typemaps.i"
 %include "std_string.i"
@@ -42,11 +44,29 @@ namespace std {
 #include "vabamorf.h"
 %}
 
+// release the GIL while analyzing, so separate Vabamorf instances can be used in parallel threads.
+// the arguments and results are converted before and after the call, while holding the GIL.
+// the C++ side keeps no state shared between the instances that these calls would modify:
+//  - the lexicons, the analyzer and the disambiguator are members of every Vabamorf instance
+//    (CLinguistic, CDisambiguator), the static lookup tables are only read, the instances sort
+//    copies of them or arrays of pointers to them;
+//  - the string memory pool of src/fsc/fscinit.cpp is thread local (pthread key created once by
+//    FSCInit at import), pools of new threads are created lazily, the string buffers themselves
+//    are malloc-ed blocks and the shared strings have atomic reference counts.
+// a single instance is not reentrant, estnltk.vabamorf.morf.Vabamorf serializes its calls with a lock.
+%thread Vabamorf::analyze;
+%thread Vabamorf::analyzeSentences;
+%thread Vabamorf::disambiguate;
+%thread Vabamorf::spellcheck;
+%thread Vabamorf::synthesize;
+
 namespace std {
     %template(AnalysisVector) vector<Analysis>;
     %template(WordAnalysis) pair<string, vector<Analysis> >;
     %template(SentenceAnalysis) vector<pair<string, vector<Analysis> > >;
+    %template(SentencesAnalysis) vector<vector<pair<string, vector<Analysis> > > >;
     %template(StringVector) vector<std::string>;
+    %template(StringVectors) vector<vector<std::string> >;
     %template(SpellingSuggestions) vector<SpellingResults>;
     %template(Syllables) vector<Syllable>;
     %template(SentenceSyllables) vector<vector<Syllable> >;
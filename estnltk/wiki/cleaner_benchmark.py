@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the wiki markup cleaning functions on the bundled text-examples.
+
+The articles in text-examples have already been cleaned, so templates, references and
+nested tables are interleaved with their paragraphs to get markup similar to the dump.
+The articles are repeated to get larger inputs. Run as::
+
+    python -m estnltk.wiki.cleaner_benchmark
+
+The time per character should stay roughly constant as the articles grow.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import codecs
+import json
+import os
+import timeit
+
+from .cleaner import clean, dropNested
+from .parser import templatesCollector
+
+EXAMPLES_PATH = os.path.join(os.path.dirname(__file__), 'text-examples')
+
+MARKUP = [
+    '{{Infobox|nimi=Näide|pilt=Näide.jpg}}',
+    '<ref>{{netiviide|URL=http://et.wikipedia.org|Pealkiri=Näide}}</ref>',
+    '{{vaata|Näide}}',
+    '<table><tr><td><table><tr><td>tabel</td></tr></table></td></tr></table>',
+    '<!-- kommentaar --><small>väike</small><br/>',
+]
+
+
+def load_examples():
+    """Load the texts of the bundled articles."""
+    texts = []
+    for fnm in sorted(os.listdir(EXAMPLES_PATH)):
+        with codecs.open(os.path.join(EXAMPLES_PATH, fnm), 'rb', 'utf-8') as f:
+            texts.append(json.load(f)['text'])
+    return texts
+
+
+def add_markup(text):
+    """Interleave the paragraphs of the text with templates, references and tables."""
+    paragraphs = text.split('\n')
+    return '\n'.join(paragraph + MARKUP[i % len(MARKUP)] for i, paragraph in enumerate(paragraphs))
+
+
+def benchmark(scales=(1, 4, 16, 64), repeat=3):
+    texts = [add_markup(text) for text in load_examples()]
+    functions = [
+        ('templatesCollector', lambda text: templatesCollector(text, '{', '}')),
+        ('dropNested', lambda text: dropNested(text, r'<\s*table\b[^>/]*>', r'<\s*/\s*table>')),
+        ('clean', clean),
+    ]
+    print('{0:<20} {1:>6} {2:>10} {3:>10} {4:>14}'.format('function', 'scale', 'chars', 'seconds', 'ns per char'))
+    for name, function in functions:
+        for scale in scales:
+            articles = ['\n'.join([text] * scale) for text in texts]
+            chars = sum(len(article) for article in articles)
+            seconds = min(timeit.repeat(lambda: [function(article) for article in articles], number=1, repeat=repeat))
+            print('{0:<20} {1:>6} {2:>10} {3:>10.4f} {4:>14.1f}'.format(name, scale, chars, seconds, seconds * 1e9 / chars))
+
+
+if __name__ == '__main__':
+    benchmark()
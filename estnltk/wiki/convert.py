@@ -4,6 +4,7 @@ __author__ = 'Andres'
 
 from .. import Text
 from .jsonWriter import fileCleanerRegEx
+from .shards import ShardWriter, get_shards, read_shard
 import argparse
 import codecs
 import json
@@ -92,7 +93,21 @@ def json_format(j_obj):
     return new
 
 
-def json_2_text(inp, out, verbose = False):
+def read_articles(inp):
+    """Read the extracted articles from the shards or the separate files in the input directory."""
+    shards = get_shards(inp)
+    if shards:
+        for shard in shards:
+            for j_obj in read_shard(shard):
+                yield j_obj
+    else:
+        for root, dirs, filenames in os.walk(inp):
+            for f in filenames:
+                with codecs.open(os.path.join(root, f), 'r') as log:
+                    yield json.load(log)
+
+
+def json_2_text(inp, out, verbose = False, shards=None):
     """Convert a Wikipedia article to Text object.
     Concatenates the sections in wikipedia file and rearranges other information so it
     can be interpreted as a Text object.
@@ -102,10 +117,13 @@ def json_2_text(inp, out, verbose = False):
 
     Parameters
     ----------
-    inp: directory of parsed et.wikipedia articles in json format
+    inp: directory of parsed et.wikipedia articles in json format, separate files or shards
 
     out: output directory of .txt files
 
+    shards: if an estnltk.wiki.shards.ShardWriter, the converted articles are written to its shards
+            instead of separate .txt files in the output directory
+
     verbose: if True, prints every article title and total count of converted files
              if False prints every 50th count
     Returns
@@ -114,16 +132,16 @@ def json_2_text(inp, out, verbose = False):
         The Text object.
     """
 
-    for root, dirs, filenames in os.walk(inp):
-        for f in filenames:
-            log = codecs.open(os.path.join(root, f), 'r')
-            j_obj = json.load(log)
-            j_obj = json_format(j_obj)
+    for j_obj in read_articles(inp):
+        j_obj = json_format(j_obj)
 
-            #not needed, cause the json_format takes care of the right structuring
-            #text = Text(j_obj)
+        #not needed, cause the json_format takes care of the right structuring
+        #text = Text(j_obj)
 
+        if shards is None:
             textWriter(j_obj, out, verbose)
+        else:
+            shards.write(j_obj, j_obj['data']['title'])
 
 def textWriter(jsonObj, dir, verbose):
     global count
@@ -159,6 +177,15 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true",
                         help='Print written article titles and count.')
 
+    parser.add_argument("-s", "--shards", action="store_true",
+                        help='Write the articles to JSON lines shards with an offset index instead of separate files.')
+
+    parser.add_argument("--shard-size", type=int, default=64,
+                        help='Maximum size of a shard in megabytes (default: 64).')
+
+    parser.add_argument("-z", "--gzip", action="store_true",
+                        help='Gzip compress the shards.')
+
     args = parser.parse_args()
     inp = args.input
     out = args.output
@@ -170,7 +197,11 @@ def main():
     if not os.path.exists(out):
         os.mkdir(out)
 
-    json_2_text(inp, out, verbose)
+    if args.shards:
+        with ShardWriter(out, max_bytes=args.shard_size*1024*1024, compress=args.gzip) as shards:
+            json_2_text(inp, out, verbose, shards)
+    else:
+        json_2_text(inp, out, verbose)
     print('Done!')
 
 
@@ -3,6 +3,12 @@
 """
 from __future__ import unicode_literals, print_function, absolute_import
 from ..text import Text
+from .convert import json_format
+from .shards import get_shards, read_shard
+
+import codecs
+import json
+import os
 
 
 def as_text(article):
@@ -23,7 +29,14 @@ def as_text(article):
     estnltk.text.Text
         The Text object.
     """
-    pass
+    return Text(json_format(article))
+
+
+def to_text(article):
+    """Convert an article to Text, unless it has already been converted with :py:func:`~estnltk.wiki.convert.json_format`."""
+    if 'data' in article:
+        return Text(article)
+    return as_text(article)
 
 
 def read_article(fnm):
@@ -39,20 +52,34 @@ def read_article(fnm):
     estnltk.text.Text
         The article as a Text object.
     """
-    pass
+    with codecs.open(fnm, 'rb', 'utf-8') as f:
+        return to_text(json.load(f))
 
 
 def yield_corpus(path):
     """Yield all articles from a Wikipedia corpus.
 
+    The articles are read one at a time from the .jsonl and .jsonl.gz shards
+    written by :py:class:`~estnltk.wiki.shards.ShardWriter`. If the directory
+    contains no shards, the articles are read from separate .json/.txt files.
+
     Parameters
     ----------
     path: str
-        The directory containing .json files of articles.
+        The directory containing sharded or separate articles, either extracted
+        by :py:mod:`~estnltk.wiki.parser` or converted by :py:mod:`~estnltk.wiki.convert`.
 
     Returns
     -------
     generator of text
     """
-    pass
+    shards = get_shards(path)
+    if shards:
+        for shard in shards:
+            for article in read_shard(shard):
+                yield to_text(article)
+    else:
+        for fnm in sorted(os.listdir(path)):
+            if fnm.endswith('.json') or fnm.endswith('.txt'):
+                yield read_article(os.path.join(path, fnm))
 
@@ -9,12 +9,14 @@ from xml.etree.ElementTree import iterparse
 import argparse
 from bz2 import BZ2File
 import time
-from copy import copy
+from multiprocessing import Process, Queue, cpu_count
+from six.moves import queue
 from .infoBox import infoBoxParser
 from .sections import sectionsParser
 from .references import referencesFinder,refsParser
 from .categoryParser import categoryParser
 from .jsonWriter import jsonWriter
+from .shards import ShardWriter
 from .cleaner import clean
 from .internalLink import findBalanced
 from .cleaner import dropSpans
@@ -57,6 +59,9 @@ def parse_and_remove(filename, path):
             if tag_stack == path_parts:
                 yield elem
                 elem_stack[-2].remove(elem)
+            elif eletag.endswith('page'):
+                # the texts of the page have been yielded, free the memory
+                elem.clear()
             try:
                 tag_stack.pop()
                 elem_stack.pop()
@@ -66,116 +71,300 @@ def parse_and_remove(filename, path):
 def templatesCollector(text, open, close):
     """leaves related articles and wikitables in place"""
     others = []
-    spans = [i for i in findBalanced(text, open, close)]
-    spanscopy = copy(spans)
-    for i in range(len(spans)):
-        start, end = spans[i]
-
+    spans = []
+    for start, end in findBalanced(text, open, close):
         o = text[start:end]
         ol = o.lower()
         if 'vaata|' in ol or 'wikitable' in ol:
-            spanscopy.remove(spans[i])
             continue
+        spans.append((start, end))
         others.append(o)
-    text = dropSpans(spanscopy, text)
+    text = dropSpans(spans, text)
 
     return text, others
 
-def etWikiParser(data, outputdir, verbose = False):
-    global dropcount
-
-    if not outputdir[-1] == r'/':
-        outputdir += r'/'
+def iter_pages(data):
+    """Group the (tag, text) stream of :py:func:`parse_and_remove` into raw pages.
 
-    totalwriter = 0
-    totalComp = 0
-    totalTime = 0
+    Yields
+    ------
+    dict
+        Pages with title, url, timestamp and the wiki markup in text.
+    """
     pageObj = {}
     for tag, text in data:
         if tag and text:
             tag, text = as_unicode(tag), as_unicode(text)
-            #print(tag, text)
 
         if 'title' in tag:
+            pageObj['title'] = text
+            pageObj['url'] = linkBegin+text.replace(' ', '_')
 
-        #Drop wikipedia internal pages.
+        if 'timestamp' in tag:
+            pageObj['timestamp'] = text
 
+        if 'text' in tag:
+            page = dict(pageObj)
+            page['text'] = text
+            yield page
 
 
-            pageObj['title'] = text
+def parsePage(page, verbose=False):
+    """Parse the markup of a raw page from :py:func:`iter_pages`.
 
-            pageObj['url'] = linkBegin+text.replace(' ', '_')
+    Returns
+    -------
+    dict
+        The article object written by :py:func:`jsonWriter` or None, if the page is dropped.
+    """
+    global dropcount
+    text = page.pop('text')
+    pageObj = page
 
-            if verbose:
-                print('-----------')
-                print(pageObj['title'], end=' ')
+    if verbose:
+        print('-----------')
+        print(pageObj['title'], end=' ')
 
-        if 'timestamp' in tag:
-            pageObj['timestamp'] = text
+    #Drop wikipedia internal pages.
+    for dropPage in dropPages:
+        if dropPage in pageObj['title']:
+            if verbose:
+                dropcount += 1
+                print('Dropped Page count', dropcount, text.strip())
+            return None
 
     #Drop redirects
+    try:
+        if '#REDIRECT' in text or '#suuna' in text:
+            if verbose:
+                dropcount += 1
+                print('Dropped Page count:', dropcount, text.strip())
+            return None
+    except TypeError:
+        print(pageObj)
+        return None
 
-        if 'text' in tag:
+    #Finds and marks nicely all the references in the article, returns a tag:reference dictionary
+    text, refsDict = referencesFinder(text)
 
-            for page in dropPages:
-                if page in pageObj['title']:
-                    if verbose:
-                        dropcount += 1
-                        print('Dropped Page count', dropcount, text.strip())
-                    continue
+    #Infoboxes
+    m = re.search(ib, text)
+    if m:
+        text, pageObj['infobox'] = infoBoxParser(text)
 
-            try:
-                if '#REDIRECT' in text or '#suuna' in text:
-                    if verbose:
-                        dropcount += 1
-                        print('Dropped Page count:', dropcount, text.strip())
-                    continue
-            except TypeError:
-                print(pageObj)
-                continue
-            compStart = time.time()
+    #Finds links in references TODO: find unbracketed external links
+    if refsDict:
+        refsDict = refsParser(refsDict)
+        pageObj['references'] = refsDict
 
-    #Finds and marks nicely all the references in the article, returns a tag:reference dictionary
-            text, refsDict = referencesFinder(text)
+    #Categories, cleaning, and other element.
+    if '{' in text:
+        text, pageObj['other'] = templatesCollector(text, '{', '}')
 
-    #Infoboxes
-            m = re.search(ib, text)
-            if m:
-                text, pageObj['infobox'] = infoBoxParser(text)
+    text, catList = categoryParser(text)
+    text = clean(text)
+    pageObj['categories'] = catList
+
+    #SectionParser is where all the work with links, images etc gets done
+    sectionobj = (sectionsParser(text))
+    pageObj['sections'] = sectionobj
+
+    return pageObj
+
+
+class StageTimer(object):
+    """Accumulates the busy and waiting time of a pipeline stage."""
 
-#Finds links in references TODO: find unbracketed external links
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.waiting = 0.0
 
-            if refsDict:
-                refsDict = refsParser(refsDict)
-                pageObj['references'] = refsDict
-#Categories, cleaning, and other element.
-            if '{' in text:
-                text, pageObj['other'] = templatesCollector(text, '{', '}')
+    def report(self):
+        rate = self.items / self.busy if self.busy > 0 else 0
+        return '{0:<8} {1:>8} pages, busy {2:>8.1f}s ({3:>7.1f} pages/s), waiting {4:>8.1f}s'.format(
+            self.name, self.items, self.busy, rate, self.waiting)
 
-            text, catList = categoryParser(text)
-            text = clean(text)
-            pageObj['categories'] = catList
 
-#SectionParser is where all the work with links, images etc gets done
-            sectionobj = (sectionsParser(text))
-            pageObj['sections'] = sectionobj
+def writeArticle(pageObj, outputdir, verbose, shards):
+    if shards is None:
+        jsonWriter(pageObj, outputdir, verbose)
+    else:
+        shards.write(pageObj, pageObj['title'])
+
+
+def etWikiParser(data, outputdir, verbose = False, shards=None):
+    """Parse the pages of the (tag, text) stream and write the articles in a single process.
+
+    If `shards` is a :py:class:`~estnltk.wiki.shards.ShardWriter`, the articles are written to
+    its shards instead of separate .json files in `outputdir`.
+    """
+    if not outputdir[-1] == r'/':
+        outputdir += r'/'
 
+    parsing = StageTimer('parse')
+    writing = StageTimer('write')
+    for page in iter_pages(data):
+        compStart = time.time()
+        pageObj = parsePage(page, verbose)
+        parsing.busy += time.time() - compStart
+        parsing.items += 1
+        if pageObj is None:
+            continue
 
-            #Precious time
+        timestart = time.time()
+        writeArticle(pageObj, outputdir, verbose, shards)
+        writing.busy += time.time() - timestart
+        writing.items += 1
 
-            thisComp = time.time() - compStart
-            totalComp += thisComp
-            #print('Progtime : ',thisComp , totalComp)
-            timestart = time.time()
-            jsonWriter(pageObj, outputdir, verbose)
-            thisWrite = time.time()-timestart
-            totalwriter += thisWrite
-            #print('Writetime: ' , thisWrite ,totalwriter)
+    print(parsing.report())
+    print(writing.report())
 
 
-            pageObj = {}
-            totalTime +=thisComp + thisWrite
-            #print('Totaltime: ' , totalTime)
+def openDump(inputFile):
+    if inputFile[-3:] == 'bz2':
+        return BZ2File(inputFile)
+    return open(inputFile, 'rb')
+
+
+def readerStage(inputFile, pageQueue, workers, batchSize, timerQueue):
+    """Decompress and parse the XML dump, put batches of raw pages to `pageQueue`."""
+    timer = StageTimer('read')
+    batch = []
+    try:
+        with openDump(inputFile) as xml_file:
+            pages = iter_pages(parse_and_remove(xml_file, "wikimedia/wikimedia"))
+            while True:
+                started = time.time()
+                page = next(pages, None)
+                timer.busy += time.time() - started
+                if page is not None:
+                    batch.append(page)
+                    timer.items += 1
+                if batch and (page is None or len(batch) == batchSize):
+                    started = time.time()
+                    pageQueue.put(batch)
+                    timer.waiting += time.time() - started
+                    batch = []
+                if page is None:
+                    break
+    finally:
+        # stop the workers also when reading fails, the failure is detected from the exit code
+        for _ in range(workers):
+            pageQueue.put(None)
+        timerQueue.put(timer)
+
+
+def workerStage(pageQueue, articleQueue, verbose, timerQueue):
+    """Parse batches of raw pages from `pageQueue`, put batches of articles to `articleQueue`."""
+    timer = StageTimer('parse')
+    try:
+        while True:
+            started = time.time()
+            batch = pageQueue.get()
+            timer.waiting += time.time() - started
+            if batch is None:
+                break
+            started = time.time()
+            articles = [parsePage(page, verbose) for page in batch]
+            timer.busy += time.time() - started
+            timer.items += len(batch)
+            started = time.time()
+            articleQueue.put([pageObj for pageObj in articles if pageObj is not None])
+            timer.waiting += time.time() - started
+    finally:
+        articleQueue.put(None)
+        timerQueue.put(timer)
+
+
+def checkStages(stages):
+    """Terminate the pipeline and raise an exception, if any of the stages has failed."""
+    for stage in stages:
+        if stage.exitcode is not None and stage.exitcode != 0:
+            for other in stages:
+                if other.is_alive():
+                    other.terminate()
+            raise RuntimeError('Wiki parser stage {0} failed with exit code {1}'.format(stage.name, stage.exitcode))
+
+
+def parallelWikiParser(inputFile, outputdir, processes=None, verbose=False, batchSize=50, queueSize=16,
+                       shards=None):
+    """Parse the dump in a reader -> workers -> writer pipeline.
+
+    The reader process decompresses the dump and collects the raw pages,
+    `processes` worker processes parse the pages and the articles are written
+    by the calling process. The queues between the stages hold at most
+    `queueSize` batches of `batchSize` pages, so the memory usage stays bounded
+    when some of the stages are slower than others.
+
+    Parameters
+    ----------
+    inputFile: str
+        The path of the .xml or .xml.bz2 dump file.
+    outputdir: str
+        The directory of the article .json files.
+    processes: int
+        The number of worker processes (default: number of CPUs minus the reader process).
+    shards: estnltk.wiki.shards.ShardWriter
+        If given, the articles are written to its shards instead of separate .json files.
+    """
+    if not outputdir[-1] == r'/':
+        outputdir += r'/'
+    if processes is None:
+        processes = max(1, cpu_count() - 1)
+
+    pageQueue = Queue(queueSize)
+    articleQueue = Queue(queueSize)
+    timerQueue = Queue()
+    stages = [Process(target=readerStage, args=(inputFile, pageQueue, processes, batchSize, timerQueue))]
+    stages.extend(Process(target=workerStage, args=(pageQueue, articleQueue, verbose, timerQueue))
+                  for _ in range(processes))
+    for stage in stages:
+        stage.daemon = True
+        stage.start()
+
+    started = time.time()
+    writing = StageTimer('write')
+    running = processes
+    while running > 0:
+        waitStart = time.time()
+        try:
+            articles = articleQueue.get(timeout=1.0)
+        except queue.Empty:
+            # a stage killed without reaching its finally block never sends its sentinel
+            checkStages(stages)
+            continue
+        finally:
+            writing.waiting += time.time() - waitStart
+        if articles is None:
+            running -= 1
+            continue
+        timestart = time.time()
+        for pageObj in articles:
+            writeArticle(pageObj, outputdir, verbose, shards)
+        writing.busy += time.time() - timestart
+        writing.items += len(articles)
+
+    for stage in stages:
+        while stage.is_alive():
+            # the reader blocks on the full page queue, if all the workers have failed
+            stage.join(1.0)
+            checkStages(stages)
+    checkStages(stages)
+    timers = [timerQueue.get(timeout=1.0) for _ in stages]
+
+    parsing = StageTimer('parse')
+    for timer in timers:
+        if timer.name == 'parse':
+            parsing.items += timer.items
+            parsing.busy += timer.busy
+            parsing.waiting += timer.waiting
+        else:
+            print(timer.report())
+    print(parsing.report(), 'in', processes, 'processes')
+    print(writing.report())
+    print('Total {0:.1f}s'.format(time.time() - started))
 
 
 def main():
@@ -192,6 +381,19 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true",
                         help='Print written article titles and count.')
 
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help='Number of page parsing processes, 0 to parse in a single process '
+                             '(default: number of CPUs minus one).')
+
+    parser.add_argument("-s", "--shards", action="store_true",
+                        help='Write the articles to JSON lines shards with an offset index instead of separate files.')
+
+    parser.add_argument("--shard-size", type=int, default=64,
+                        help='Maximum size of a shard in megabytes (default: 64).')
+
+    parser.add_argument("-z", "--gzip", action="store_true",
+                        help='Gzip compress the shards.')
+
 
     args = parser.parse_args()
     outputDir = args.directory
@@ -200,15 +402,25 @@ def main():
 
     if inputFile[-3:] == 'bz2':
         print('BZ2', inputFile)
-        with BZ2File(inputFile) as xml_file:
-            data = parse_and_remove(xml_file, "wikimedia/wikimedia")
-            etWikiParser(data, outputDir, verbose)
     elif inputFile[-3:] == 'xml':
         print('XML', inputFile)
-        data = parse_and_remove(inputFile, "wikimedia/wikimedia")
-        etWikiParser(data, outputDir, verbose)
     else:
         print("WRONG FILE FORMAT! \nTry etwiki-latest-pages-articles.xml.bz2 from https://dumps.wikimedia.org/etwiki/latest/")
+        return
+
+    shards = None
+    if args.shards:
+        shards = ShardWriter(outputDir, max_bytes=args.shard_size*1024*1024, compress=args.gzip)
+    try:
+        if args.processes == 0:
+            with openDump(inputFile) as xml_file:
+                data = parse_and_remove(xml_file, "wikimedia/wikimedia")
+                etWikiParser(data, outputDir, verbose, shards)
+        else:
+            parallelWikiParser(inputFile, outputDir, args.processes, verbose, shards=shards)
+    finally:
+        if shards is not None:
+            shards.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Sharded JSON lines storage for Wikipedia articles.
+
+Instead of writing a separate file for every article, the articles are appended to
+JSON lines shards, each of them at most `max_bytes` large. Optionally every article is
+compressed as a separate gzip member, so the shards are still readable as regular .gz
+files, but a single article can be decompressed without reading the rest of the shard.
+
+Every written article is listed in an index file (one JSON object per line) with the
+shard name, byte offset and length of the record::
+
+    {"key": "Algriim", "shard": "articles-00000.jsonl.gz", "offset": 10234, "length": 1877}
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import codecs
+import gzip
+import json
+import os
+import zlib
+
+JSONL = '.jsonl'
+GZIP = '.gz'
+INDEX = '.index.jsonl'
+
+
+def gzip_member(data):
+    """Compress the data as a single gzip member."""
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ShardWriter(object):
+    """Writes articles to size bounded JSON lines shards and the offset index.
+
+    Parameters
+    ----------
+    directory: str
+        The output directory.
+    prefix: str
+        The prefix of the shard and index file names (default: 'articles').
+    max_bytes: int
+        The maximum size of a shard in bytes (default: 64 MB). A larger article is written to a shard of its own.
+    compress: bool
+        If True, the shards are gzip compressed (default: False).
+    """
+
+    def __init__(self, directory, prefix='articles', max_bytes=64*1024*1024, compress=False):
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.count = 0
+        self.shards = 0
+        self.shard = None
+        self.shard_name = None
+        self.offset = 0
+        self.index = codecs.open(os.path.join(directory, prefix + INDEX), 'wb', 'utf-8')
+
+    def write(self, article, key):
+        """Append the article to the current shard.
+
+        Parameters
+        ----------
+        article: dict
+            The JSON serializable article.
+        key: str
+            The key of the article in the index, usually its title.
+        """
+        record = json.dumps(article, sort_keys=True, ensure_ascii=False).encode('utf-8') + b'\n'
+        if self.compress:
+            record = gzip_member(record)
+        if self.shard is None or (self.offset > 0 and self.offset + len(record) > self.max_bytes):
+            self.next_shard()
+        self.shard.write(record)
+        self.index.write(json.dumps({'key': key, 'shard': self.shard_name,
+                                     'offset': self.offset, 'length': len(record)}))
+        self.index.write('\n')
+        self.offset += len(record)
+        self.count += 1
+
+    def next_shard(self):
+        if self.shard is not None:
+            self.shard.close()
+        self.shard_name = '{0}-{1:05d}{2}'.format(self.prefix, self.shards, JSONL + (GZIP if self.compress else ''))
+        self.shard = open(os.path.join(self.directory, self.shard_name), 'wb')
+        self.shards += 1
+        self.offset = 0
+
+    def close(self):
+        if self.shard is not None:
+            self.shard.close()
+            self.shard = None
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def is_shard(fnm):
+    return fnm.endswith(JSONL) or fnm.endswith(JSONL + GZIP)
+
+
+def get_shards(directory):
+    """List the paths of the shards in the directory, in the order they were written."""
+    return [os.path.join(directory, fnm) for fnm in sorted(os.listdir(directory))
+            if is_shard(fnm) and not fnm.endswith(INDEX)]
+
+
+def read_shard(path):
+    """Read the articles of a shard one at a time.
+
+    Parameters
+    ----------
+    path: str
+        The path of a .jsonl or .jsonl.gz shard.
+
+    Returns
+    -------
+    generator of dict
+    """
+    opener = gzip.open if path.endswith(GZIP) else open
+    with opener(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line.decode('utf-8'))
+
+
+def read_index(directory, prefix='articles'):
+    """Read the index of the shards in the directory.
+
+    Returns
+    -------
+    dict
+        Mapping from article keys to index entries with shard, offset and length.
+    """
+    index = {}
+    with codecs.open(os.path.join(directory, prefix + INDEX), 'rb', 'utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            index[entry['key']] = entry
+    return index
+
+
+def read_record(directory, entry):
+    """Read a single article at the position given by its index entry."""
+    with open(os.path.join(directory, entry['shard']), 'rb') as f:
+        f.seek(entry['offset'])
+        record = f.read(entry['length'])
+    if entry['shard'].endswith(GZIP):
+        record = zlib.decompress(record, 16 + zlib.MAX_WBITS)
+    return json.loads(record.decode('utf-8'))
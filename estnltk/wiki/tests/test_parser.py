@@ -70,6 +70,14 @@ class testParser(unittest.TestCase):
 
 
 
+class testParsePage(unittest.TestCase):
+
+    def test_dropped_pages(self):
+        from ..parser import parsePage
+        self.assertIsNone(parsePage({'title': 'Mall:Infokast', 'text': 'Mallil pole viiteid.'}))
+        self.assertIsNone(parsePage({'title': 'Tallinn', 'text': '#REDIRECT [[Tallinn]]'}))
+
+
 def printer(flist):
 
     for i in flist:
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import shutil
+import tempfile
+import unittest
+
+from ..shards import ShardWriter, get_shards, read_shard, read_index, read_record
+
+
+class ShardsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.articles = [{'title': 'Artikkel {0}'.format(i), 'text': 'Õun ja pirn. ' * (i + 1)} for i in range(50)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, compress):
+        with ShardWriter(self.directory, max_bytes=1000, compress=compress) as writer:
+            for article in self.articles:
+                writer.write(article, article['title'])
+        return writer
+
+    def check(self, compress):
+        writer = self.write(compress)
+        shards = get_shards(self.directory)
+        self.assertEqual(len(shards), writer.shards)
+        self.assertGreater(len(shards), 1)
+
+        articles = [article for shard in shards for article in read_shard(shard)]
+        self.assertListEqual(articles, self.articles)
+
+        index = read_index(self.directory)
+        self.assertEqual(len(index), len(self.articles))
+        for article in reversed(self.articles):
+            self.assertDictEqual(read_record(self.directory, index[article['title']]), article)
+
+    def test_plain(self):
+        self.check(compress=False)
+
+    def test_gzip(self):
+        self.check(compress=True)
+        self.assertTrue(all(shard.endswith('.jsonl.gz') for shard in get_shards(self.directory)))
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+"""Compact binary snapshot of Estonian WordNet.
+
+Parsing the EuroWordNet file with eurown.Parser takes time, as every synset that is touched
+while traversing relations has to be parsed. The snapshot is built once from the whole WordNet
+file and stores
+
+  * the part-of-speech and the variants (literal, sense) of every synset, with the literals
+    stored only once in a literal table;
+  * an adjacency array of synset ids per relation type.
+
+The snapshot file is memory-mapped, so loading it takes milliseconds and the pages are shared
+between processes. When the snapshot exists, wn.py uses it for relation lookups and parses
+the raw synsets only when their full content (definitions, examples, ...) is requested.
+
+Build the snapshot with::
+
+    python -m estnltk.wordnet.snapshot
+
+"""
+
+import sys
+import json
+import mmap
+import struct
+import bisect
+from array import array
+
+import six
+
+MAGIC = b'EWNSNAP1'
+HEADER = struct.Struct('<8sI') # magic, length of the json header
+ALIGNMENT = 8
+
+
+def _relation_section(relation, part):
+    return 'relation:%s:%s' % (relation, part)
+
+
+def build_snapshot(snapshot_file=None, wn_file=None, synset_idxes=None):
+    """Parses the WordNet file and writes its synsets, variants and relations into a snapshot file.
+
+    Parameters
+    ----------
+    snapshot_file : str, optional
+      Path of the snapshot file. Defaults to wn.SNAPSHOT_FILE.
+    wn_file : str, optional
+      Path of the EuroWordNet file. Defaults to the WordNet file of estnltk.
+    synset_idxes : list of ints, optional
+      Ids of the synsets to store. Defaults to all the synsets of the WordNet file.
+
+    Returns
+    -------
+    str
+      Path of the snapshot file.
+
+    """
+    from estnltk.wordnet import wn
+    from estnltk.wordnet.eurown import Parser
+
+    snapshot_file = snapshot_file or wn.SNAPSHOT_FILE
+    parser = Parser(wn_file or wn._WN_FILE)
+    offsets = wn._get_offset_index()
+    senses = wn._get_sense_index()
+    synset_idxes = sorted(set(synset_idxes if synset_idxes is not None else offsets))
+
+    literal_ids = {}
+    literal_offsets = array('i', [0])
+    literal_blob = bytearray()
+    pos_names = []
+    pos_codes = array('i')
+    variant_indptr = array('i', [0])
+    variant_literals = array('i')
+    variant_senses = array('i')
+    relation_links = {} # relation name -> list of (row, target synset id)
+
+    for row, synset_idx in enumerate(synset_idxes):
+        raw_synset = parser.parse_synset(offsets[synset_idx])
+        pos = six.text_type(raw_synset.pos)
+        if pos not in pos_names:
+            pos_names.append(pos)
+        pos_codes.append(pos_names.index(pos))
+        for variant in raw_synset.variants:
+            literal = six.text_type(variant.literal)
+            if literal not in literal_ids:
+                literal_ids[literal] = len(literal_ids)
+                literal_blob.extend(literal.encode('utf-8'))
+                literal_offsets.append(len(literal_blob))
+            variant_literals.append(literal_ids[literal])
+            variant_senses.append(int(variant.sense or 0))
+        variant_indptr.append(len(variant_literals))
+        for relation in raw_synset.internalLinks:
+            target_idx = senses.get(wn._get_key_from_raw_synset(relation.target_concept))
+            if target_idx is not None:
+                relation_links.setdefault(six.text_type(relation.name), []).append((row, target_idx))
+
+    sections = [
+        ('ids', array('i', synset_idxes)),
+        ('pos', pos_codes),
+        ('variant_indptr', variant_indptr),
+        ('variant_literals', variant_literals),
+        ('variant_senses', variant_senses),
+        ('literal_offsets', literal_offsets),
+        ('literal_blob', array('B', bytes(literal_blob))),
+    ]
+    for relation in sorted(relation_links):
+        indptr = array('i', [0] * (len(synset_idxes) + 1))
+        targets = array('i')
+        for row, target_idx in relation_links[relation]: # rows are in increasing order
+            indptr[row + 1] += 1
+            targets.append(target_idx)
+        for row in range(len(synset_idxes)):
+            indptr[row + 1] += indptr[row]
+        sections.append((_relation_section(relation, 'indptr'), indptr))
+        sections.append((_relation_section(relation, 'targets'), targets))
+
+    _write_snapshot(snapshot_file, sections, {'pos': pos_names, 'relations': sorted(relation_links)})
+    return snapshot_file
+
+
+def _write_snapshot(snapshot_file, sections, header):
+    header = dict(header)
+    header['byteorder'] = sys.byteorder
+    header['sections'] = {}
+    position = 0
+    for name, data in sections:
+        header['sections'][name] = [position, len(data), data.typecode]
+        position += len(data) * data.itemsize
+        position += -position % ALIGNMENT
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    with open(snapshot_file, 'wb') as fout:
+        fout.write(HEADER.pack(MAGIC, len(header_bytes)))
+        fout.write(header_bytes)
+        fout.write(b'\0' * (-(HEADER.size + len(header_bytes)) % ALIGNMENT))
+        for name, data in sections:
+            raw = data.tobytes() if six.PY3 else data.tostring()
+            fout.write(raw)
+            fout.write(b'\0' * (-len(raw) % ALIGNMENT))
+
+
+class WordnetSnapshot(object):
+    """Read-only, memory-mapped WordNet snapshot.
+
+    Attributes
+    ----------
+    relations : list of str
+      Names of the relations stored in the snapshot.
+
+    """
+
+    def __init__(self, snapshot_file):
+        """
+        Parameters
+        ----------
+          snapshot_file : str
+        Path of the snapshot file built with `build_snapshot`.
+
+        """
+        with open(snapshot_file, 'rb') as fin:
+            self._mmap = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError('%s is not a WordNet snapshot file' % snapshot_file)
+        header = json.loads(self._mmap[HEADER.size:HEADER.size + header_length].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError('WordNet snapshot %s was built on a platform with different byte order, rebuild it' % snapshot_file)
+        data_start = HEADER.size + header_length
+        data_start += -data_start % ALIGNMENT
+
+        self._sections = {}
+        for name, (position, length, typecode) in header['sections'].items():
+            self._sections[name] = self._load_section(data_start + position, length, typecode)
+        self._pos_names = header['pos']
+        self.relations = header['relations']
+        self._ids = self._sections['ids']
+        self._literals = {}
+
+    def _load_section(self, start, length, typecode):
+        end = start + length * array(typecode).itemsize
+        if six.PY3:
+            return memoryview(self._mmap)[start:end].cast(str(typecode))
+        data = array(str(typecode))
+        data.fromstring(self._mmap[start:end])
+        return data
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, synset_idx):
+        row = bisect.bisect_left(self._ids, synset_idx)
+        return row < len(self._ids) and self._ids[row] == synset_idx
+
+    def _row(self, synset_idx):
+        row = bisect.bisect_left(self._ids, synset_idx)
+        if row == len(self._ids) or self._ids[row] != synset_idx:
+            raise KeyError(synset_idx)
+        return row
+
+    def _literal(self, literal_id):
+        if literal_id not in self._literals:
+            offsets = self._sections['literal_offsets']
+            raw = self._sections['literal_blob'][offsets[literal_id]:offsets[literal_id + 1]]
+            self._literals[literal_id] = bytes(raw).decode('utf-8')
+        return self._literals[literal_id]
+
+    def pos(self, synset_idx):
+        """Returns the part-of-speech of the synset."""
+        return self._pos_names[self._sections['pos'][self._row(synset_idx)]]
+
+    def variants(self, synset_idx):
+        """Returns the list of (literal, sense) tuples of the synset's variants."""
+        row = self._row(synset_idx)
+        indptr = self._sections['variant_indptr']
+        literals = self._sections['variant_literals']
+        senses = self._sections['variant_senses']
+        return [(self._literal(literals[i]), senses[i]) for i in range(indptr[row], indptr[row + 1])]
+
+    def name(self, synset_idx):
+        """Returns the synset key in the form of `lemma.pos.sense_no`."""
+        literal, sense = self.variants(synset_idx)[0]
+        return '.'.join([literal, self.pos(synset_idx), "%02d" % sense])
+
+    def related(self, synset_idx, relation):
+        """Returns the ids of the synsets which are linked to the synset via given relation.
+
+        Parameters
+        ----------
+          synset_idx : int
+        Id of the source synset.
+          relation : str
+        Name of the relation.
+
+        Returns
+        -------
+          list of ints
+        Ids of the related synsets, in the order of the WordNet file.
+
+        """
+        indptr_name = _relation_section(relation, 'indptr')
+        if indptr_name not in self._sections:
+            return []
+        row = self._row(synset_idx)
+        indptr = self._sections[indptr_name]
+        return list(self._sections[_relation_section(relation, 'targets')][indptr[row]:indptr[row + 1]])
+
+
+if __name__ == '__main__':
+    print('Wrote WordNet snapshot to', build_snapshot(*sys.argv[1:2]))
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+"""Precomputed hypernymy tables for WordNet similarity measures.
+
+The similarity measures of wn.Synset repeatedly walk the hypernymy/hyponymy graph. Taxonomy
+works on integer synset ids and remembers everything it has computed:
+
+  * the minimum depth of every synset from the closest root;
+  * the ancestors of every synset together with their distance;
+  * the shortest path distances between pairs of synsets.
+
+Shortest paths are found with bidirectional breadth-first search over hypernymy and hyponymy
+links, so the distances are the same as the ones of a plain breadth-first search.
+
+"""
+
+
+class Taxonomy(object):
+    """Hypernymy tables over integer synset ids.
+
+    Parameters
+    ----------
+    hypernyms : callable
+      Maps synset id to the list of its hypernym ids.
+    hyponyms : callable
+      Maps synset id to the list of its hyponym ids.
+
+    """
+
+    def __init__(self, hypernyms, hyponyms):
+        self._get_hypernyms = hypernyms
+        self._get_hyponyms = hyponyms
+        self._hypernyms = {}
+        self._neighbours = {}
+        self._min_depths = {}
+        self._ancestors = {}
+        self._distances = {}
+
+    def hypernyms(self, synset_idx):
+        if synset_idx not in self._hypernyms:
+            self._hypernyms[synset_idx] = tuple(self._get_hypernyms(synset_idx))
+        return self._hypernyms[synset_idx]
+
+    def neighbours(self, synset_idx):
+        """Returns the ids of the hypernyms and hyponyms of the synset."""
+        if synset_idx not in self._neighbours:
+            self._neighbours[synset_idx] = self.hypernyms(synset_idx) + tuple(self._get_hyponyms(synset_idx))
+        return self._neighbours[synset_idx]
+
+    def _compute_upwards(self, synset_idx, table, combine):
+        """Fills `table` for the synset and all its ancestors, parents before children.
+
+        `combine` receives the synset id and the ids of its hypernyms, which are already in the table.
+        Hypernymy cycles are cut at the link which closes the cycle.
+
+        """
+        stack = [synset_idx]
+        in_progress = set()
+        while stack:
+            idx = stack[-1]
+            if idx in table:
+                stack.pop()
+                continue
+            pending = [hypernym for hypernym in self.hypernyms(idx) if hypernym not in table and hypernym not in in_progress]
+            if pending and idx not in in_progress:
+                in_progress.add(idx)
+                stack.extend(pending)
+                continue
+            table[idx] = combine(idx, [hypernym for hypernym in self.hypernyms(idx) if hypernym in table])
+            in_progress.discard(idx)
+            stack.pop()
+        return table[synset_idx]
+
+    def _combine_min_depth(self, synset_idx, hypernyms):
+        if not hypernyms:
+            return 0
+        return 1 + min(self._min_depths[hypernym] for hypernym in hypernyms)
+
+    def _combine_ancestors(self, synset_idx, hypernyms):
+        ancestors = {}
+        for hypernym in hypernyms:
+            ancestors[hypernym] = 1
+        for hypernym in hypernyms:
+            for ancestor, distance in self._ancestors[hypernym].items():
+                if ancestor not in ancestors or distance + 1 < ancestors[ancestor]:
+                    ancestors[ancestor] = distance + 1
+        ancestors.pop(synset_idx, None)
+        return ancestors
+
+    def min_depth(self, synset_idx):
+        """Returns minimum path length from the closest root."""
+        return self._compute_upwards(synset_idx, self._min_depths, self._combine_min_depth)
+
+    def ancestors(self, synset_idx):
+        """Returns a dict, which maps the transitive hypernyms of the synset to their distance from it."""
+        return self._compute_upwards(synset_idx, self._ancestors, self._combine_ancestors)
+
+    def precompute(self, synset_idxes):
+        """Computes the depth and the ancestors of the given synsets in advance."""
+        for synset_idx in synset_idxes:
+            self.min_depth(synset_idx)
+            self.ancestors(synset_idx)
+
+    def lowest_common_hypernyms(self, synset_idx, target_idx):
+        """Returns the sorted ids of the common hypernyms with the greatest minimum depth, None if there are none."""
+        ancestors = self.ancestors(synset_idx)
+        common = [ancestor for ancestor in self.ancestors(target_idx) if ancestor in ancestors]
+        if not common:
+            return None
+        depths = dict((ancestor, self.min_depth(ancestor)) for ancestor in common)
+        max_depth = max(depths.values())
+        return sorted(ancestor for ancestor in common if depths[ancestor] == max_depth)
+
+    def _distance_key(self, synset_idx, target_idx):
+        return (synset_idx, target_idx) if synset_idx <= target_idx else (target_idx, synset_idx)
+
+    def shortest_path_distance(self, synset_idx, target_idx):
+        """Returns the length of the shortest hypernymy/hyponymy path between the synsets, -1 if there is none."""
+        if synset_idx == target_idx:
+            return 0
+        key = self._distance_key(synset_idx, target_idx)
+        if key in self._distances:
+            return self._distances[key]
+
+        seen = [{synset_idx: 0}, {target_idx: 0}]
+        frontiers = [[synset_idx], [target_idx]]
+        distance = -1
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = seen[side], seen[1 - side]
+            next_frontier = []
+            for idx in frontiers[side]:
+                for neighbour in self.neighbours(idx):
+                    if neighbour in own:
+                        continue
+                    own[neighbour] = own[idx] + 1
+                    if neighbour in other:
+                        candidate = own[neighbour] + other[neighbour]
+                        if distance < 0 or candidate < distance:
+                            distance = candidate
+                    next_frontier.append(neighbour)
+            if distance >= 0:
+                break
+            frontiers[side] = next_frontier
+
+        self._distances[key] = distance
+        return distance
+
+    def shortest_path_distances(self, synset_idx, target_idxes):
+        """Returns the shortest path distances from the synset to every target, -1 for unreachable targets.
+
+        Uses a single breadth-first search, which stops as soon as all the targets have been reached.
+
+        """
+        distances = {}
+        missing = set()
+        for target_idx in target_idxes:
+            key = self._distance_key(synset_idx, target_idx)
+            if target_idx == synset_idx:
+                distances[target_idx] = 0
+            elif key in self._distances:
+                distances[target_idx] = self._distances[key]
+            else:
+                missing.add(target_idx)
+
+        if missing:
+            seen = {synset_idx: 0}
+            frontier = [synset_idx]
+            while frontier and missing:
+                next_frontier = []
+                for idx in frontier:
+                    for neighbour in self.neighbours(idx):
+                        if neighbour not in seen:
+                            seen[neighbour] = seen[idx] + 1
+                            next_frontier.append(neighbour)
+                frontier = next_frontier
+                missing.difference_update(frontier)
+            for target_idx in target_idxes:
+                if target_idx not in distances:
+                    distance = seen.get(target_idx, -1)
+                    self._distances[self._distance_key(synset_idx, target_idx)] = distance
+                    distances[target_idx] = distance
+
+        return [distances[target_idx] for target_idx in target_idxes]
@@ -16,6 +16,8 @@ except ImportError: # Py3
     from io import StringIO
     
 from estnltk.wordnet.eurown import Parser
+from estnltk.wordnet.snapshot import WordnetSnapshot
+from estnltk.wordnet.taxonomy import Taxonomy
 from estnltk import analyze
 from estnltk.core import PACKAGE_PATH
 from estnltk.core import as_unicode
@@ -28,6 +30,7 @@ _SOI = os.path.join(DATA_DIR, "kb69a-utf8.soi")
 _WN_FILE = os.path.join(DATA_DIR, "kb69a-utf8.txt")
 _SENSE_FILE = os.path.join(DATA_DIR, "sense.txt")
 _MAX_TAX_FILE = os.path.join(DATA_DIR, "max_tax_depths.cnf")
+SNAPSHOT_FILE = os.path.join(DATA_DIR, "kb69a-utf8.snapshot")
 
 VERB = 'v'
 NOUN = 'n'
@@ -50,6 +53,131 @@ LEM_POS_2_SS_IDX = defaultdict(lambda: defaultdict(list)) # map lemma and pos to
 
 LOADED_POS = set()
 
+LIT_POS_INDEX = None # maps lemma to pos to the list of synset indexes
+SENSE_INDEX = None # maps synset key `lemma.pos.sense_no` to synset index
+OFFSET_INDEX = None # maps synset index to pointer offset in the WordNet file
+SNAPSHOT = None # WordnetSnapshot, if the snapshot file has been built
+_SNAPSHOT_LOADED = False
+TAXONOMY = None # hypernymy tables shared by the similarity measures
+
+def _get_lit_pos_index():
+    """Returns the index of `lit_pos_synidx.txt`, which maps lemmas to parts-of-speech to synset indexes.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    The index is built when it is requested for the first time.
+
+    """
+    global LIT_POS_INDEX
+    if LIT_POS_INDEX is None:
+        index = {}
+        with codecs.open(_LIT_POS_FILE,'rb', 'utf-8') as fin:
+            for line in fin:
+                literal,pos,idxes = line.strip().rsplit(':',2)
+                index.setdefault(literal,{}).setdefault(pos,[]).extend(int(x) for x in idxes.split())
+        LIT_POS_INDEX = index
+    return LIT_POS_INDEX
+
+def _get_sense_index():
+    """Returns the index of `sense.txt`, which maps synset keys to synset indexes.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    The index is built when it is requested for the first time.
+
+    """
+    global SENSE_INDEX
+    if SENSE_INDEX is None:
+        index = {}
+        with codecs.open(_SENSE_FILE,'rb', 'utf-8') as fin:
+            for line in fin:
+                synset_key,synset_idx = line.strip().rsplit(':',1)
+                if synset_key not in index:
+                    index[synset_key] = int(synset_idx)
+        SENSE_INDEX = index
+    return SENSE_INDEX
+
+def _get_offset_index():
+    """Returns the index of the `.soi` file, which maps synset indexes to pointer offsets in the WordNet file.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    The index is built when it is requested for the first time.
+
+    """
+    global OFFSET_INDEX
+    if OFFSET_INDEX is None:
+        index = {}
+        with codecs.open(_SOI,'rb', 'utf-8') as fin:
+            for line in fin:
+                split_line = line.split(':')
+                index[int(split_line[0])] = int(split_line[1])
+        OFFSET_INDEX = index
+    return OFFSET_INDEX
+
+def _get_snapshot():
+    """Returns the memory-mapped WordNet snapshot or None, if the snapshot file has not been built.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    See `estnltk.wordnet.snapshot` for building the snapshot.
+
+    """
+    global SNAPSHOT, _SNAPSHOT_LOADED
+    if not _SNAPSHOT_LOADED:
+        _SNAPSHOT_LOADED = True
+        if os.path.exists(SNAPSHOT_FILE):
+            SNAPSHOT = WordnetSnapshot(SNAPSHOT_FILE)
+    return SNAPSHOT
+
+def load_snapshot(snapshot_file=SNAPSHOT_FILE):
+    """Uses the given WordNet snapshot for relation lookups instead of parsing the WordNet file.
+
+    Parameters
+    ----------
+    snapshot_file : str
+      Path of the snapshot file built with `estnltk.wordnet.snapshot.build_snapshot`.
+      If None, the snapshot is not used.
+
+    """
+    global SNAPSHOT, _SNAPSHOT_LOADED, TAXONOMY
+    SNAPSHOT = WordnetSnapshot(snapshot_file) if snapshot_file is not None else None
+    _SNAPSHOT_LOADED = True
+    TAXONOMY = None
+    SYNSETS_DICT.clear()
+
+def _get_related_idxes(synset_idx, relation):
+    """Returns the ids of the synsets which are linked to the given synset via `relation`.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+
+    """
+    snapshot = _get_snapshot()
+    if snapshot is not None and synset_idx in snapshot:
+        return snapshot.related(synset_idx, relation)
+    return [synset.id for synset in _get_synsets_by_idxes([synset_idx])[0].get_related_synsets(relation)]
+
+def _get_taxonomy():
+    """Returns the hypernymy tables used by the similarity measures.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    The tables are filled lazily, see `precompute_taxonomy` for filling them in advance.
+
+    """
+    global TAXONOMY
+    if TAXONOMY is None:
+        TAXONOMY = Taxonomy(lambda synset_idx: _get_related_idxes(synset_idx, 'has_hyperonym'),
+                            lambda synset_idx: _get_related_idxes(synset_idx, 'has_hyponym'))
+    return TAXONOMY
+
 def _get_synset_offsets(synset_idxes):
     """Returs pointer offset in the WordNet file for every synset index.
 
@@ -70,21 +198,7 @@ def _get_synset_offsets(synset_idxes):
 
 
     """
-    offsets = {}
-    current_seeked_offset_idx = 0
-
-    ordered_synset_idxes = sorted(synset_idxes)
-
-    with codecs.open(_SOI,'rb', 'utf-8') as fin:
-        for line in fin:
-            split_line = line.split(':')
-          
-            while current_seeked_offset_idx < len(ordered_synset_idxes) and split_line[0] == str(ordered_synset_idxes[current_seeked_offset_idx]):
-                # Looping on single line entries in case synset_indexes contains duplicates.
-                offsets[synset_idxes[current_seeked_offset_idx]] = int(split_line[1])
-                current_seeked_offset_idx += 1
-            if current_seeked_offset_idx >= len(synset_idxes):
-                break
+    offsets = _get_offset_index()
     return [offsets[synset_idx] for synset_idx in synset_idxes]
 
 def _get_synsets(synset_offsets):
@@ -123,6 +237,41 @@ def _get_synsets(synset_offsets):
 
     return synsets
 
+def _get_synsets_by_idxes(synset_idxes):
+    """Returns synset object for every synset index.
+
+    Notes
+    -----
+    Internal function. Do not call directly.
+    The synsets already stored in the global synset dictionary are reused. If the snapshot is available,
+    the other synsets are created from it and parsed from the WordNet file only when their full content
+    is requested. Otherwise they are parsed right away.
+
+    Parameters
+    ----------
+    synset_idxes : list of ints
+      Lists synset IDs.
+
+    Returns
+    -------
+    list of Synsets
+      Lists synset objects in the order of `synset_idxes`.
+
+    """
+    snapshot = _get_snapshot()
+    synsets = []
+    for synset_idx in synset_idxes:
+        if synset_idx in SYNSETS_DICT:
+            synsets.append(SYNSETS_DICT[synset_idx])
+        elif snapshot is not None and synset_idx in snapshot:
+            synset = Synset(synset_id=synset_idx)
+            SYNSETS_DICT[synset.name] = synset
+            SYNSETS_DICT[synset.id] = synset
+            synsets.append(synset)
+        else:
+            synsets.extend(_get_synsets(_get_synset_offsets([synset_idx])))
+    return synsets
+
 def _get_key_from_raw_synset(raw_synset):
     """Derives synset key in the form of `lemma.pos.sense_no` from the provided eurown.py Synset class,
 
@@ -170,30 +319,12 @@ def synset(synset_key):
     if synset_key in SYNSETS_DICT:
         return SYNSETS_DICT[synset_key]
 
-    def _get_synset_idx(synset_key):
-        """Returns synset index for the provided key.
-
-        Note
-        ----
-          Internal function. Do not call directly.
-
-        """
-        with codecs.open(_SENSE_FILE,'rb', 'utf-8') as fin:
-            for line in fin:
-                split_line = line.split(':')
-                if split_line[0] == synset_key:
-                    return int(split_line[1].strip())
-        return None
-
-    synset_idx = _get_synset_idx(synset_key)
+    synset_idx = _get_sense_index().get(synset_key)
 
     if synset_idx == None:
         return None
 
-    synset_offset = _get_synset_offsets([synset_idx])
-    synset = _get_synsets(synset_offset)
-
-    return synset[0]
+    return _get_synsets_by_idxes([synset_idx])[0]
 
 
 def synsets(lemma,pos=None):
@@ -219,18 +350,12 @@ def synsets(lemma,pos=None):
     """
 
     def _get_synset_idxes(lemma,pos):
-        line_prefix_regexp = "%s:%s:(.*)"%(lemma,pos if pos else "\w+") 
-        line_prefix = re.compile(line_prefix_regexp)
-
-        idxes = []
+        pos_idxes = _get_lit_pos_index().get(lemma,{})
+        if pos:
+            idxes = list(pos_idxes.get(pos,[]))
+        else:
+            idxes = [idx for pos_key in pos_idxes for idx in pos_idxes[pos_key]]
 
-        with codecs.open(_LIT_POS_FILE,'rb', 'utf-8') as fin:
-            for line in fin:
-                result = line_prefix.match(line)
-                if result:
-                    res_indices = [int(x) for x in result.group(1).split(' ')]
-                    idxes.extend(res_indices)
-                    
         LEM_POS_2_SS_IDX[lemma][pos].extend(idxes)
         return sorted(idxes)
 
@@ -250,8 +375,7 @@ def synsets(lemma,pos=None):
     stored_synsets = [SYNSETS_DICT[synset_idxes[i]] for i in range(len(synset_idxes)) if synset_idxes[i] in SYNSETS_DICT]
     unstored_synset_idxes = [synset_idxes[i] for i in range(len(synset_idxes)) if synset_idxes[i] not in SYNSETS_DICT]
 
-    synset_offsets = _get_synset_offsets(unstored_synset_idxes)
-    synsets = _get_synsets(synset_offsets)
+    synsets = _get_synsets_by_idxes(unstored_synset_idxes)
     
     return stored_synsets + synsets
 
@@ -277,19 +401,13 @@ def all_synsets(pos=None):
 
     """
     def _get_unique_synset_idxes(pos):
-        idxes = []
+        idxes = set()
 
-        with codecs.open(_LIT_POS_FILE,'rb', 'utf-8') as fin:
-            if pos == None:
-                for line in fin:
-                  split_line = line.strip().split(':')
-                  idxes.extend([int(x) for x in split_line[2].split()])
-            else:
-                for line in fin:
-                    split_line = line.strip().split(':')
-                    if split_line[1] == pos:
-                        idxes.extend([int(x) for x in split_line[2].split()])
-        idxes = list(set(idxes))
+        for pos_idxes in _get_lit_pos_index().values():
+            for pos_key in pos_idxes:
+                if pos == None or pos_key == pos:
+                    idxes.update(pos_idxes[pos_key])
+        idxes = list(idxes)
         idxes.sort()
         return idxes
 
@@ -304,8 +422,7 @@ def all_synsets(pos=None):
         stored_synsets = [SYNSETS_DICT[synset_idxes[i]] for i in range(len(synset_idxes)) if synset_idxes[i] in SYNSETS_DICT]
         unstored_synset_idxes = [synset_idxes[i] for i in range(len(synset_idxes)) if synset_idxes[i] not in SYNSETS_DICT]
         
-        synset_offsets = _get_synset_offsets(unstored_synset_idxes)
-        synsets = _get_synsets(synset_offsets)
+        synsets = _get_synsets_by_idxes(unstored_synset_idxes)
 
         for synset in synsets:
             for variant in synset.get_variants():
@@ -387,6 +504,71 @@ def morphy(word):
     return analyzed[-1]['analysis'][0]['lemma'] if len(analyzed) else None
 
 
+def precompute_taxonomy(synsets=None):
+    """Computes the depths and the ancestors of the synsets in advance for the similarity measures.
+
+    Parameters
+    ----------
+    synsets : list of Synsets, optional
+      Synsets to precompute the tables for. Defaults to all the synsets of the snapshot,
+      or all the synsets of WordNet, if the snapshot has not been built.
+
+    """
+    if synsets is not None:
+        synset_idxes = [synset.id for synset in synsets]
+    elif _get_snapshot() is not None:
+        synset_idxes = list(_get_snapshot()._ids)
+    else:
+        synset_idxes = [synset.id for synset in all_synsets()]
+    _get_taxonomy().precompute(synset_idxes)
+
+def similarity_matrix(synsets_a, synsets_b=None, measure='path'):
+    """Calculates similarities between every pair of synsets.
+
+    Parameters
+    ----------
+    synsets_a : list of Synsets
+      Synsets corresponding to the rows of the matrix.
+    synsets_b : list of Synsets, optional
+      Synsets corresponding to the columns of the matrix. Defaults to `synsets_a`.
+    measure : str
+      One of `path`, `lch` and `wup`, see the corresponding Synset methods.
+
+    Returns
+    -------
+    numpy.ndarray
+      Matrix of shape (len(synsets_a), len(synsets_b)), NaN where the similarity is None.
+
+    """
+    import numpy
+
+    if measure not in ('path', 'lch', 'wup'):
+        raise ValueError('Unknown similarity measure <{0}>, expected one of path, lch and wup'.format(measure))
+    if synsets_b is None:
+        synsets_b = synsets_a
+
+    taxonomy = _get_taxonomy()
+    matrix = numpy.full((len(synsets_a), len(synsets_b)), numpy.nan)
+    target_idxes = [synset.id for synset in synsets_b]
+    for row, synset in enumerate(synsets_a):
+        if measure == 'wup':
+            for column, target_synset in enumerate(synsets_b):
+                similarity = synset.wup_similarity(target_synset)
+                if similarity is not None:
+                    matrix[row, column] = similarity
+            continue
+        distances = taxonomy.shortest_path_distances(synset.id, target_idxes)
+        for column, target_synset in enumerate(synsets_b):
+            distance = distances[column]
+            if distance < 0:
+                continue
+            if measure == 'path':
+                matrix[row, column] = 1.0 / (distance + 1)
+            elif synset.pos == target_synset.pos:
+                matrix[row, column] = -math.log((distance + 1) / (2.0 * MAX_TAXONOMY_DEPTHS[synset.pos]))
+    return matrix
+
+
 class Synset:
     """Represents a WordNet synset.
 
@@ -400,23 +582,41 @@ class Synset:
       Synset's part-of-speech.
     _raw_synset: eurown.Synset
       Underlying Synset object. Not intended to access directly.
+      Parsed lazily, if the synset was created from the snapshot.
       
     """
-    def __init__(self,raw_synset):
+    def __init__(self,raw_synset=None,synset_id=None):
         """
         Parameters
         ----------
           raw_synset : eurown.Synset
         Underlying Synset.
+          synset_id : int
+        Synset ID in the snapshot. Used only if `raw_synset` is not given.
           
         """
-        self.name = _get_key_from_raw_synset(raw_synset)
-        self._raw_synset = raw_synset
-        self.id = raw_synset.number or -1
-        self.pos = as_unicode(raw_synset.pos)
+        self._raw = raw_synset
+        if raw_synset is None:
+            snapshot = _get_snapshot()
+            self.name = snapshot.name(synset_id)
+            self.id = synset_id
+            self.pos = as_unicode(snapshot.pos(synset_id))
+        else:
+            self.name = _get_key_from_raw_synset(raw_synset)
+            self.id = raw_synset.number or -1
+            self.pos = as_unicode(raw_synset.pos)
+
+    @property
+    def _raw_synset(self):
+        if self._raw is None:
+            global parser
+            if parser is None:
+                parser = Parser(_WN_FILE)
+            self._raw = parser.parse_synset(_get_synset_offsets([self.id])[0])
+        return self._raw
 
     def __eq__(self, other):
-        return self._raw_synset.number == other._raw_synset.number
+        return self.id == other.id
 
     def __hash__(self):
         return hash(str(self))
@@ -461,31 +661,7 @@ class Synset:
         Minimum path length from the root.
 
         """
-        if "min_depth" in self.__dict__:
-            return self.__dict__["min_depth"]
-
-        min_depth = 0
-        hypernyms = self.hypernyms()
-        if hypernyms:
-            min_depth = 1 + min(h._min_depth() for h in hypernyms)
-        self.__dict__["min_depth"] = min_depth
-
-        return min_depth
-
-        #if 'min_depth' in self.__dict__:
-          #return self.__dict__['min_depth']
-
-        #min_depth = 0
-        #hypernyms = [(0,hypernym) for hypernym in self.hypernyms()]
-
-        #while len(hypernyms) > 0:
-          #hypernym = hypernyms.pop()
-          #hypernym_hypernyms = hypernym[1].hypernyms()
-          #if len(hypernym_hypernyms) == 0:
-        #min_depth = hypernym[0] if hypernym[0] < min_depth else min_depth
-          #else:
-        #hypernyms.extend([(hypernym[0]+1,hyp_hyp) for hyp_hyp in hypernym_hypernyms])
-        #return min_depth
+        return _get_taxonomy().min_depth(self.id)
 
     def _shortest_path_distance(self, target_synset):
         """Finds minimum path length from the target synset.
@@ -506,39 +682,7 @@ class Synset:
         >0 otherwise.
         
         """
-        if "distances" not in self.__dict__:
-            self.__dict__["distances"] = {}
-
-        if "distances" not in target_synset.__dict__:
-            target_synset.__dict__["distances"] = {}
-
-        if target_synset in self.__dict__["distances"]:
-            return self.__dict__["distances"][target_synset]
-
-        distance = 0
-        visited = set()
-        neighbor_synsets = set([self])
-
-        while len(neighbor_synsets) > 0:
-            neighbor_synsets_next_level = set()
-          
-            for synset in neighbor_synsets:
-                if synset in visited:
-                    continue
-        
-                if synset == target_synset:
-                    self.__dict__["distances"][target_synset] = distance
-                    target_synset.__dict__["distances"][self] = distance
-                    return distance
-                neighbor_synsets_next_level |= set(synset.hypernyms())
-                neighbor_synsets_next_level |= set(synset.hyponyms())
-                visited.add(synset)
-            distance += 1
-            neighbor_synsets = set(neighbor_synsets_next_level)
-
-        self.__dict__["distances"][target_synset] = -1
-        target_synset.__dict__["distances"][self] = -1
-        return -1            
+        return _get_taxonomy().shortest_path_distance(self.id, target_synset.id)
 
     def get_related_synsets(self,relation):
         """Retrieves all the synsets which are related by given relation.
@@ -554,6 +698,10 @@ class Synset:
         Synsets which are related via `relation`.
 
         """
+        snapshot = _get_snapshot()
+        if snapshot is not None and self.id in snapshot:
+            return _get_synsets_by_idxes(snapshot.related(self.id, relation))
+
         results = []
 
         for relation_candidate in self._raw_synset.internalLinks:
@@ -711,10 +859,10 @@ class Synset:
         
         """
 
-        if self._raw_synset.pos != synset._raw_synset.pos:
+        if self.pos != synset.pos:
             return None
 
-        depth = MAX_TAXONOMY_DEPTHS[self._raw_synset.pos] 
+        depth = MAX_TAXONOMY_DEPTHS[self.pos] 
 
         distance = self._shortest_path_distance(synset)      
 
@@ -741,12 +889,13 @@ class Synset:
         Wu and Palmer's similarity from `synset`.
         
         """
-        lchs = self.lowest_common_hypernyms(target_synset)
-        lcs_depth = lchs[0]._min_depth() if lchs and len(lchs) else None
-        self_depth = self._min_depth() 
-        other_depth = target_synset._min_depth()
-        if lcs_depth is None or self_depth is None or other_depth is None: 
-            return None 
+        taxonomy = _get_taxonomy()
+        lchs = taxonomy.lowest_common_hypernyms(self.id, target_synset.id)
+        if not lchs:
+            return None
+        lcs_depth = taxonomy.min_depth(lchs[0])
+        self_depth = taxonomy.min_depth(self.id)
+        other_depth = taxonomy.min_depth(target_synset.id)
 
         return (2.0 * lcs_depth) / (self_depth + other_depth)
         
@@ -811,20 +960,10 @@ class Synset:
         Common synsets which are the furthest from the closest roots.
         
         """ 
-        self_hypernyms = self._recursive_hypernyms(set())
-        other_hypernyms = target_synset._recursive_hypernyms(set())
-        common_hypernyms = self_hypernyms.intersection(other_hypernyms)
-        
-        annot_common_hypernyms = [(hypernym, hypernym._min_depth()) for hypernym in common_hypernyms]
-       
-        annot_common_hypernyms.sort(key = lambda annot_hypernym: annot_hypernym[1],reverse=True)
-       
-        max_depth = annot_common_hypernyms[0][1] if len(annot_common_hypernyms) > 0 else None
-        
-        if max_depth != None:
-            return [annot_common_hypernym[0] for annot_common_hypernym in annot_common_hypernyms if annot_common_hypernym[1] == max_depth]
-        else:
+        lchs = _get_taxonomy().lowest_common_hypernyms(self.id, target_synset.id)
+        if lchs is None:
             return None
+        return _get_synsets_by_idxes(lchs)
             
 class Lemma(object):
     """Represents a lemma.
@@ -4,6 +4,7 @@ from __future__ import unicode_literals, print_function, absolute_import
 """Module which holds Wordnet class for annotating texts."""
 
 from .wordnet import wn
+from .vabamorf.morf import SharedAnalysis
 from pprint import pprint
 
 PYVABAMORF_TO_WORDNET_POS_MAP = {'A': wn.ADJ, 'S': wn.NOUN, 'V': wn.VERB, 'D': wn.ADV}
@@ -59,8 +60,11 @@ class WordnetTagger(object):
         """
 
         for analysis_match in text.analysis:
-            for candidate in analysis_match:
+            for idx, candidate in enumerate(analysis_match):
                 if candidate['partofspeech'] in PYVABAMORF_TO_WORDNET_POS_MAP:
+                    if isinstance(candidate, SharedAnalysis):
+                        # shared analyses are read-only, annotate a copy instead
+                        candidate = analysis_match[idx] = dict(candidate)
                     # Wordnet contains data about the given lemma and pos combination - will annotate.
                     wordnet_obj = {}
                     tag_synsets(wordnet_obj, candidate, **kwargs)
@@ -58,6 +58,9 @@ typedef std::pair<std::string, AnalysisVector > WordAnalysis;
 // type for a string vector.
 typedef std::vector<std::string> StringVector;
 
+// type for a vector of sentences, each of them a vector of words.
+typedef std::vector<StringVector> StringVectors;
+
 
 /**
  * Class that represents a syllable.
@@ -125,6 +128,23 @@ public:
         const bool phonetic,
         const bool propername);
 
+    /**
+     * Analyze a vector of sentences.
+     * Same as calling analyze for every sentence, but avoids the overhead
+     * of separate calls when there are many short sentences.
+     * @param sentences The sentences, each of them a vector of words (UTF8).
+     * @param disambiguate Reduce the number of possible analysis by applying disambiguation.
+     * @param guess Try to guess unknown words.
+     * @param phonetic Add phonetic markup.
+     * @param propername Perform addigional proper name analysis.
+     */
+    std::vector<std::vector<WordAnalysis> > analyzeSentences(
+        StringVectors const& sentences,
+        const bool disambiguate,
+        const bool guess,
+        const bool phonetic,
+        const bool propername);
+
     /**
      * Disambiguate a sentence that is already analyzed.
      * This method is a single step in a more complex
@@ -140,6 +140,24 @@ std::vector<WordAnalysis> Vabamorf::analyze(
     return convertOutput(words);
 }
 
+std::vector<std::vector<WordAnalysis> > Vabamorf::analyzeSentences(
+    StringVectors const& sentences,
+    const bool disambiguate,
+    const bool guess,
+    const bool phonetic,
+    const bool propername) {
+
+    applyMorfSettings(linguistic, guess, phonetic, propername);
+    std::vector<std::vector<WordAnalysis> > results;
+    results.reserve(sentences.size());
+    for (size_t i=0 ; i<sentences.size() ; ++i) {
+        CFSArray<CFSVar> words = convertInput(sentences[i]);
+        addAnalysis(linguistic, disambiguator, words, disambiguate);
+        results.push_back(convertOutput(words));
+    }
+    return results;
+}
+
 //////////////////////////////////////////////////////////////////////
 // DISAMBIGUATOR
 //////////////////////////////////////////////////////////////////////